@@ -7,10 +7,28 @@ from fastapi import APIRouter, Query, HTTPException, status
 from fastapi.responses import Response
 import time
 import logging
+import functools
 
+from app.core.config import config
 from app.services.kiwoom import get_kiwoom_client
-from app.services.base import StockProviderError, ProviderAuthError
-from app.services.provider import get_provider, available_providers, resolve_provider_name
+from app.services.toss import get_toss_client
+from app.services.base import StockProviderError, ProviderAuthError, CircuitOpenError
+from app.services.provider import (
+    fetch_stock_price,
+    fetch_stock_prices,
+    available_providers,
+    resolve_provider_name,
+    price_flight_stats,
+    auto_provider_order,
+    route_default_provider,
+    PROVIDER_AUTO,
+)
+from app.services.provider_health import get_provider_health
+from app.services.quote_cache import get_quote_cache, QUOTE_FIELDS
+from app.services.market_calendar import get_market_calendar
+from app.services.token_renewer import get_token_renewer
+from app.services.rate_limiter import rate_limiter_stats
+from app.services.retry import get_retry_policy
 from app.services import gold as gold_service
 from app.services.scraper import (
     get_scraper,
@@ -19,8 +37,11 @@ from app.services.scraper import (
     ScrapeFetchError,
     ScrapeExtractError,
 )
+from app.utils.deadline import DeadlineExceeded, deadline_scope
 from app.utils.xml_builder import (
     build_stock_price_xml,
+    build_stock_price_list_xml,
+    build_stock_price_csv,
     build_error_xml,
     build_scrape_xml,
     build_scrape_list_xml,
@@ -33,6 +54,35 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _request_deadline(endpoint: str) -> float:
+    """엔드포인트별 요청 deadline(초) — config.REQUEST_DEADLINES 재정의, 없으면 REQUEST_DEADLINE"""
+    for item in config.REQUEST_DEADLINES.split(","):
+        key, _, value = item.partition("=")
+        if key.strip().lower() == endpoint:
+            try:
+                return float(value)
+            except ValueError:
+                logger.warning(f"REQUEST_DEADLINES 형식 오류(무시): '{item.strip()}'")
+    return config.REQUEST_DEADLINE
+
+
+def _with_deadline(endpoint: str):
+    """엔드포인트 처리 전체에 요청 deadline 적용 (하위 단계는 남은 시간만 사용)"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with deadline_scope(_request_deadline(endpoint)):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _deadline_response(e: DeadlineExceeded) -> Response:
+    """요청 deadline 소진 XML 응답 (공통, 보관된 값도 없는 경우)"""
+    error_xml = build_error_xml(message="요청 처리 시간이 초과되었습니다.", code=504, detail=str(e))
+    return Response(content=error_xml, media_type="application/xml", status_code=504)
+
+
 @router.get("/health")
 async def health_check():
     """
@@ -101,10 +151,13 @@ async def get_token_status():
 
     Returns:
         JSON 응답 - 토큰 상태 정보
+        (renewal: provider별 선제 갱신 상태 — next_renewal_at = 다음 갱신 예정 시각,
+         pool: 키움 appkey별 요청 수·격리 상태)
     """
     try:
         client = get_kiwoom_client()
         status = client.get_token_status()
+        status["renewal"] = get_token_renewer().status()
         return status
     except Exception as e:
         return {
@@ -140,6 +193,78 @@ async def force_expire_token():
         }
 
 
+@router.get("/debug/cache-status")
+async def get_cache_status():
+    """
+    시세 캐시 상태 확인 (디버그용)
+
+    Returns:
+        JSON 응답 - 항목 수, TTL, 적중/미스/LRU 제거 카운터,
+        single-flight 병합 카운터(coalesced), 장 운영 상태(TTL 산출 근거),
+        스크래핑 HTML 캐시(항목 수·바이트·LRU 제거·만료 정리)·파싱 재사용·조회 병합 카운터
+    """
+    return {
+        "quote_cache": get_quote_cache().stats(),
+        "price_single_flight": price_flight_stats(),
+        "scrape": get_scraper().stats(),
+        "market": get_market_calendar().status(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+@router.get("/debug/provider-health")
+async def get_provider_health_status():
+    """
+    provider별 상태(지연·에러율·circuit breaker)/헤지 상태 확인 (디버그용)
+
+    Returns:
+        JSON 응답 - provider=auto 시도 순서, provider 미지정 요청의 현재 라우팅 순서와 최근 변경 이력(이유),
+        provider별 circuit 상태·연속 실패·에러율·라우팅 점수·지연 EWMA/p50/p95, 헤지 대기 시간,
+        헤지 요청·헤지 승리·장애 전환 횟수
+    """
+    health = get_provider_health()
+    return {
+        "auto_order": auto_provider_order(),
+        "default_provider": config.DEFAULT_PROVIDER,
+        "health_routing": config.HEALTH_ROUTING,
+        "route_order": route_default_provider(),
+        "route_changes": list(health.route_changes),
+        "providers": health.stats(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+@router.get("/debug/retries")
+async def get_retry_status():
+    """
+    upstream 재시도 정책 상태 확인 (디버그용)
+
+    Returns:
+        JSON 응답 - 에러 종류별 최대 재시도 횟수, 백오프 설정, 재시도 예산(최근 창의 요청·재시도 수,
+        허용 한도, 예산 부족으로 재시도하지 않은 횟수), 호출별 재시도·포기 횟수
+    """
+    return {
+        **get_retry_policy().stats(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+@router.get("/debug/rate-limits")
+async def get_rate_limits():
+    """
+    provider·API id별 요청 속도 제한 상태 확인 (디버그용)
+
+    Returns:
+        JSON 응답 - limiter별 속도/버스트, 현재·최대 대기열 길이, 대기 발생 건수, 평균·최대 대기 시간,
+        토스 micro-batching 지표(비활성화 시 null)
+    """
+    return {
+        "rate_limits": rate_limiter_stats(),
+        "toss_micro_batch": get_toss_client().batch_stats(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
 def _scrape_error_response(e: ScrapeError) -> Response:
     """스크래핑 예외를 XML 에러 응답으로 변환 (공통)"""
     if isinstance(e, ScrapeConfigError):
@@ -162,6 +287,7 @@ def _scrape_error_response(e: ScrapeError) -> Response:
 
 
 @router.get("/api/gold")
+@_with_deadline("gold")
 async def get_gold_price(
     target: str = Query(
         None,
@@ -196,7 +322,7 @@ async def get_gold_price(
         </gold>
     """
     try:
-        # target 미지정 → 전체 조회 (동일 URL은 캐시로 1회만 요청)
+        # target 미지정 → 전체 조회 (URL별 동시 조회, 동일 URL은 1회만 요청, 실패 대상은 <error>)
         if not target:
             items = await gold_service.get_all_gold_prices(force_refresh=refresh)
             xml_content = build_scrape_list_xml(items, root_tag="golds", item_tag="gold")
@@ -210,6 +336,10 @@ async def get_gold_price(
         logger.info(f"금 시세 조회 성공: {data['target']} = {data['value']}")
         return Response(content=xml_content, media_type="application/xml")
 
+    except DeadlineExceeded as e:
+        logger.warning(f"금 시세 조회 시간 초과: {e}")
+        return _deadline_response(e)
+
     except ScrapeError as e:
         logger.error(f"금 시세 조회 실패: {e}")
         return _scrape_error_response(e)
@@ -223,6 +353,7 @@ async def get_gold_price(
 
 
 @router.get("/api/scrape")
+@_with_deadline("scrape")
 async def scrape_target(
     group: str = Query(..., description="자산 그룹 (예: gold, crypto)"),
     target: str = Query(None, description="대상 키. 미지정 시 그룹 전체 반환"),
@@ -263,6 +394,10 @@ async def scrape_target(
         logger.info(f"스크래핑 조회 성공: {group_key}.{data['target']} = {data['value']}")
         return Response(content=xml_content, media_type="application/xml")
 
+    except DeadlineExceeded as e:
+        logger.warning(f"스크래핑 시간 초과: {e}")
+        return _deadline_response(e)
+
     except ScrapeError as e:
         logger.error(f"스크래핑 실패: {e}")
         return _scrape_error_response(e)
@@ -275,11 +410,49 @@ async def scrape_target(
         return Response(content=error_xml, media_type="application/xml", status_code=500)
 
 
+# 시장 구분 약어 변환 (J=KOSPI, Q=KOSDAQ)
+_MARKET_MAPPING = {
+    "J": "KOSPI",
+    "Q": "KOSDAQ",
+    "KOSPI": "KOSPI",
+    "KOSDAQ": "KOSDAQ",
+}
+
+
+def _invalid_provider_response() -> Response:
+    """provider 검증 실패 XML 응답 (공통)"""
+    error_xml = build_error_xml(
+        message=f"유효하지 않은 provider입니다. 사용 가능: {', '.join(available_providers() + [PROVIDER_AUTO])}",
+        code=400,
+    )
+    return Response(content=error_xml, media_type="application/xml", status_code=400)
+
+
+def _invalid_fields_response() -> Response:
+    """fields 검증 실패 XML 응답 (공통)"""
+    error_xml = build_error_xml(
+        message=f"유효하지 않은 fields입니다. 사용 가능: {', '.join(QUOTE_FIELDS)}",
+        code=400,
+    )
+    return Response(content=error_xml, media_type="application/xml", status_code=400)
+
+
+def _invalid_market_response() -> Response:
+    """시장 구분 검증 실패 XML 응답 (공통)"""
+    error_xml = build_error_xml(
+        message="유효하지 않은 시장 구분입니다. KOSPI, KOSDAQ, J, Q만 가능합니다.",
+        code=400,
+    )
+    return Response(content=error_xml, media_type="application/xml", status_code=400)
+
+
 @router.get("/api/price")
+@_with_deadline("price")
 async def get_stock_price(
     code: str = Query(..., description="종목 코드 (예: 005930)", min_length=6, max_length=6),
     market: str = Query("KOSPI", description="시장 구분 (KOSPI, KOSDAQ)"),
-    provider: str = Query(None, description="증권사 provider (kiwoom, toss). 미지정 시 서버 기본값"),
+    provider: str = Query(None, description="증권사 provider (kiwoom, toss, auto). 미지정 시 서버 기본값"),
+    fields: str = Query("all", description="필요한 필드 (all, price, 52w). 해당 필드만 신선하면 캐시로 응답"),
 ):
     """
     주식 현재가 조회 엔드포인트
@@ -287,7 +460,9 @@ async def get_stock_price(
     Args:
         code: 종목 코드 (6자리)
         market: 시장 구분 (기본값: KOSPI)
-        provider: 증권사 provider (kiwoom, toss). 미지정 시 서버 기본값(DEFAULT_PROVIDER)
+        provider: 증권사 provider (kiwoom, toss, auto). 미지정 시 서버 기본값(DEFAULT_PROVIDER)
+            auto: primary 지연 시 보조 provider로 헤지 요청, 장애 시 즉시 전환 (<provider>에 실제 응답 provider)
+        fields: "all"(기본) | "price"(현재가만 신선하면 됨) | "52w"(52주 값만 신선하면 됨)
 
     Returns:
         XML 응답
@@ -305,45 +480,30 @@ async def get_stock_price(
     """
     # provider 검증 (미지정 시 기본값 적용)
     provider_name = resolve_provider_name(provider)
-    if provider_name not in available_providers():
-        error_xml = build_error_xml(
-            message=f"유효하지 않은 provider입니다. 사용 가능: {', '.join(available_providers())}",
-            code=400,
-        )
-        return Response(content=error_xml, media_type="application/xml", status_code=400)
+    if provider_name not in available_providers() and provider_name != PROVIDER_AUTO:
+        return _invalid_provider_response()
 
-    # 시장 구분 검증 및 변환
-    market = market.upper()
+    # 시장 구분 검증 및 변환 (약어 J=KOSPI, Q=KOSDAQ)
+    market = _MARKET_MAPPING.get(market.upper())
+    if market is None:
+        return _invalid_market_response()
 
-    # 약어 변환 (J=KOSPI, Q=KOSDAQ)
-    market_mapping = {
-        "J": "KOSPI",
-        "Q": "KOSDAQ",
-        "KOSPI": "KOSPI",
-        "KOSDAQ": "KOSDAQ",
-    }
-
-    if market not in market_mapping:
-        error_xml = build_error_xml(
-            message="유효하지 않은 시장 구분입니다. KOSPI, KOSDAQ, J, Q만 가능합니다.",
-            code=400,
-        )
-        return Response(content=error_xml, media_type="application/xml", status_code=400)
-
-    market = market_mapping[market]  # 약어를 정식 명칭으로 변환
+    fields = fields.strip().lower()
+    if fields not in QUOTE_FIELDS:
+        return _invalid_fields_response()
 
     try:
-        # provider 클라이언트 획득 (kiwoom | toss)
-        client = get_provider(provider_name)
-
-        # 시세 조회 (비동기)
-        price_data = await client.get_stock_price(code=code, market=market)
+        # 시세 조회 (캐시 → provider(kiwoom | toss) 순, 비동기)
+        # provider 미지정이면 그대로 넘겨 상태 기반 라우팅 적용 (HEALTH_ROUTING)
+        price_data = await fetch_stock_price(provider or None, code=code, market=market, fields=fields)
 
         # XML 변환
         xml_content = build_stock_price_xml(price_data)
 
         # 로그
-        logger.info(f"시세 조회 성공: {code} ({market}) [{provider_name}] = {price_data['price']}")
+        logger.info(
+            f"시세 조회 성공: {code} ({market}) [{price_data.get('provider', provider_name)}] = {price_data['price']}"
+        )
 
         return Response(content=xml_content, media_type="application/xml")
 
@@ -356,6 +516,19 @@ async def get_stock_price(
         )
         return Response(content=error_xml, media_type="application/xml", status_code=401)
 
+    except DeadlineExceeded as e:
+        logger.warning(f"시세 조회 시간 초과: {e}")
+        return _deadline_response(e)
+
+    except CircuitOpenError as e:
+        logger.warning(f"provider 차단 중: {e}")
+        error_xml = build_error_xml(
+            message="증권사 API 장애로 일시적으로 조회할 수 없습니다.",
+            code=503,
+            detail=str(e),
+        )
+        return Response(content=error_xml, media_type="application/xml", status_code=503)
+
     except StockProviderError as e:
         logger.error(f"API 에러: {e}")
         error_xml = build_error_xml(
@@ -373,3 +546,110 @@ async def get_stock_price(
             detail=str(e),
         )
         return Response(content=error_xml, media_type="application/xml", status_code=500)
+
+
+@router.get("/api/prices")
+@_with_deadline("prices")
+async def get_stock_prices(
+    codes: str = Query(..., description="종목 코드 목록, 쉼표 구분 (예: 005930,000660)"),
+    market: str = Query("KOSPI", description="시장 구분 (KOSPI, KOSDAQ)"),
+    provider: str = Query(None, description="증권사 provider (kiwoom, toss, auto=primary). 미지정 시 서버 기본값"),
+    fields: str = Query("all", description="필요한 필드 (all, price, 52w). 해당 필드만 신선하면 캐시로 응답"),
+    format: str = Query("xml", description="응답 형식 (xml: IMPORTXML, csv: IMPORTDATA)"),
+):
+    """
+    여러 종목 시세 조회 엔드포인트
+
+    관심 종목 열 전체를 IMPORTXML/IMPORTDATA 1회로 채우기 위한 다건 조회.
+    캐시 미스 종목만 모아 토스는 다건 현재가 API(최대 200종목/호출)로,
+    키움은 ka10001을 동시 실행 수 제한(BATCH_CONCURRENCY) 하에 병렬 호출한다.
+    일부 종목이 실패해도 나머지는 정상 응답하며, 실패 종목에는 <error>가 담긴다.
+
+    Args:
+        codes: 종목 코드 목록 (쉼표 구분, 최대 BATCH_MAX_CODES개)
+        market: 시장 구분 (기본값: KOSPI)
+        provider: 증권사 provider. 미지정 시 서버 기본값(DEFAULT_PROVIDER)
+        fields: /api/price와 동일
+        format: "xml"(기본) | "csv"
+
+    Returns:
+        XML 응답
+        <?xml version="1.0" encoding="UTF-8"?>
+        <stocks>
+          <stock>
+            <code>005930</code>
+            <price>71000</price>
+            ...
+          </stock>
+        </stocks>
+
+        CSV 응답 (format=csv)
+        code,price,high52w,low52w,high52w_date,timestamp,market,provider,stale,error
+    """
+    provider_name = resolve_provider_name(provider)
+    if provider_name not in available_providers() and provider_name != PROVIDER_AUTO:
+        return _invalid_provider_response()
+
+    market = _MARKET_MAPPING.get(market.upper())
+    if market is None:
+        return _invalid_market_response()
+
+    fields = fields.strip().lower()
+    if fields not in QUOTE_FIELDS:
+        return _invalid_fields_response()
+
+    output_format = format.strip().lower()
+    if output_format not in ("xml", "csv"):
+        error_xml = build_error_xml(message="유효하지 않은 format입니다. xml, csv만 가능합니다.", code=400)
+        return Response(content=error_xml, media_type="application/xml", status_code=400)
+
+    code_list = [c.strip() for c in codes.split(",") if c.strip()]
+    if not code_list:
+        error_xml = build_error_xml(message="종목 코드가 필요합니다.", code=400)
+        return Response(content=error_xml, media_type="application/xml", status_code=400)
+    if len(code_list) > config.BATCH_MAX_CODES:
+        error_xml = build_error_xml(
+            message=f"종목 코드는 최대 {config.BATCH_MAX_CODES}개까지 조회할 수 있습니다.",
+            code=400,
+            detail=f"요청 종목 수: {len(code_list)}",
+        )
+        return Response(content=error_xml, media_type="application/xml", status_code=400)
+
+    # 형식이 잘못된 코드는 조회하지 않고 해당 항목만 에러 처리
+    valid_codes = [c for c in code_list if len(c) == 6 and c.isalnum()]
+
+    try:
+        fetched = (
+            await fetch_stock_prices(provider or None, valid_codes, market=market, fields=fields)
+            if valid_codes else []
+        )
+        by_code = {item["code"]: item for item in fetched}
+        items = [
+            by_code.get(c) or {"code": c, "market": market, "error": "유효하지 않은 종목 코드입니다."}
+            for c in code_list
+        ]
+
+        failed = sum(1 for item in items if item.get("error"))
+        logger.info(f"다건 시세 조회: {len(items)}건 (실패 {failed}건) [{provider_name}]")
+
+        if output_format == "csv":
+            return Response(content=build_stock_price_csv(items), media_type="text/csv")
+        return Response(content=build_stock_price_list_xml(items), media_type="application/xml")
+
+    except DeadlineExceeded as e:
+        logger.warning(f"다건 시세 조회 시간 초과: {e}")
+        return _deadline_response(e)
+
+    except StockProviderError as e:
+        logger.error(f"다건 시세 조회 실패: {e}")
+        error_xml = build_error_xml(message="시세 조회에 실패했습니다.", code=502, detail=str(e))
+        return Response(content=error_xml, media_type="application/xml", status_code=502)
+
+    except Exception as e:
+        logger.exception(f"예상치 못한 에러: {e}")
+        error_xml = build_error_xml(
+            message="서버 내부 오류가 발생했습니다.",
+            code=500,
+            detail=str(e),
+        )
+        return Response(content=error_xml, media_type="application/xml", status_code=500)
@@ -4,7 +4,7 @@ Stockio 설정 모듈
 환경 변수를 관리하고 애플리케이션 설정을 제공합니다.
 """
 import os
-from typing import Optional
+from typing import List, Optional, Tuple
 from dotenv import load_dotenv
 
 # .env 파일 로드
@@ -19,17 +19,58 @@ class Config:
     KIWOOM_API_SECRET: str = os.getenv("KIWOOM_API_SECRET", "")
     KIWOOM_API_HOST: str = os.getenv("KIWOOM_API_HOST", "https://api.kiwoom.com")
     KIWOOM_TOKEN_ENV: str = os.getenv("KIWOOM_TOKEN_ENV", "/tmp/.kiwoom_env")
+    # 추가 appkey 풀: "appkey1:secret1,appkey2:secret2" (KIWOOM_API_APPKEY/SECRET이 있으면 첫 키로 포함)
+    KIWOOM_API_CREDENTIALS: str = os.getenv("KIWOOM_API_CREDENTIALS", "")
+    # 키 선택 방식: round_robin | least_loaded (진행 중 요청이 가장 적은 키)
+    KIWOOM_POOL_STRATEGY: str = os.getenv("KIWOOM_POOL_STRATEGY", "round_robin")
+    # 429를 받은 키의 격리 시간(초), 인증 실패(401/403·토큰 발급 거부) 키의 격리 시간(초)
+    KIWOOM_KEY_QUARANTINE: float = float(os.getenv("KIWOOM_KEY_QUARANTINE", "60"))
+    KIWOOM_KEY_AUTH_QUARANTINE: float = float(os.getenv("KIWOOM_KEY_AUTH_QUARANTINE", "600"))
 
     # 토스증권 API 설정
     TOSS_API_CLIENT_ID: str = os.getenv("TOSS_API_CLIENT_ID", "")
     TOSS_API_SECRET: str = os.getenv("TOSS_API_SECRET", "")
     TOSS_API_HOST: str = os.getenv("TOSS_API_HOST", "https://openapi.tossinvest.com")
     TOSS_TOKEN_ENV: str = os.getenv("TOSS_TOKEN_ENV", "/tmp/.toss_env")
+    # 단건 현재가 요청 micro-batching: 이 시간(ms) 동안 모인 종목을 다건 호출 1회로 조회 (0이면 끔)
+    TOSS_BATCH_WINDOW_MS: int = int(os.getenv("TOSS_BATCH_WINDOW_MS", "0"))
+    TOSS_BATCH_MAX: int = int(os.getenv("TOSS_BATCH_MAX", "50"))  # 묶음 최대 종목 수 (최대 200)
+    # 52주 산출용 캔들 조회 대기 한도(초). 초과 시 52주 값 없이 현재가만 응답(조회는 계속 진행해 캐시)
+    TOSS_CANDLE_DEADLINE: float = float(os.getenv("TOSS_CANDLE_DEADLINE", "3.0"))
+
+    # 토큰 발급 단일화: 이 시간(초) 이내에 발급된 토큰은 재발급 요청(401 등)이 와도 재사용
+    TOKEN_REUSE_WINDOW: float = float(os.getenv("TOKEN_REUSE_WINDOW", "10"))
+    # 여러 워커/컨테이너가 토큰 파일을 공유할 때 발급 락(<토큰 파일>.lock) 최대 대기 시간(초)
+    TOKEN_FILE_LOCK_TIMEOUT: float = float(os.getenv("TOKEN_FILE_LOCK_TIMEOUT", "30"))
+    # 토큰 선제 갱신 (백그라운드): 만료 TOKEN_RENEW_MARGIN 초 전에 미리 재발급
+    TOKEN_RENEW_ENABLED: bool = os.getenv("TOKEN_RENEW_ENABLED", "true").lower() == "true"
+    TOKEN_RENEW_MARGIN: int = int(os.getenv("TOKEN_RENEW_MARGIN", "600"))  # 10분
+    TOKEN_RENEW_CHECK_INTERVAL: int = int(os.getenv("TOKEN_RENEW_CHECK_INTERVAL", "300"))  # 만료 시각 재확인 주기
+    TOKEN_RENEW_RETRY_INTERVAL: int = int(os.getenv("TOKEN_RENEW_RETRY_INTERVAL", "30"))  # 갱신 실패 시 재시도 간격
 
     # provider 선택 설정
     # /api/price 요청에 provider 파라미터가 없을 때 사용할 기본 provider.
     # 하드코딩 대신 환경 변수로 변경 가능 → 백엔드 설정 한 번으로 전체 교체.
     DEFAULT_PROVIDER: str = os.getenv("DEFAULT_PROVIDER", "kiwoom").lower()
+    # provider=auto: 앞이 primary, 다음이 헤지/장애 전환 대상 (자격 증명이 설정된 provider만 사용)
+    AUTO_PROVIDERS: str = os.getenv("AUTO_PROVIDERS", "kiwoom,toss")
+    # 헤지 요청 대기 시간 = primary 최근 지연의 HEDGE_PERCENTILE 백분위 (HEDGE_MIN_DELAY~HEDGE_MAX_DELAY초)
+    HEDGE_PERCENTILE: float = float(os.getenv("HEDGE_PERCENTILE", "95"))
+    HEDGE_MIN_SAMPLES: int = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))  # 표본이 이보다 적으면 기본값 사용
+    HEDGE_DEFAULT_DELAY: float = float(os.getenv("HEDGE_DEFAULT_DELAY", "1.0"))
+    HEDGE_MIN_DELAY: float = float(os.getenv("HEDGE_MIN_DELAY", "0.1"))
+    HEDGE_MAX_DELAY: float = float(os.getenv("HEDGE_MAX_DELAY", "3.0"))
+    # provider 미지정 요청을 가장 상태가 좋은 provider로 라우팅 (후보: DEFAULT_PROVIDER + AUTO_PROVIDERS)
+    HEALTH_ROUTING: bool = os.getenv("HEALTH_ROUTING", "true").lower() == "true"
+    HEALTH_EWMA_ALPHA: float = float(os.getenv("HEALTH_EWMA_ALPHA", "0.2"))  # 지연 EWMA 가중치 (클수록 최근 값 반영)
+    HEALTH_WINDOW: int = int(os.getenv("HEALTH_WINDOW", "50"))  # 에러율 계산에 쓰는 최근 호출 수
+    HEALTH_SAMPLE_TTL: int = int(os.getenv("HEALTH_SAMPLE_TTL", "300"))  # 이보다 오래된 지표는 라우팅에 쓰지 않음(초)
+    # 기본 provider 대신 다른 provider로 보내려면 점수(지연/성공률)가 이 배수 이상 좋아야 함 (잦은 전환 방지)
+    HEALTH_SWITCH_RATIO: float = float(os.getenv("HEALTH_SWITCH_RATIO", "1.5"))
+    # circuit breaker: 연속 CIRCUIT_FAILURE_THRESHOLD회 upstream 실패 시 열림(호출 차단),
+    # CIRCUIT_COOLDOWN초 뒤 half-open → 시험 호출 1건 성공 시 닫힘
+    CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+    CIRCUIT_COOLDOWN: float = float(os.getenv("CIRCUIT_COOLDOWN", "30"))
 
     # 스크래핑 설정
     # 대상 URL·XPath는 코드가 아닌 이 설정 파일에 외부화한다.
@@ -38,21 +79,108 @@ class Config:
         "SCRAPE_CONFIG_PATH",
         os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "config", "scrape_targets.yaml"),
     )
+    # 그룹 전체 조회 시 동시에 조회할 URL 수 (같은 URL의 대상들은 조회 1회를 공유)
+    SCRAPE_GROUP_CONCURRENCY: int = int(os.getenv("SCRAPE_GROUP_CONCURRENCY", "4"))
+    # 스크래핑 HTML 캐시 상한: 항목 수, HTML 바이트 합계. 초과 시 가장 오래 사용하지 않은 항목부터 제거(LRU)
+    SCRAPE_HTML_CACHE_MAX_ENTRIES: int = int(os.getenv("SCRAPE_HTML_CACHE_MAX_ENTRIES", "64"))
+    SCRAPE_HTML_CACHE_MAX_BYTES: int = int(os.getenv("SCRAPE_HTML_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+    # cache_ttl이 지난 HTML을 보관하는 시간(초). 요청 deadline 소진 시 지난 HTML로 응답하는 데 사용
+    SCRAPE_HTML_MAX_STALE: int = int(os.getenv("SCRAPE_HTML_MAX_STALE", "3600"))
+    # 만료 항목 정리 주기(초), true면 HTML을 zlib 압축해 보관
+    SCRAPE_HTML_SWEEP_INTERVAL: float = float(os.getenv("SCRAPE_HTML_SWEEP_INTERVAL", "60"))
+    SCRAPE_HTML_COMPRESS: bool = os.getenv("SCRAPE_HTML_COMPRESS", "false").lower() == "true"
+
+    # 공유 HTTP 클라이언트 (upstream별 keep-alive 연결 재사용, app/services/http_client.py)
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+    HTTP_MAX_KEEPALIVE: int = int(os.getenv("HTTP_MAX_KEEPALIVE", "10"))
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))  # 유휴 연결 유지(초)
+    # HTTP/2 사용 (h2 패키지 필요: pip install 'httpx[http2]'. 없으면 HTTP/1.1로 동작)
+    HTTP2_ENABLED: bool = os.getenv("HTTP2_ENABLED", "false").lower() == "true"
+
+    # 요청 deadline (app/utils/deadline.py): 클라이언트(IMPORTXML)가 포기한 뒤까지 upstream을 기다리지 않도록
+    # 요청 진입부터 이 시간(초) 안에서만 시세 조회·토큰 발급·스크래핑·렌더링을 진행한다. 0이면 제한 없음.
+    REQUEST_DEADLINE: float = float(os.getenv("REQUEST_DEADLINE", "25"))
+    # 엔드포인트별 재정의: "<endpoint>=<초>" 쉼표 구분 (endpoint: price, prices, gold, scrape)
+    # 예) "price=8,prices=20"
+    REQUEST_DEADLINES: str = os.getenv("REQUEST_DEADLINES", "")
+
+    # KRX 장 운영 캘린더 (시세 캐시 TTL 산출)
+    # 휴장일 목록 파일 (주말 외 평일 휴장일). 파일 위치도 환경 변수로 변경 가능.
+    KRX_HOLIDAYS_PATH: str = os.getenv(
+        "KRX_HOLIDAYS_PATH",
+        os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "config", "krx_holidays.yaml"),
+    )
+    # NXT 프리(08:00~08:50)/애프터(15:30~20:00) 마켓을 장중으로 볼지 여부
+    MARKET_INCLUDE_NXT: bool = os.getenv("MARKET_INCLUDE_NXT", "true").lower() == "true"
 
     # 애플리케이션 설정
     APP_NAME: str = "Stockio"
     APP_VERSION: str = "1.0.0"
     DEBUG: bool = os.getenv("DEBUG", "false").lower() == "true"
 
-    # 캐싱 설정 (Phase 2에서 사용)
-    CACHE_TTL: int = int(os.getenv("CACHE_TTL", "300"))  # 5분
+    # 시세 캐싱 설정
+    # /api/price 결과를 (provider, code, market) 키로 재사용하는 인메모리 캐시.
+    # 아래 TTL은 장중 기준이며, 장 마감 후·휴장일에는 다음 개장까지 연장된다.
+    CACHE_TTL: int = int(os.getenv("CACHE_TTL", "300"))  # 5분 (provider별 미지정 시 기본값)
+    KIWOOM_CACHE_TTL: int = int(os.getenv("KIWOOM_CACHE_TTL", str(CACHE_TTL)))
+    TOSS_CACHE_TTL: int = int(os.getenv("TOSS_CACHE_TTL", str(CACHE_TTL)))
+    # 최대 캐시 항목 수. 초과 시 가장 오래 사용하지 않은 항목부터 제거(LRU)
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "2000"))
+    # TTL이 지난 뒤에도 마지막 정상 시세를 보관하는 시간(초).
+    # 증권사 API 장애 시 이 범위 안의 시세를 <stale>true</stale>로 응답한다.
+    QUOTE_MAX_STALE: int = int(os.getenv("QUOTE_MAX_STALE", "3600"))
+    # true면 TTL이 지난 시세를 즉시 반환하고 백그라운드에서 1회 갱신 (stale-while-revalidate)
+    QUOTE_STALE_WHILE_REVALIDATE: bool = os.getenv("QUOTE_STALE_WHILE_REVALIDATE", "true").lower() == "true"
 
-    # Rate Limiting (Phase 2에서 사용)
+    # 다건 시세 조회 (/api/prices)
+    BATCH_MAX_CODES: int = int(os.getenv("BATCH_MAX_CODES", "200"))  # 요청당 최대 종목 수
+    BATCH_CONCURRENCY: int = int(os.getenv("BATCH_CONCURRENCY", "5"))  # 단건 API provider(키움) 동시 호출 수
+
+    # Rate Limiting (provider·API id별 token bucket, app/services/rate_limiter.py)
+    # 기본 속도 = 1 / MIN_REQUEST_INTERVAL (초당). 한도를 넘는 호출은 실패 대신 대기한다.
     MIN_REQUEST_INTERVAL: float = float(os.getenv("MIN_REQUEST_INTERVAL", "0.2"))  # 200ms
+    RATE_LIMIT_BURST: int = int(os.getenv("RATE_LIMIT_BURST", "1"))  # 연속 허용 호출 수
+    # 개별 재정의: "<provider>.<API id>=<초당 호출 수>[/<버스트>]" 쉼표 구분
+    # 예) "kiwoom.ka10001=5/3,toss.prices=10/10"
+    RATE_LIMITS: str = os.getenv("RATE_LIMITS", "")
+
+    # upstream 재시도 정책 (app/services/retry.py)
+    # 에러 종류별 최대 재시도 횟수: connect(연결 실패) / timeout / 429 / 5xx / auth(토큰 재발급 후 재시도)
+    RETRY_POLICY: str = os.getenv("RETRY_POLICY", "connect=2,timeout=1,429=2,5xx=1,auth=1")
+    RETRY_BASE_DELAY: float = float(os.getenv("RETRY_BASE_DELAY", "0.2"))  # 백오프 기준(초), 재시도마다 2배
+    RETRY_MAX_DELAY: float = float(os.getenv("RETRY_MAX_DELAY", "2.0"))  # 최대 대기(초), Retry-After가 더 길면 재시도 안 함
+    # 재시도 예산: 최근 RETRY_BUDGET_WINDOW초 재시도 수 ≤ max(RETRY_BUDGET_MIN, 요청 수 × RETRY_BUDGET_RATIO)
+    RETRY_BUDGET_RATIO: float = float(os.getenv("RETRY_BUDGET_RATIO", "0.1"))
+    RETRY_BUDGET_WINDOW: float = float(os.getenv("RETRY_BUDGET_WINDOW", "10"))
+    RETRY_BUDGET_MIN: int = int(os.getenv("RETRY_BUDGET_MIN", "3"))
+
+    @classmethod
+    def kiwoom_credentials(cls) -> List[Tuple[str, str]]:
+        """
+        키움 (appkey, secret) 목록 — KIWOOM_API_APPKEY/SECRET, 그다음 KIWOOM_API_CREDENTIALS (중복 appkey 제외)
+
+        Raises:
+            ValueError: KIWOOM_API_CREDENTIALS 형식 오류
+        """
+        credentials: List[Tuple[str, str]] = []
+        if cls.KIWOOM_API_APPKEY and cls.KIWOOM_API_SECRET:
+            credentials.append((cls.KIWOOM_API_APPKEY, cls.KIWOOM_API_SECRET))
+        for item in cls.KIWOOM_API_CREDENTIALS.split(","):
+            item = item.strip()
+            if not item:
+                continue
+            appkey, sep, secret = item.partition(":")
+            if not sep or not appkey.strip() or not secret.strip():
+                raise ValueError("KIWOOM_API_CREDENTIALS 형식 오류 (appkey:secret,... 형식이어야 합니다)")
+            if appkey.strip() not in (key for key, _ in credentials):
+                credentials.append((appkey.strip(), secret.strip()))
+        return credentials
 
     @classmethod
     def validate(cls) -> bool:
         """필수 환경 변수 검증"""
+        if cls.kiwoom_credentials():
+            return True
         if not cls.KIWOOM_API_APPKEY:
             raise ValueError("KIWOOM_API_APPKEY가 설정되지 않았습니다.")
         if not cls.KIWOOM_API_SECRET:
@@ -5,15 +5,32 @@
 추상 베이스 클래스와 공통 예외를 정의한다.
 
 각 provider 구현체는 StockProvider를 상속하고 get_stock_price()를 구현하며,
-동일한 스키마의 딕셔너리를 반환해야 한다.
+동일한 스키마의 딕셔너리를 반환해야 한다. 여러 종목 조회(get_stock_prices)는
+기본적으로 get_stock_price()를 동시 실행 수 제한 하에 병렬 호출하며, 다건 API가 있는
+provider(토스)는 재정의한다.
 """
+import time
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Union
+
+import httpx
+
+from app.core.config import config
+from app.utils.deadline import DeadlineExceeded
 
 
 class StockProviderError(Exception):
-    """증권사 API 공통 에러 (모든 provider 에러의 베이스)"""
-    pass
+    """
+    증권사 API 공통 에러 (모든 provider 에러의 베이스)
+
+    Attributes:
+        status_code: upstream HTTP 상태 코드 (알 수 없거나 HTTP 응답 전 실패면 None)
+    """
+
+    def __init__(self, message: str = "", status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
 
 
 class ProviderAuthError(StockProviderError):
@@ -21,6 +38,11 @@ class ProviderAuthError(StockProviderError):
     pass
 
 
+class CircuitOpenError(StockProviderError):
+    """연속 실패로 circuit breaker가 열린 provider — upstream을 호출하지 않고 즉시 실패"""
+    pass
+
+
 class StockProvider(ABC):
     """
     증권사 시세 provider 공통 인터페이스
@@ -33,13 +55,17 @@ class StockProvider(ABC):
     name: str = ""
 
     @abstractmethod
-    async def get_stock_price(self, code: str, market: str = "KOSPI") -> Dict[str, Any]:
+    async def get_stock_price(
+        self, code: str, market: str = "KOSPI", include_52w: bool = True
+    ) -> Dict[str, Any]:
         """
         주식 현재가(및 가능 시 52주 최고가) 조회
 
         Args:
             code: 종목 코드 (예: "005930")
             market: 시장 구분 ("KOSPI", "KOSDAQ")
+            include_52w: False면 52주 값이 필요 없다는 힌트. 52주 값에 추가 호출이 드는
+                provider(토스)는 생략하고 None으로 채운다. (단일 호출로 함께 받는 키움은 무시)
 
         Returns:
             provider와 무관하게 동일한 스키마의 딕셔너리:
@@ -60,6 +86,51 @@ class StockProvider(ABC):
         """
         raise NotImplementedError
 
+    async def get_stock_prices(
+        self, codes: List[str], market: str = "KOSPI", include_52w: bool = True
+    ) -> Dict[str, Union[Dict[str, Any], StockProviderError]]:
+        """
+        여러 종목 시세 조회
+
+        기본 구현은 get_stock_price()를 config.BATCH_CONCURRENCY 개씩 동시에 호출한다.
+        (호출 속도 자체는 provider별 rate limiter가 조절)
+
+        Args:
+            codes: 종목 코드 목록 (중복 없음)
+            market: 시장 구분
+            include_52w: get_stock_price()와 동일
+
+        Returns:
+            종목 코드 → 시세 딕셔너리 또는 해당 종목의 조회 실패 예외(요청 deadline 소진 포함)
+            (일부 종목 실패가 전체 실패가 되지 않도록 예외를 값으로 담는다)
+        """
+        semaphore = asyncio.Semaphore(max(config.BATCH_CONCURRENCY, 1))
+
+        async def _one(code: str):
+            async with semaphore:
+                try:
+                    return await self.get_stock_price(code=code, market=market, include_52w=include_52w)
+                except (StockProviderError, DeadlineExceeded) as e:
+                    return e
+
+        results = await asyncio.gather(*(_one(code) for code in codes))
+        return dict(zip(codes, results))
+
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """
+    다른 provider로 넘길 만한 upstream 장애인지 (인증 실패, 429/5xx, 연결 실패·타임아웃, circuit 열림)
+
+    종목 코드 오류·데이터 없음 등 요청 자체의 문제는 False — 다른 provider도 같은 결과다.
+    """
+    if isinstance(error, (ProviderAuthError, CircuitOpenError)):
+        return True
+    status_code = getattr(error, "status_code", None)
+    if status_code is not None:
+        return status_code == 429 or status_code >= 500
+    cause = error.__cause__ or error.__context__
+    return isinstance(cause, httpx.TransportError)
+
 
 def normalize_price(value: Optional[str]) -> Optional[float]:
     """
@@ -82,3 +153,21 @@ def normalize_price(value: Optional[str]) -> Optional[float]:
         return None
     # 정수면 int로 (기존 키움 응답과 표기 호환)
     return int(num) if num == int(num) else num
+
+
+def seconds_until(expire_at: Optional[str]) -> Optional[float]:
+    """
+    토큰 만료 시각("YYYYmmddHHMMSS", 서버 로컬 시각)까지 남은 초
+
+    Args:
+        expire_at: 만료 시각 문자열 (키움 expires_dt / 토스 변환값과 동일 포맷)
+
+    Returns:
+        남은 초(이미 만료면 음수), 값이 없거나 형식 오류면 None
+    """
+    if not expire_at:
+        return None
+    try:
+        return time.mktime(time.strptime(expire_at, "%Y%m%d%H%M%S")) - time.time()
+    except (ValueError, OverflowError):
+        return None
@@ -41,5 +41,5 @@ async def get_gold_price(target: str, force_refresh: bool = False) -> Dict[str,
 
 
 async def get_all_gold_prices(force_refresh: bool = False) -> List[Dict[str, Any]]:
-    """설정에 정의된 모든 금 시세 조회 (동일 URL은 캐시로 1회만 요청)"""
+    """설정에 정의된 모든 금 시세 조회 (URL별 동시 조회, 동일 URL은 1회만 요청, 실패 대상은 error 항목)"""
     return await get_scraper().scrape_group(GOLD_GROUP, force_refresh=force_refresh)
@@ -0,0 +1,195 @@
+"""
+스크래핑 HTML 인메모리 캐시
+
+렌더링 페이지(investing.com·네이버 등)는 한 건에 수백 KB라 무제한 dict로 두면 몇 주 운영하는 동안
+메모리가 계속 늘어난다. (url, rendered) 키로 HTML(+파싱된 문서)을 보관하되 크기를 제한한다.
+
+- 신선도: 조회 시 대상별 cache_ttl로 판정 (같은 URL이라도 대상마다 TTL이 다를 수 있음)
+- max-stale: TTL이 지난 HTML도 config.SCRAPE_HTML_MAX_STALE 초까지는 보관한다.
+  요청 deadline 소진 시 지난 HTML로 응답하는 데 쓴다 (Scraper._stale_html_or_raise)
+- 크기 제한: 항목 수(config.SCRAPE_HTML_CACHE_MAX_ENTRIES)와 HTML 바이트 합계
+  (config.SCRAPE_HTML_CACHE_MAX_BYTES) 중 하나라도 넘으면 가장 오래 사용하지 않은 항목부터 제거(LRU)
+- 만료 정리: 저장·조회 시 config.SCRAPE_HTML_SWEEP_INTERVAL 초마다 max-stale이 지난 항목을 제거하고,
+  TTL이 지난 항목의 파싱 문서는 먼저 버린다 (파싱 문서는 HTML보다 훨씬 크다)
+- 압축: config.SCRAPE_HTML_COMPRESS=true면 HTML을 zlib으로 압축해 보관 (조회 시 해제 비용 대신 메모리 절약)
+- 바이트 집계는 보관 중인 HTML(압축 시 압축본) 기준. 파싱 문서는 신선한 항목당 최대 1개.
+"""
+import sys
+import time
+import zlib
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import config
+
+logger = logging.getLogger(__name__)
+
+# 항목 인덱스: [stored_at, ttl, payload(str 또는 zlib bytes), size, text_sig, tree]. 시각은 time.time() 기준.
+_STORED_AT, _TTL, _PAYLOAD, _SIZE, _SIG, _TREE = range(6)
+
+
+def _signature(text: str) -> Tuple[int, int]:
+    """HTML 식별값 — 파싱 문서가 이 HTML에서 나온 것인지 확인용 (압축 시 조회마다 새 문자열이 나온다)"""
+    return len(text), hash(text)
+
+
+class HtmlCache:
+    """(url, rendered) 키 기반 TTL + LRU HTML 캐시 (항목 수·바이트 제한, 선택적 zlib 압축)"""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        max_stale: Optional[int] = None,
+        compress: Optional[bool] = None,
+        sweep_interval: Optional[float] = None,
+    ):
+        self.max_entries = max_entries if max_entries is not None else config.SCRAPE_HTML_CACHE_MAX_ENTRIES
+        self.max_bytes = max_bytes if max_bytes is not None else config.SCRAPE_HTML_CACHE_MAX_BYTES
+        self.max_stale = max_stale if max_stale is not None else config.SCRAPE_HTML_MAX_STALE
+        self.compress = compress if compress is not None else config.SCRAPE_HTML_COMPRESS
+        self.sweep_interval = sweep_interval if sweep_interval is not None else config.SCRAPE_HTML_SWEEP_INTERVAL
+        # key -> [stored_at, ttl, payload, size, text_sig, tree]
+        # 순서 = 최근 사용 순 (끝이 가장 최근)
+        self._entries: "OrderedDict[tuple, List[Any]]" = OrderedDict()
+        self.bytes = 0
+        self.html_chars = 0  # 압축 전 HTML 문자 수 합계 (압축률 확인용)
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+        self.expired = 0
+        self._last_sweep = time.time()
+
+    def _decode(self, entry: List[Any]) -> str:
+        payload = entry[_PAYLOAD]
+        return zlib.decompress(payload).decode("utf-8") if isinstance(payload, bytes) else payload
+
+    def _remove(self, key: tuple) -> List[Any]:
+        entry = self._entries.pop(key)
+        self.bytes -= entry[_SIZE]
+        self.html_chars -= entry[_SIG][0]
+        return entry
+
+    def get(self, key: tuple, ttl: float) -> Optional[str]:
+        """ttl(초) 이내에 저장된 HTML 반환 (없거나 만료 시 None)"""
+        self._maybe_sweep()
+        entry = self._entries.get(key)
+        if entry is None or time.time() - entry[_STORED_AT] > ttl:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        logger.debug(f"[scrape] HTML 캐시 사용: {key}")
+        return self._decode(entry)
+
+    def get_stale(self, key: tuple) -> Optional[Tuple[str, float]]:
+        """
+        TTL과 무관하게 보관 중인 HTML 반환 (max-stale 이내)
+
+        Returns:
+            (HTML, 저장 후 경과 초) 또는 None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        age = time.time() - entry[_STORED_AT]
+        if age > entry[_TTL] + self.max_stale:
+            return None
+        self._entries.move_to_end(key)
+        self.stale_hits += 1
+        return self._decode(entry), age
+
+    def set(self, key: tuple, text: str, ttl: float):
+        """HTML 저장 (이전 파싱 문서는 버림, 크기 초과 시 LRU 제거)"""
+        if key in self._entries:
+            self._remove(key)
+        payload: Any = zlib.compress(text.encode("utf-8")) if self.compress else text
+        size = sys.getsizeof(payload)
+        self._entries[key] = [time.time(), ttl, payload, size, _signature(text), None]
+        self.bytes += size
+        self.html_chars += len(text)
+
+        while self._entries and (len(self._entries) > self.max_entries or self.bytes > self.max_bytes):
+            evicted = next(iter(self._entries))
+            self._remove(evicted)
+            self.evictions += 1
+            logger.debug(f"[scrape] HTML 캐시 LRU 제거: {evicted}")
+        self._maybe_sweep()
+
+    def tree(self, key: tuple, text: str) -> Optional[Any]:
+        """text에서 파싱해 둔 문서 (없거나 다른 HTML의 문서면 None)"""
+        entry = self._entries.get(key)
+        if entry is None or entry[_TREE] is None or entry[_SIG] != _signature(text):
+            return None
+        return entry[_TREE]
+
+    def set_tree(self, key: tuple, text: str, tree: Any):
+        """text의 파싱 문서 보관 (그 사이 항목이 바뀌었거나 제거됐으면 보관하지 않음)"""
+        entry = self._entries.get(key)
+        if entry is not None and entry[_SIG] == _signature(text):
+            entry[_TREE] = tree
+
+    def _maybe_sweep(self):
+        if time.time() - self._last_sweep >= self.sweep_interval:
+            self.sweep()
+
+    def sweep(self) -> int:
+        """
+        만료 정리 — max-stale이 지난 항목 제거, TTL이 지난 항목의 파싱 문서 해제
+
+        Returns:
+            제거된 항목 수
+        """
+        now = time.time()
+        self._last_sweep = now
+        removed = 0
+        for key in list(self._entries):
+            entry = self._entries[key]
+            age = now - entry[_STORED_AT]
+            if age > entry[_TTL] + self.max_stale:
+                self._remove(key)
+                removed += 1
+            elif age > entry[_TTL]:
+                entry[_TREE] = None
+        if removed:
+            self.expired += removed
+            logger.info(f"[scrape] HTML 캐시 만료 정리: {removed}건")
+        return removed
+
+    def invalidate(self, url: Optional[str] = None) -> int:
+        """
+        캐시 무효화
+
+        Args:
+            url: 지정 시 해당 URL만, 미지정 시 전체
+
+        Returns:
+            제거된 항목 수
+        """
+        keys = [k for k in self._entries if url is None or k[0] == url]
+        for k in keys:
+            self._remove(k)
+        return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 상태 (디버깅용)"""
+        self._maybe_sweep()
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "html_chars": self.html_chars,
+            "compress": self.compress,
+            "trees": sum(1 for e in self._entries.values() if e[_TREE] is not None),
+            "max_stale": self.max_stale,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else None,
+            "stale_hits": self.stale_hits,
+            "evictions": self.evictions,
+            "expired": self.expired,
+        }
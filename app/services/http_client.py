@@ -0,0 +1,112 @@
+"""
+공유 HTTP 클라이언트 풀
+
+요청마다 httpx.AsyncClient()를 새로 만들면 매번 TCP+TLS 핸드셰이크를 다시 한다
+(api.kiwoom.com / openapi.tossinvest.com 기준 시세 1건 지연의 대부분).
+upstream별로 수명이 긴 클라이언트 1개를 두고 keep-alive 연결을 재사용한다.
+
+    kiwoom : 키움 REST API
+    toss   : 토스증권 Open API
+    scrape : 스크래핑 대상 페이지 (여러 호스트 공용)
+
+- 앱 기동 시(main.lifespan) 생성, 종료 시 정리. 그 외 경로(스크립트 등)에서는 첫 사용 시 생성.
+- 연결 풀 크기/keep-alive 유지 시간은 config.HTTP_* 로 조정.
+- HTTP/2는 선택 사항(config.HTTP2_ENABLED). `h2` 패키지가 없으면 경고 후 HTTP/1.1로 동작.
+"""
+import asyncio
+import logging
+from typing import Dict, Iterable, Optional, Tuple
+
+import httpx
+
+from app.core.config import config
+
+logger = logging.getLogger(__name__)
+
+#: 관리 대상 upstream 이름
+UPSTREAMS = ("kiwoom", "toss", "scrape")
+
+# name -> (client, 생성 시 이벤트 루프). 루프가 바뀌면 기존 연결을 쓸 수 없어 재생성한다.
+_clients: Dict[str, Tuple[httpx.AsyncClient, Optional[asyncio.AbstractEventLoop]]] = {}
+
+
+def _http2_available() -> bool:
+    """HTTP/2 지원 패키지(h2) 설치 여부"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _build_client(name: str) -> httpx.AsyncClient:
+    """설정 기반 클라이언트 생성"""
+    http2 = config.HTTP2_ENABLED
+    if http2 and not _http2_available():
+        logger.warning(
+            f"[http] HTTP2_ENABLED=true 이지만 h2 패키지가 없어 HTTP/1.1 사용 ({name}). "
+            "설치: pip install 'httpx[http2]'"
+        )
+        http2 = False
+
+    limits = httpx.Limits(
+        max_connections=config.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=config.HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=config.HTTP_KEEPALIVE_EXPIRY,
+    )
+    logger.info(
+        f"[http] 클라이언트 생성: {name} (http2={http2}, "
+        f"max_connections={config.HTTP_MAX_CONNECTIONS}, keepalive={config.HTTP_MAX_KEEPALIVE})"
+    )
+    return httpx.AsyncClient(limits=limits, http2=http2, timeout=10.0)
+
+
+def _current_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def get_http_client(name: str) -> httpx.AsyncClient:
+    """
+    upstream별 공유 클라이언트 반환 (없거나 닫혔거나 루프가 바뀌었으면 새로 생성)
+
+    Args:
+        name: upstream 이름 ("kiwoom" | "toss" | "scrape")
+    """
+    loop = _current_loop()
+    entry = _clients.get(name)
+    if entry is not None:
+        client, client_loop = entry
+        if not client.is_closed and (client_loop is None or client_loop is loop):
+            return client
+        if not client.is_closed:
+            # 다른 이벤트 루프에 묶인 연결은 이 루프에서 쓸 수 없다 (테스트 스크립트 등)
+            logger.warning(f"[http] 이벤트 루프 변경 감지 → 클라이언트 재생성: {name}")
+
+    client = _build_client(name)
+    _clients[name] = (client, loop)
+    return client
+
+
+async def init_http_clients(names: Iterable[str] = UPSTREAMS):
+    """앱 기동 시 클라이언트 미리 생성"""
+    for name in names:
+        get_http_client(name)
+
+
+async def close_http_clients():
+    """모든 공유 클라이언트 종료 (앱 shutdown 시 호출)"""
+    loop = _current_loop()
+    for name, (client, client_loop) in list(_clients.items()):
+        if client.is_closed:
+            continue
+        if client_loop is not None and client_loop is not loop:
+            continue  # 다른 루프 소유 — 정리 불가, 버린다
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"[http] 클라이언트 종료 중 오류({name}): {e}")
+    _clients.clear()
+    logger.info("[http] 공유 클라이언트 종료")
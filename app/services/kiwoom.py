@@ -7,12 +7,17 @@ PoC 코드(poc/src/get_token.py)를 참고하여 작성되었습니다.
 import os
 import time
 import httpx
+import asyncio
 import logging
-from typing import Optional, Dict, Any
-from dotenv import load_dotenv
+from typing import Optional, Dict, Any, List, Tuple
 
 from app.core.config import config
-from app.services.base import StockProvider, StockProviderError, ProviderAuthError
+from app.services.base import StockProvider, StockProviderError, ProviderAuthError, seconds_until
+from app.services.http_client import get_http_client
+from app.services.rate_limiter import get_rate_limiter
+from app.services.retry import get_retry_policy
+from app.services.token_store import TokenStore
+from app.utils.deadline import cap_timeout
 
 # 로거 설정
 logger = logging.getLogger(__name__)
@@ -29,67 +34,132 @@ class AuthenticationError(ProviderAuthError):
 
 
 class KiwoomClient(StockProvider):
-    """키움증권 API 클라이언트"""
+    """
+    키움증권 API 클라이언트 (appkey/secret 한 쌍)
+
+    여러 키를 쓰면 키마다 하나씩 만들어 KiwoomPool로 묶는다.
+    key_id는 키별 rate limiter·재시도 지표·토큰 갱신 작업의 이름이다 (단일 키면 "kiwoom").
+    """
 
     name = "kiwoom"
 
-    def __init__(self):
+    def __init__(
+        self,
+        appkey: Optional[str] = None,
+        secret: Optional[str] = None,
+        token_file: Optional[str] = None,
+        key_id: str = "kiwoom",
+    ):
         self.api_host = config.KIWOOM_API_HOST
-        self.appkey = config.KIWOOM_API_APPKEY
-        self.secret = config.KIWOOM_API_SECRET
-        self.token_file = config.KIWOOM_TOKEN_ENV
+        self.appkey = appkey if appkey is not None else config.KIWOOM_API_APPKEY
+        self.secret = secret if secret is not None else config.KIWOOM_API_SECRET
+        self.token_file = token_file or config.KIWOOM_TOKEN_ENV
+        self.key_id = key_id
+        self._store = TokenStore(self.token_file, "KIWOOM_API_TOKEN", "KIWOOM_API_EXPIRE_AT")
         self._token: Optional[str] = None
         self._token_expire_at: Optional[str] = None
         self._last_token_issued_at: Optional[str] = None  # 마지막 토큰 발급 시간
+        self._token_issued_mono: Optional[float] = None  # 마지막 발급 시각(monotonic, 재사용 판정용)
+        # 토큰 발급 직렬화 Lock (동시 만료 감지 시 발급 요청 폭주 방지). 루프별 지연 생성.
+        self._token_lock: Optional[asyncio.Lock] = None
+        self._token_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_token_lock(self) -> asyncio.Lock:
+        """현재 루프에 맞는 토큰 Lock 반환 (Lock도 루프에 바인딩되므로 지연 생성)"""
+        loop = asyncio.get_running_loop()
+        if self._token_lock is None or self._token_lock_loop is not loop:
+            self._token_lock = asyncio.Lock()
+            self._token_lock_loop = loop
+        return self._token_lock
+
+    def _memory_token_valid(self) -> bool:
+        """메모리 캐시 토큰이 있고 만료 전인지"""
+        now = time.strftime("%Y%m%d%H%M%S")
+        return bool(self._token and self._token_expire_at and self._token_expire_at > now)
 
-    def _load_token_from_file(self) -> Optional[str]:
-        """파일에서 저장된 토큰 로드"""
-        logger.debug(f"토큰 파일 로드 시도: {self.token_file}")
-
-        if not os.path.isfile(self.token_file):
-            logger.debug("토큰 파일이 존재하지 않음")
+    def token_expires_in(self) -> Optional[float]:
+        """메모리 토큰 만료까지 남은 초 (토큰이 없으면 None)"""
+        if not self._token:
             return None
+        return seconds_until(self._token_expire_at)
 
-        if not os.access(self.token_file, os.R_OK):
-            logger.warning("토큰 파일 읽기 권한 없음")
-            return None
+    async def renew_token(self) -> str:
+        """
+        만료 임박 토큰 선제 갱신 (백그라운드 갱신 작업용)
 
-        # 토큰 파일 로드
-        load_dotenv(self.token_file, override=True)
-        token = os.getenv("KIWOOM_API_TOKEN")
-        expire_at = os.getenv("KIWOOM_API_EXPIRE_AT")
+        대기하는 동안 다른 경로에서 이미 갱신했으면(남은 시간 > TOKEN_RENEW_MARGIN) 그대로 사용한다.
+        """
+        async with self._get_token_lock():
+            remaining = self.token_expires_in()
+            if remaining is not None and remaining > config.TOKEN_RENEW_MARGIN:
+                return self._token
+            logger.info(f"토큰 선제 갱신: 남은 시간={remaining}초")
+            return await self._issue_token_coordinated(
+                previous=self._token, min_valid=config.TOKEN_RENEW_MARGIN
+            )
 
-        if not token or not expire_at:
-            logger.warning("토큰 파일에 토큰 또는 만료 시간이 없음")
+    async def _issue_token_coordinated(self, previous: Optional[str], min_valid: float = 0) -> str:
+        """
+        프로세스 간 단일화된 토큰 발급 (토큰 파일 락)
+
+        락을 얻은 뒤 파일을 다시 확인해, 기다리는 동안 다른 워커/컨테이너가 발급한 토큰
+        (previous와 다르고 min_valid 초보다 오래 유효)이 있으면 새로 발급하지 않고 그 토큰을 쓴다.
+
+        Args:
+            previous: 지금 교체하려는 토큰 (만료/거부된 토큰). 파일에 같은 토큰만 있으면 발급.
+            min_valid: 재사용할 토큰의 최소 잔여 유효 시간(초)
+        """
+        async with self._store.issue_lock():
+            token = await self._load_token_from_file()
+            remaining = seconds_until(self._token_expire_at) if token else None
+            if token and token != previous and remaining is not None and remaining > min_valid:
+                logger.info(f"다른 프로세스가 발급한 토큰 사용: expire_at={self._token_expire_at}")
+                return token
+            return await self._request_new_token()
+
+    def _token_recently_issued(self) -> bool:
+        """방금(config.TOKEN_REUSE_WINDOW 초 이내) 발급된 토큰인지"""
+        return (
+            self._token_issued_mono is not None
+            and time.monotonic() - self._token_issued_mono < config.TOKEN_REUSE_WINDOW
+        )
+
+    async def _load_token_from_file(self) -> Optional[str]:
+        """파일에서 저장된 토큰 로드 (파일이 바뀌었을 때만 실제로 읽음, 만료 시 None)"""
+        logger.debug(f"토큰 파일 로드 시도: {self.token_file}")
+
+        stored = await self._store.load()
+        if stored is None:
+            logger.debug("토큰 파일이 없거나 내용이 없음")
             return None
+        token, expire_at = stored
 
-        # 만료 시간 확인
+        # 만료 시간 확인 (만료 파일은 지우지 않는다 — 다른 워커가 곧 덮어쓸 수 있음)
         now = time.strftime("%Y%m%d%H%M%S")
         if expire_at < now:
             logger.info(f"토큰 만료됨: expire_at={expire_at}, now={now}")
-            # 만료된 토큰 파일 삭제
-            try:
-                os.remove(self.token_file)
-                logger.info("만료된 토큰 파일 삭제 완료")
-            except Exception as e:
-                logger.warning(f"만료된 토큰 파일 삭제 실패: {e}")
             return None
 
-        logger.info(f"토큰 파일 로드 성공: expire_at={expire_at}")
+        if token != self._token:
+            logger.info(f"토큰 파일 로드 성공: expire_at={expire_at}")
         self._token = token
         self._token_expire_at = expire_at
         return token
 
-    def _save_token_to_file(self, token: str, expire_at: str):
-        """토큰을 파일에 저장"""
-        logger.info(f"토큰 파일 저장: expire_at={expire_at}")
-        with open(self.token_file, "w") as f:
-            f.write(f"KIWOOM_API_TOKEN = {token}\n")
-            f.write(f"KIWOOM_API_EXPIRE_AT = {expire_at}\n")
-
+    async def _save_token_to_file(self, token: str, expire_at: str):
+        """토큰을 메모리에 반영하고 파일에 원자적으로 저장 (파일 I/O는 스레드에서)"""
         self._token = token
         self._token_expire_at = expire_at
         self._last_token_issued_at = time.strftime("%Y-%m-%d %H:%M:%S")
+        self._token_issued_mono = time.monotonic()
+
+        logger.info(f"토큰 파일 저장: expire_at={expire_at}")
+        try:
+            await self._store.save(token, expire_at)
+        except OSError as e:
+            # 저장 실패해도 발급된 토큰은 메모리에서 계속 사용 가능
+            logger.error(f"토큰 파일 저장 실패({self.token_file}): {e}")
+            return
         logger.info("토큰 파일 저장 완료")
 
     async def _request_new_token(self) -> str:
@@ -103,13 +173,23 @@ class KiwoomClient(StockProvider):
             "secretkey": self.secret,
         }
 
+        client = get_http_client("kiwoom")
+        limiter = get_rate_limiter(self.key_id, "au10001")
+
+        async def _send() -> httpx.Response:
+            await limiter.acquire()
+            return await client.post(url, headers=headers, json=data, timeout=cap_timeout(10.0, "kiwoom.au10001"))
+
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url, headers=headers, json=data, timeout=10.0)
-                response.raise_for_status()
+            response = await get_retry_policy().send(f"{self.key_id}.au10001", _send, idempotent=False)
+            response.raise_for_status()
         except httpx.HTTPError as e:
             logger.error(f"토큰 요청 HTTP 에러: {e}")
-            raise KiwoomAPIError(f"토큰 요청 실패: {e}")
+            status_code = e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None
+            if status_code in (401, 403):
+                # 자격 증명 거부 — provider=auto·헬스 라우팅이 즉시 다른 provider로 넘기도록 인증 에러로
+                raise AuthenticationError(f"토큰 요청 거부: {e}", status_code=status_code) from e
+            raise KiwoomAPIError(f"토큰 요청 실패: {e}", status_code=status_code) from e
 
         result = response.json()
 
@@ -132,7 +212,7 @@ class KiwoomClient(StockProvider):
         logger.info(f"새 토큰 발급 성공: expire_at={expire_at}")
 
         # 파일에 저장
-        self._save_token_to_file(token, expire_at)
+        await self._save_token_to_file(token, expire_at)
 
         return token
 
@@ -142,6 +222,7 @@ class KiwoomClient(StockProvider):
 
         Args:
             force_new: True일 경우 강제로 새 토큰 발급
+                (단, 직전 TOKEN_REUSE_WINDOW 초 이내에 발급된 토큰이 있으면 재사용)
 
         Returns:
             액세스 토큰 문자열
@@ -152,25 +233,28 @@ class KiwoomClient(StockProvider):
         """
         logger.debug(f"토큰 획득 시작: force_new={force_new}")
 
-        # 메모리에 캐시된 토큰 확인
-        if not force_new and self._token:
-            now = time.strftime("%Y%m%d%H%M%S")
-            if self._token_expire_at and self._token_expire_at > now:
-                logger.debug("메모리 캐시 토큰 사용")
+        # 메모리에 캐시된 토큰 확인 (Lock 없이 빠른 경로)
+        if not force_new and self._memory_token_valid():
+            logger.debug("메모리 캐시 토큰 사용")
+            return self._token
+
+        # 발급은 한 번에 하나만: 동시에 만료/401을 감지한 요청들은 여기서 대기 후
+        # 먼저 들어간 요청이 발급한 토큰을 함께 사용한다. (프로세스 간에는 파일 락)
+        async with self._get_token_lock():
+            if self._memory_token_valid() and (not force_new or self._token_recently_issued()):
+                logger.debug("대기 중 발급된 토큰 재사용")
                 return self._token
-            else:
-                logger.debug(f"메모리 캐시 토큰 만료됨: expire_at={self._token_expire_at}, now={now}")
-
-        # 파일에서 토큰 로드
-        if not force_new:
-            token = self._load_token_from_file()
-            if token:
-                logger.debug("파일에서 로드한 토큰 사용")
-                return token
 
-        # 새 토큰 발급
-        logger.info("새 토큰 발급 필요")
-        return await self._request_new_token()
+            # 파일에서 토큰 로드
+            if not force_new:
+                token = await self._load_token_from_file()
+                if token:
+                    logger.debug("파일에서 로드한 토큰 사용")
+                    return token
+
+            # 새 토큰 발급 (다른 프로세스와 파일 락으로 단일화)
+            logger.info("새 토큰 발급 필요")
+            return await self._issue_token_coordinated(previous=self._token)
 
     @staticmethod
     def _parse_price(value: Optional[str]) -> Optional[int]:
@@ -193,7 +277,21 @@ class KiwoomClient(StockProvider):
         except (ValueError, TypeError):
             return None
 
-    async def get_stock_price(self, code: str, market: str = "KOSPI") -> Dict[str, Any]:
+    @staticmethod
+    def _is_auth_failure(response: httpx.Response) -> bool:
+        """토큰 만료 응답인지 (HTTP 401 또는 return_code=3)"""
+        if response.status_code == 401:
+            return True
+        if response.status_code != 200:
+            return False
+        try:
+            return response.json().get("return_code") == 3
+        except ValueError:
+            return False
+
+    async def get_stock_price(
+        self, code: str, market: str = "KOSPI", include_52w: bool = True
+    ) -> Dict[str, Any]:
         """
         주식 현재가 및 52주 최고가 조회 (비동기)
 
@@ -203,6 +301,7 @@ class KiwoomClient(StockProvider):
         Args:
             code: 종목 코드 (예: "005930")
             market: 시장 구분 ("KOSPI", "KOSDAQ")
+            include_52w: 사용하지 않음 (ka10001 한 번으로 현재가와 52주 값을 함께 받는다)
 
         Returns:
             시세 데이터 딕셔너리
@@ -236,69 +335,51 @@ class KiwoomClient(StockProvider):
 
         data = {"stk_cd": code}
 
-        # 재시도 플래그
-        retry_attempted = False
+        limiter = get_rate_limiter(self.key_id, "ka10001")
+        client = get_http_client("kiwoom")
+
+        async def _send() -> httpx.Response:
+            await limiter.acquire()
+            return await client.post(url, headers=headers, json=data, timeout=cap_timeout(10.0, "kiwoom.ka10001"))
+
+        async def _refresh_token():
+            # HTTP 401 / return_code=3 인증 에러 → 토큰 재발급 후 재시도
+            token = await self.get_token(force_new=True)
+            headers["authorization"] = f"Bearer {token}"
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url, headers=headers, json=data, timeout=10.0)
-                logger.debug(f"API 응답 상태 코드: {response.status_code}")
-
-                # HTTP 401 인증 에러 체크
-                if response.status_code == 401:
-                    logger.warning("HTTP 401 인증 에러 발생 - 토큰 재발급 시도")
-                    token = await self.get_token(force_new=True)
-                    headers["authorization"] = f"Bearer {token}"
-                    response = await client.post(url, headers=headers, json=data, timeout=10.0)
-                    logger.info("토큰 재발급 후 재시도 완료")
-                    retry_attempted = True
-
-                if response.status_code != 200:
-                    logger.error(f"HTTP 상태 코드 에러: {response.status_code}")
-                    raise KiwoomAPIError(f"HTTP 상태 코드: {response.status_code}")
-
-                result = response.json()
-                logger.debug(f"API 응답: return_code={result.get('return_code')}")
-
-                # 응답 검증
-                return_code = result.get("return_code")
-                if return_code != 0:
-                    return_msg = result.get("return_msg") or "알 수 없는 오류"
-                    logger.warning(f"API 에러 응답: return_code={return_code}, msg={return_msg}")
-
-                    # return_code=3 인증 에러 - 재시도
-                    if return_code == 3 and not retry_attempted:
-                        logger.warning("return_code=3 인증 실패 감지 - 토큰 재발급 시도")
-                        token = await self.get_token(force_new=True)
-                        headers["authorization"] = f"Bearer {token}"
-                        response = await client.post(url, headers=headers, json=data, timeout=10.0)
-                        logger.info("토큰 재발급 후 재시도 완료")
-
-                        if response.status_code != 200:
-                            logger.error(f"재시도 후 HTTP 상태 코드 에러: {response.status_code}")
-                            raise KiwoomAPIError(f"HTTP 상태 코드: {response.status_code}")
-
-                        result = response.json()
-                        return_code = result.get("return_code")
-                        logger.debug(f"재시도 후 API 응답: return_code={return_code}")
-
-                        if return_code != 0:
-                            return_msg = result.get("return_msg") or "알 수 없는 오류"
-                            logger.error(f"재시도 후에도 API 에러: return_code={return_code}, msg={return_msg}")
-                            if return_code == 3:
-                                raise AuthenticationError(f"인증 실패: {return_msg}")
-                            raise KiwoomAPIError(f"시세 조회 실패: [{return_code}] {return_msg}")
-
-                    elif return_code == 3:
-                        logger.error(f"재시도 후에도 인증 실패: {return_msg}")
-                        raise AuthenticationError(f"인증 실패: {return_msg}")
-                    else:
-                        logger.error(f"API 에러: [{return_code}] {return_msg}")
-                        raise KiwoomAPIError(f"시세 조회 실패: [{return_code}] {return_msg}")
+            # 일시 장애(연결 실패·429·5xx)는 재시도 정책에 따라 백오프 후 재시도.
+            # POST라 보낸 뒤 실패(읽기 타임아웃 등)는 재전송하지 않는다 (upstream 호출 한도 이중 차감 방지)
+            response = await get_retry_policy().send(
+                f"{self.key_id}.ka10001", _send,
+                is_auth_failure=self._is_auth_failure, refresh_auth=_refresh_token,
+                idempotent=False,
+            )
+            logger.debug(f"API 응답 상태 코드: {response.status_code}")
+
+            if response.status_code in (401, 403):
+                logger.error(f"재시도 후에도 인증 실패: HTTP {response.status_code}")
+                raise AuthenticationError(f"인증 실패: HTTP {response.status_code}", status_code=response.status_code)
+            if response.status_code != 200:
+                logger.error(f"HTTP 상태 코드 에러: {response.status_code}")
+                raise KiwoomAPIError(f"HTTP 상태 코드: {response.status_code}", status_code=response.status_code)
+
+            result = response.json()
+            logger.debug(f"API 응답: return_code={result.get('return_code')}")
+
+            # 응답 검증
+            return_code = result.get("return_code")
+            if return_code != 0:
+                return_msg = result.get("return_msg") or "알 수 없는 오류"
+                if return_code == 3:
+                    logger.error(f"재시도 후에도 인증 실패: {return_msg}")
+                    raise AuthenticationError(f"인증 실패: {return_msg}")
+                logger.error(f"API 에러: [{return_code}] {return_msg}")
+                raise KiwoomAPIError(f"시세 조회 실패: [{return_code}] {return_msg}")
 
         except httpx.HTTPError as e:
             logger.error(f"HTTP 에러: {e}")
-            raise KiwoomAPIError(f"시세 조회 실패: {e}")
+            raise KiwoomAPIError(f"시세 조회 실패: {e}") from e
 
         # 현재가 파싱 (부호 제거)
         current_price = self._parse_price(result.get("cur_prc"))
@@ -358,21 +439,13 @@ class KiwoomClient(StockProvider):
         # 파일 내용 읽기 시도
         if status["token_file"]["exists"] and status["token_file"]["readable"]:
             try:
-                with open(self.token_file, "r") as f:
-                    content = f.read()
-                    lines = content.strip().split("\n")
-                    file_data = {}
-                    for line in lines:
-                        if "=" in line:
-                            key, value = line.split("=", 1)
-                            file_data[key.strip()] = value.strip()
-
-                    file_expire_at = file_data.get("KIWOOM_API_EXPIRE_AT")
-                    status["token_file"]["content"] = {
-                        "token_preview": file_data.get("KIWOOM_API_TOKEN", "")[:20] + "..." if file_data.get("KIWOOM_API_TOKEN") else None,
-                        "expire_at": file_expire_at,
-                        "is_expired": file_expire_at < now if file_expire_at else None,
-                    }
+                stored = self._store.read_sync()
+                file_token, file_expire_at = stored if stored else (None, None)
+                status["token_file"]["content"] = {
+                    "token_preview": file_token[:20] + "..." if file_token else None,
+                    "expire_at": file_expire_at,
+                    "is_expired": file_expire_at < now if file_expire_at else None,
+                }
             except Exception as e:
                 status["token_file"]["read_error"] = str(e)
 
@@ -390,35 +463,167 @@ class KiwoomClient(StockProvider):
         if self._token:
             self._token_expire_at = expired_time
 
-        # 파일 만료
-        if os.path.isfile(self.token_file):
+        # 파일 만료 (만료 시간을 과거로 설정하여 재저장)
+        try:
+            stored = self._store.read_sync()
+            if stored:
+                self._store.write_sync(stored[0], expired_time)
+        except Exception as e:
+            raise KiwoomAPIError(f"토큰 파일 만료 처리 실패: {e}")
+
+
+POOL_ROUND_ROBIN = "round_robin"
+POOL_LEAST_LOADED = "least_loaded"
+
+
+class KiwoomPool(StockProvider):
+    """
+    키움 appkey 풀 (키마다 토큰·rate limiter가 따로인 KiwoomClient 묶음)
+
+    요청마다 격리되지 않은 키 중 하나를 고른다.
+      - round_robin: 돌아가며 선택
+      - least_loaded: 진행 중 요청이 가장 적은 키 (같으면 돌아가며)
+    키가 인증 실패(401/403, 토큰 발급 거부)나 429를 내면 그 키를 일정 시간 격리하고
+    같은 요청을 다른 키로 다시 보낸다. 모든 키가 격리 중이면 격리가 가장 먼저 끝나는 키를 쓴다.
+    """
+
+    name = "kiwoom"
+
+    def __init__(self, members: List[KiwoomClient], strategy: Optional[str] = None):
+        if not members:
+            raise ValueError("키움 풀에 키가 없습니다")
+        self.members = members
+        strategy = (strategy or config.KIWOOM_POOL_STRATEGY).strip().lower()
+        self.strategy = strategy if strategy in (POOL_ROUND_ROBIN, POOL_LEAST_LOADED) else POOL_ROUND_ROBIN
+        self._next = 0
+        self._in_flight: Dict[str, int] = {m.key_id: 0 for m in members}
+        self._quarantined_until: Dict[str, float] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {
+            m.key_id: {"requests": 0, "failures": 0, "quarantines": 0, "last_error": None} for m in members
+        }
+
+    def _is_quarantined(self, member: KiwoomClient, now: float) -> bool:
+        return self._quarantined_until.get(member.key_id, 0.0) > now
+
+    def _select(self, exclude: set) -> Optional[KiwoomClient]:
+        """이번 요청에 쓸 키 선택 (exclude = 이미 시도한 키)"""
+        now = time.monotonic()
+        count = len(self.members)
+        # 회전 순서: 마지막 선택 다음 키부터
+        ordered = [self.members[(self._next + i) % count] for i in range(count)]
+        candidates = [m for m in ordered if m.key_id not in exclude]
+        if not candidates:
+            return None
+        active = [m for m in candidates if not self._is_quarantined(m, now)]
+        if not active:
+            # 전부 격리 중 — 요청을 거부하기보다 격리가 가장 먼저 끝나는 키로 시도
+            return min(candidates, key=lambda m: self._quarantined_until.get(m.key_id, 0.0))
+        if self.strategy == POOL_LEAST_LOADED:
+            chosen = min(active, key=lambda m: self._in_flight[m.key_id])
+        else:
+            chosen = active[0]
+        self._next = (self.members.index(chosen) + 1) % count
+        return chosen
+
+    @staticmethod
+    def _quarantine_for(error: StockProviderError) -> Optional[float]:
+        """격리할 에러면 격리 시간(초), 아니면 None"""
+        if isinstance(error, AuthenticationError) or error.status_code in (401, 403):
+            return config.KIWOOM_KEY_AUTH_QUARANTINE
+        if error.status_code == 429:
+            return config.KIWOOM_KEY_QUARANTINE
+        return None
+
+    def _quarantine(self, member: KiwoomClient, seconds: float, error: StockProviderError):
+        self._quarantined_until[member.key_id] = time.monotonic() + seconds
+        self._stats[member.key_id]["quarantines"] += 1
+        logger.warning(f"[kiwoom-pool] 키 격리: {member.key_id} {seconds:.0f}초 ({error})")
+
+    async def get_stock_price(
+        self, code: str, market: str = "KOSPI", include_52w: bool = True
+    ) -> Dict[str, Any]:
+        """
+        풀에서 고른 키로 시세 조회 (인증 실패·429면 해당 키를 격리하고 다른 키로 재시도)
+
+        Raises:
+            KiwoomAPIError / AuthenticationError: 모든 키에서 실패했거나 격리 대상이 아닌 에러
+        """
+        tried: set = set()
+        last_error: Optional[StockProviderError] = None
+        while True:
+            member = self._select(tried)
+            if member is None:
+                raise last_error
+            tried.add(member.key_id)
+            stat = self._stats[member.key_id]
+            stat["requests"] += 1
+            self._in_flight[member.key_id] += 1
             try:
-                with open(self.token_file, "r") as f:
-                    content = f.read()
+                return await member.get_stock_price(code=code, market=market, include_52w=include_52w)
+            except StockProviderError as e:
+                stat["failures"] += 1
+                stat["last_error"] = str(e)
+                seconds = self._quarantine_for(e)
+                if seconds is None or len(self.members) == 1:
+                    raise
+                self._quarantine(member, seconds, e)
+                last_error = e
+            finally:
+                self._in_flight[member.key_id] -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """키별 선택·격리 지표 (디버그용)"""
+        now = time.monotonic()
+        keys = {}
+        for m in self.members:
+            until = self._quarantined_until.get(m.key_id, 0.0)
+            keys[m.key_id] = {
+                **self._stats[m.key_id],
+                "in_flight": self._in_flight[m.key_id],
+                "quarantined": until > now,
+                "quarantine_remaining": round(until - now, 1) if until > now else 0,
+                "token_expire_at": m._token_expire_at,
+            }
+        return {"strategy": self.strategy, "size": len(self.members), "keys": keys}
 
-                # 토큰 값 추출
-                token = None
-                for line in content.split("\n"):
-                    if "KIWOOM_API_TOKEN" in line and "=" in line:
-                        token = line.split("=", 1)[1].strip()
-                        break
+    def get_token_status(self) -> Dict[str, Any]:
+        """첫 키의 토큰 상태(단일 키와 같은 형식) + 풀 지표, 키가 여럿이면 나머지 키의 토큰 상태"""
+        status = self.members[0].get_token_status()
+        if len(self.members) > 1:
+            status["other_keys"] = {m.key_id: m.get_token_status() for m in self.members[1:]}
+        status["pool"] = self.stats()
+        return status
 
-                if token:
-                    # 만료 시간을 과거로 설정하여 재저장
-                    with open(self.token_file, "w") as f:
-                        f.write(f"KIWOOM_API_TOKEN = {token}\n")
-                        f.write(f"KIWOOM_API_EXPIRE_AT = {expired_time}\n")
-            except Exception as e:
-                raise KiwoomAPIError(f"토큰 파일 만료 처리 실패: {e}")
+    def force_expire_token(self):
+        """모든 키의 토큰 강제 만료 (테스트용)"""
+        for m in self.members:
+            m.force_expire_token()
+
+
+def build_kiwoom_members(credentials: List[Tuple[str, str]]) -> List[KiwoomClient]:
+    """
+    자격 증명 목록 → 키별 클라이언트
+
+    키가 하나면 기존과 같은 이름("kiwoom")·토큰 파일을 쓰고, 여럿이면 "kiwoom#1", "kiwoom#2"...
+    첫 키는 KIWOOM_TOKEN_ENV, 이후 키는 "<KIWOOM_TOKEN_ENV>.<번호>" 파일에 토큰을 저장한다.
+    """
+    if len(credentials) <= 1:
+        appkey, secret = credentials[0] if credentials else (None, None)
+        return [KiwoomClient(appkey, secret)]
+    members = []
+    for i, (appkey, secret) in enumerate(credentials, start=1):
+        token_file = config.KIWOOM_TOKEN_ENV if i == 1 else f"{config.KIWOOM_TOKEN_ENV}.{i}"
+        members.append(KiwoomClient(appkey, secret, token_file=token_file, key_id=f"kiwoom#{i}"))
+    return members
 
 
 # 싱글톤 인스턴스
-_client: Optional[KiwoomClient] = None
+_client: Optional[KiwoomPool] = None
 
 
-def get_kiwoom_client() -> KiwoomClient:
-    """키움 클라이언트 싱글톤 인스턴스 반환"""
+def get_kiwoom_client() -> KiwoomPool:
+    """키움 클라이언트(키 풀) 싱글톤 인스턴스 반환"""
     global _client
     if _client is None:
-        _client = KiwoomClient()
+        _client = KiwoomPool(build_kiwoom_members(config.kiwoom_credentials()))
     return _client
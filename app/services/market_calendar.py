@@ -0,0 +1,211 @@
+"""
+KRX 장 운영 캘린더
+
+장이 닫혀 있으면(장외 시간·주말·휴장일) 시세가 움직이지 않는다. 시세 캐시 TTL을
+이 모듈에서 산출하여, 장중에는 짧게(설정 TTL), 장 마감 후에는 다음 개장까지
+캐시된 시세를 재사용한다. → 야간 시트 갱신은 거의 전부 메모리에서 응답.
+
+세션 (KST, 거래일 기준):
+    nxt_pre   08:00 ~ 08:50  NXT 프리마켓
+    regular   09:00 ~ 15:30  KRX 정규장
+    nxt_after 15:30 ~ 20:00  NXT 애프터마켓
+
+NXT 세션 포함 여부는 config.MARKET_INCLUDE_NXT (기본 true).
+키움 현재가는 NXT 체결도 반영될 수 있어 기본은 보수적으로 포함한다.
+
+휴장일은 로컬 파일(config/krx_holidays.yaml)에서 읽는다 (mtime 감지 → 자동 재로드).
+한국은 서머타임이 없으므로 서버 타임존과 무관하게 고정 UTC+9로 계산한다.
+"""
+import os
+import logging
+import threading
+from datetime import date, datetime, time as dtime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import yaml
+
+from app.core.config import config
+
+logger = logging.getLogger(__name__)
+
+#: 한국 표준시 (서머타임 없음)
+KST = timezone(timedelta(hours=9), "KST")
+
+SESSION_NXT_PRE = "nxt_pre"
+SESSION_REGULAR = "regular"
+SESSION_NXT_AFTER = "nxt_after"
+
+#: (세션 이름, 시작, 종료) — 거래일 기준 KST
+SESSIONS: List[Tuple[str, dtime, dtime]] = [
+    (SESSION_NXT_PRE, dtime(8, 0), dtime(8, 50)),
+    (SESSION_REGULAR, dtime(9, 0), dtime(15, 30)),
+    (SESSION_NXT_AFTER, dtime(15, 30), dtime(20, 0)),
+]
+
+#: 다음 개장 탐색 한도(일). 긴 연휴도 충분히 덮는다.
+_MAX_LOOKAHEAD_DAYS = 30
+
+
+class MarketCalendar:
+    """KRX 거래일/세션 판정 + 시세 캐시 TTL 산출"""
+
+    def __init__(self, holidays_path: Optional[str] = None, include_nxt: Optional[bool] = None):
+        self.path = holidays_path or config.KRX_HOLIDAYS_PATH
+        self.include_nxt = config.MARKET_INCLUDE_NXT if include_nxt is None else include_nxt
+        self._holidays: Set[date] = set()
+        self._loaded_mtime: Optional[float] = None
+        self._missing_warned = False
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # 휴장일 로드
+    # ------------------------------------------------------------------
+    def _load_if_needed(self):
+        """휴장일 파일이 수정되었으면 재로드 (파일이 없으면 주말만 휴장 처리)"""
+        if not os.path.isfile(self.path):
+            if not self._missing_warned:
+                logger.warning(f"KRX 휴장일 파일이 없습니다(주말만 휴장 처리): {self.path}")
+                self._missing_warned = True
+            self._holidays = set()
+            self._loaded_mtime = None
+            return
+        self._missing_warned = False
+
+        mtime = os.path.getmtime(self.path)
+        if self._loaded_mtime == mtime:
+            return
+
+        with self._lock:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = yaml.safe_load(f) or {}
+            except (OSError, yaml.YAMLError) as e:
+                logger.error(f"KRX 휴장일 파일 로드 실패({self.path}): {e}")
+                self._loaded_mtime = mtime  # 같은 파일로 매번 재시도하지 않음
+                return
+
+            holidays: Set[date] = set()
+            for value in data.get("holidays") or []:
+                try:
+                    holidays.add(value if isinstance(value, date) else date.fromisoformat(str(value)))
+                except ValueError:
+                    logger.warning(f"KRX 휴장일 형식 오류(무시): {value!r}")
+
+            self._holidays = holidays
+            self._loaded_mtime = mtime
+            logger.info(f"KRX 휴장일 로드: {self.path} ({len(holidays)}일)")
+
+    # ------------------------------------------------------------------
+    # 거래일 / 세션
+    # ------------------------------------------------------------------
+    @staticmethod
+    def now() -> datetime:
+        """현재 KST 시각"""
+        return datetime.now(KST)
+
+    def is_trading_day(self, d: date) -> bool:
+        """거래일 여부 (주말·휴장일 제외)"""
+        self._load_if_needed()
+        return d.weekday() < 5 and d not in self._holidays
+
+    def _active_sessions(self) -> List[Tuple[str, dtime, dtime]]:
+        """캐시 TTL 판정에 사용할 세션 목록"""
+        if self.include_nxt:
+            return SESSIONS
+        return [s for s in SESSIONS if s[0] == SESSION_REGULAR]
+
+    def current_session(self, now: Optional[datetime] = None) -> Optional[str]:
+        """현재 진행 중인 세션 이름 (장외 시간이면 None)"""
+        now = (now or self.now()).astimezone(KST)
+        if not self.is_trading_day(now.date()):
+            return None
+        t = now.timetz().replace(tzinfo=None)
+        for name, start, end in self._active_sessions():
+            if start <= t < end:
+                return name
+        return None
+
+    def is_open(self, now: Optional[datetime] = None) -> bool:
+        """시세가 움직일 수 있는 시간인지"""
+        return self.current_session(now) is not None
+
+    def next_open(self, now: Optional[datetime] = None) -> Optional[datetime]:
+        """다음 세션 시작 시각 (탐색 한도 내에 없으면 None)"""
+        now = (now or self.now()).astimezone(KST)
+        for offset in range(_MAX_LOOKAHEAD_DAYS + 1):
+            d = now.date() + timedelta(days=offset)
+            if not self.is_trading_day(d):
+                continue
+            for _, start, _ in self._active_sessions():
+                start_dt = datetime.combine(d, start, tzinfo=KST)
+                if start_dt > now:
+                    return start_dt
+        return None
+
+    def trading_days_before(self, d: date, count: int) -> date:
+        """d 이전(d 미포함) count번째 거래일"""
+        current = d
+        remaining = count
+        while remaining > 0:
+            current -= timedelta(days=1)
+            if self.is_trading_day(current):
+                remaining -= 1
+        return current
+
+    # ------------------------------------------------------------------
+    # 캐시 TTL
+    # ------------------------------------------------------------------
+    def quote_ttl(self, base_ttl: int, now: Optional[datetime] = None) -> int:
+        """
+        시세 캐시 TTL(초)
+
+        장중이면 base_ttl, 장이 닫혀 있으면 다음 개장까지(최소 base_ttl).
+        """
+        now = (now or self.now()).astimezone(KST)
+        if self.is_open(now):
+            return base_ttl
+        next_open = self.next_open(now)
+        if next_open is None:
+            return base_ttl
+        return max(base_ttl, int((next_open - now).total_seconds()))
+
+    def next_trading_day_ttl(self, now: Optional[datetime] = None) -> int:
+        """
+        다음 거래일 첫 세션 시작까지 남은 초 (하루 단위로 바뀌는 값의 캐시 TTL, 예: 52주 최고/최저)
+
+        오늘 장이 끝나지 않았어도 오늘이 아닌 다음 거래일 기준이다. 탐색 한도 내에 거래일이 없으면 0.
+        """
+        now = (now or self.now()).astimezone(KST)
+        for offset in range(1, _MAX_LOOKAHEAD_DAYS + 1):
+            d = now.date() + timedelta(days=offset)
+            if self.is_trading_day(d):
+                first_start = self._active_sessions()[0][1]
+                return int((datetime.combine(d, first_start, tzinfo=KST) - now).total_seconds())
+        return 0
+
+    def status(self) -> Dict[str, Any]:
+        """장 상태 (디버깅용)"""
+        self._load_if_needed()
+        now = self.now()
+        next_open = self.next_open(now)
+        return {
+            "now": now.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "session": self.current_session(now),
+            "is_trading_day": self.is_trading_day(now.date()),
+            "next_open": next_open.strftime("%Y-%m-%dT%H:%M:%S%z") if next_open else None,
+            "include_nxt": self.include_nxt,
+            "holidays_file": self.path,
+            "holidays_loaded": len(self._holidays),
+        }
+
+
+# 싱글톤 인스턴스
+_calendar: Optional[MarketCalendar] = None
+
+
+def get_market_calendar() -> MarketCalendar:
+    """장 운영 캘린더 싱글톤 인스턴스 반환"""
+    global _calendar
+    if _calendar is None:
+        _calendar = MarketCalendar()
+    return _calendar
@@ -3,13 +3,47 @@
 
 provider 이름("kiwoom" | "toss")으로 해당 StockProvider 싱글톤을 반환한다.
 provider 미지정 시 config.DEFAULT_PROVIDER(환경 변수로 변경 가능)를 사용한다.
+
+시세 조회는 fetch_stock_price()를 통해 시세 캐시(app/services/quote_cache.py)를
+거친다. → 같은 종목 반복 호출은 TTL 동안 증권사 API를 다시 부르지 않는다.
+캐시 미스가 동시에 몰리면 single-flight로 병합해 증권사 호출은 키당 1회만 나간다.
+
+TTL이 지난 시세도 max-stale(config.QUOTE_MAX_STALE) 이내면 보관해 두고
+  - stale-while-revalidate: 만료된 시세를 즉시 반환하고 백그라운드에서 1회 갱신
+  - serve-stale-on-error : 증권사 호출 실패 시 마지막 정상 시세를 반환
+에 사용한다. 이렇게 반환된 시세는 "stale": True 로 표시된다(XML <stale>).
+
+요청이 필요한 필드(fields: all | price | 52w)만 신선하면 캐시로 응답한다.
+현재가만 필요한 조회는 provider에 include_52w=False로 요청해 52주 산출 비용(토스 캔들)을 아낀다.
+
+여러 종목 조회(fetch_stock_prices)는 캐시 미스 종목만 모아 provider 다건 조회 1회로 보낸다.
+
+provider="auto"(헤지 요청): config.AUTO_PROVIDERS 순서의 primary로 보내고, primary 지연 백분위만큼
+기다려도 응답이 없으면 보조 provider에도 요청해 먼저 온 응답을 쓴다. primary가 인증 실패·429/5xx·
+연결 실패로 끝나면 기다리지 않고 바로 보조 provider로 넘긴다. 응답의 "provider"는 실제 응답한 쪽이다.
+
+provider 미지정 요청(config.HEALTH_ROUTING)은 DEFAULT_PROVIDER 고정 대신 provider별 지연 EWMA·에러율로
+가장 상태가 좋은 provider로 보낸다. 연속 실패로 circuit breaker가 열린 provider는 호출하지 않고
+즉시 실패(CircuitOpenError, 보관된 시세가 있으면 stale 응답)한다. (app/services/provider_health.py)
+
+요청 deadline(app/utils/deadline.py)이 소진돼 provider 호출이 중단되면(DeadlineExceeded) 보관된 시세가
+있으면 stale로 응답하고, 없으면 DeadlineExceeded를 그대로 올린다(라우터 504). upstream 장애로 세지 않는다.
 """
-from typing import Optional, List
+import time
+import asyncio
+import logging
+from typing import Any, Dict, Optional, List, Set
 
 from app.core.config import config
-from app.services.base import StockProvider, StockProviderError
+from app.services.base import StockProvider, StockProviderError, CircuitOpenError, is_upstream_failure
 from app.services.kiwoom import get_kiwoom_client
 from app.services.toss import get_toss_client
+from app.services.quote_cache import get_quote_cache, FIELDS_ALL, FIELDS_PRICE
+from app.services.provider_health import get_provider_health
+from app.utils.deadline import DeadlineExceeded, start_detached
+from app.utils.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
 
 # provider 이름 → 싱글톤 팩토리 함수 매핑
 _PROVIDERS = {
@@ -17,6 +51,21 @@ _PROVIDERS = {
     "toss": get_toss_client,
 }
 
+#: 헤지 요청/자동 장애 전환 모드
+PROVIDER_AUTO = "auto"
+
+# provider 이름 → 자격 증명 설정 여부 (auto 모드 후보 선정)
+_CONFIGURED = {
+    "kiwoom": lambda: bool(config.kiwoom_credentials()),
+    "toss": lambda: bool(config.TOSS_API_CLIENT_ID and config.TOSS_API_SECRET),
+}
+
+# 동일 (provider, code, market, include_52w) 동시 조회 병합 (캐시 미스가 한꺼번에 몰릴 때)
+_price_flight = SingleFlight("price")
+
+# 진행 중인 백그라운드 갱신 Task (GC로 중간에 사라지지 않도록 참조 유지)
+_background_refreshes: Set[asyncio.Task] = set()
+
 
 def available_providers() -> List[str]:
     """지원하는 provider 이름 목록"""
@@ -30,6 +79,31 @@ def resolve_provider_name(name: Optional[str]) -> str:
     return name.strip().lower()
 
 
+def auto_provider_order() -> List[str]:
+    """provider=auto 시도 순서 (config.AUTO_PROVIDERS 중 자격 증명이 설정된 provider, 앞이 primary)"""
+    names = [n.strip().lower() for n in config.AUTO_PROVIDERS.split(",") if n.strip()]
+    known = [n for n in dict.fromkeys(names) if n in _PROVIDERS]
+    configured = [n for n in known if _CONFIGURED.get(n, lambda: True)()]
+    return configured or known[:1] or available_providers()[:1]
+
+
+def routing_candidates() -> List[str]:
+    """provider 미지정 요청의 라우팅 후보 (DEFAULT_PROVIDER + AUTO_PROVIDERS 중 자격 증명이 설정된 provider)"""
+    preferred = config.DEFAULT_PROVIDER
+    if not config.HEALTH_ROUTING:
+        return [preferred]
+    others = [n for n in auto_provider_order() if _CONFIGURED.get(n, lambda: True)()]
+    return list(dict.fromkeys([preferred] + others))
+
+
+def route_default_provider() -> List[str]:
+    """provider 미지정 요청의 시도 순서 (앞이 보낼 provider, 다음은 장애 시 전환 대상)"""
+    candidates = routing_candidates()
+    if len(candidates) < 2:
+        return candidates
+    return get_provider_health().route(config.DEFAULT_PROVIDER, candidates)
+
+
 def get_provider(name: Optional[str] = None) -> StockProvider:
     """
     provider 이름으로 StockProvider 인스턴스 반환
@@ -50,3 +124,342 @@ def get_provider(name: Optional[str] = None) -> StockProvider:
             f"지원하지 않는 provider입니다: '{resolved}'. 사용 가능: {available_providers()}"
         )
     return factory()
+
+
+async def fetch_stock_price(
+    name: Optional[str], code: str, market: str = "KOSPI", fields: str = FIELDS_ALL
+) -> Dict[str, Any]:
+    """
+    시세 조회 (캐시 적용)
+
+    (provider, code, market) 키로 캐시를 먼저 확인하고, 요청 필드가 만료됐을 때만
+    provider의 get_stock_price()를 호출해 결과를 캐시에 저장한다.
+    같은 키로 이미 진행 중인 호출이 있으면 새로 호출하지 않고 그 결과를 함께 기다린다.
+
+    TTL이 지났지만 max-stale 이내인 시세가 있으면:
+      - QUOTE_STALE_WHILE_REVALIDATE=true → 즉시 stale 시세 반환 + 백그라운드 갱신 1회
+      - 증권사 호출 실패 → 예외 대신 stale 시세 반환
+
+    Args:
+        name: provider 이름 (None이면 기본값)
+        code: 종목 코드
+        market: 시장 구분
+        fields: 필요한 필드 "all" | "price" | "52w" (캐시 신선도 판정 기준)
+
+    Returns:
+        StockProvider.get_stock_price()와 동일한 스키마의 딕셔너리
+        (stale 시세인 경우 "stale": True, "stale_age": 저장 후 경과 초 추가)
+
+    Raises:
+        CircuitOpenError: circuit breaker가 열린 provider (보관된 시세도 없음)
+        DeadlineExceeded: 요청 deadline 소진 (보관된 시세도 없음)
+        StockProviderError: 지원하지 않는 provider 또는 API 호출 실패(보관된 시세도 없음)
+    """
+    if not name and config.HEALTH_ROUTING:
+        return await _fetch_routed(code, market, fields)
+    resolved = resolve_provider_name(name)
+    if resolved == PROVIDER_AUTO:
+        return await _fetch_hedged(code, market, fields)
+    cache = get_quote_cache()
+
+    cached = cache.get(resolved, code, market, fields)
+    if cached is not None:
+        return cached
+
+    provider = get_provider(resolved)
+    include_52w = fields != FIELDS_PRICE
+    key = (resolved, code, market, include_52w)
+
+    async def _load() -> Dict[str, Any]:
+        data = await _call_provider(resolved, provider, code, market, include_52w)
+        # 현재가만 받은 경우 보관 중인 52주 값을 이어받은 결과를 반환
+        return cache.set(resolved, code, market, data, include_52w)
+
+    if not _price_flight.in_flight(key) and not get_provider_health().get(resolved).allow_request():
+        # circuit 열림: upstream 호출 없이 즉시 실패 (보관된 시세가 있으면 stale 응답)
+        stale = cache.get_stale(resolved, code, market)
+        if stale is None:
+            raise CircuitOpenError(f"{resolved} 연속 호출 실패로 일시 차단 중입니다 (circuit open)")
+        return _mark_stale(*stale)
+
+    if config.QUOTE_STALE_WHILE_REVALIDATE:
+        stale = cache.get_stale(resolved, code, market)
+        if stale is not None:
+            _schedule_refresh(key, _load)
+            return _mark_stale(*stale)
+
+    try:
+        # upstream 호출은 먼저 온 요청의 deadline과 무관하게 진행, 호출자마다 자기 남은 시간만큼만 대기
+        data = await _price_flight.do(key, _load, detached=True)
+    except (StockProviderError, DeadlineExceeded) as e:
+        stale = cache.get_stale(resolved, code, market)
+        if stale is None:
+            raise
+        logger.warning(f"시세 조회 실패 → 보관된 시세 반환(stale): {key} ({e})")
+        return _mark_stale(*stale)
+
+    # 합류한 호출자끼리 같은 객체를 공유하지 않도록 복사본 반환
+    return dict(data)
+
+
+async def fetch_stock_prices(
+    name: Optional[str], codes: List[str], market: str = "KOSPI", fields: str = FIELDS_ALL
+) -> List[Dict[str, Any]]:
+    """
+    여러 종목 시세 조회 (캐시 적용, /api/prices)
+
+    종목별로 fetch_stock_price()와 같은 순서(캐시 → stale → 조회)를 따르되,
+    캐시 미스 종목은 provider.get_stock_prices() 한 번으로 모아 조회한다.
+    (토스: 다건 현재가 API, 키움: 동시 실행 수 제한 병렬 호출)
+    이미 같은 키로 진행 중인 단건 조회가 있으면 새로 조회하지 않고 합류하고,
+    묶음으로 조회 중인 종목은 같은 키로 등록해 그 사이 들어온 단건 요청도 합류한다.
+
+    Args:
+        name: provider 이름 (None이면 기본값)
+        codes: 종목 코드 목록 (중복은 1회만 조회)
+        market: 시장 구분
+        fields: 필요한 필드 "all" | "price" | "52w"
+
+    Returns:
+        codes 순서대로 시세 딕셔너리 목록. 실패한 종목은
+        {"code": ..., "market": ..., "provider": ..., "error": 메시지} 항목으로 담는다.
+
+    Raises:
+        StockProviderError: 지원하지 않는 provider
+    """
+    if not name and config.HEALTH_ROUTING:
+        # 다건 조회는 라우팅 1순위로만 보낸다 (장애 전환 없음)
+        resolved = route_default_provider()[0]
+    else:
+        resolved = resolve_provider_name(name)
+    if resolved == PROVIDER_AUTO:
+        # 다건 조회는 헤지하지 않고 primary로 보낸다
+        resolved = auto_provider_order()[0]
+    provider = get_provider(resolved)
+    cache = get_quote_cache()
+    health = get_provider_health()
+
+    include_52w = fields != FIELDS_PRICE
+    results: Dict[str, Any] = {}
+    misses: List[str] = []
+    joined: Dict[str, asyncio.Future] = {}
+    allowed: Optional[bool] = None  # circuit 확인은 캐시 미스가 처음 나올 때 1회
+
+    for code in dict.fromkeys(codes):
+        cached = cache.get(resolved, code, market, fields)
+        if cached is not None:
+            results[code] = cached
+            continue
+
+        key = (resolved, code, market, include_52w)
+
+        async def _load(code: str = code) -> Dict[str, Any]:
+            data = await _call_provider(resolved, provider, code, market, include_52w)
+            return cache.set(resolved, code, market, data, include_52w)
+
+        if allowed is None:
+            allowed = health.get(resolved).allow_request()
+        if not allowed:
+            stale = cache.get_stale(resolved, code, market)
+            results[code] = _mark_stale(*stale) if stale is not None else {
+                "code": code, "market": market, "provider": resolved,
+                "error": f"{resolved} 연속 호출 실패로 일시 차단 중입니다 (circuit open)",
+            }
+            continue
+
+        if config.QUOTE_STALE_WHILE_REVALIDATE:
+            stale = cache.get_stale(resolved, code, market)
+            if stale is not None:
+                _schedule_refresh(key, _load)
+                results[code] = _mark_stale(*stale)
+                continue
+
+        if _price_flight.in_flight(key):
+            joined[code] = asyncio.ensure_future(_price_flight.do(key, _load, detached=True))
+        else:
+            misses.append(code)
+
+    if misses:
+        # 묶음 조회는 요청 deadline 없이 끝까지 진행하고(결과는 캐시에 남음), 진행 중에는 종목별로
+        # fetch_stock_price()와 같은 키로 single-flight에 등록해 같은 종목 단건 요청이 합류하게 한다
+        batch = start_detached(_call_provider_batch(resolved, provider, misses, market, include_52w))
+        for code in misses:
+            async def _from_batch(code: str = code) -> Dict[str, Any]:
+                data = (await asyncio.shield(batch)).get(code)
+                if isinstance(data, BaseException):
+                    raise data
+                if data is None:
+                    raise StockProviderError(f"{resolved} 시세 데이터를 찾을 수 없습니다: code={code}")
+                return cache.set(resolved, code, market, data, include_52w)
+
+            task = _price_flight.start((resolved, code, market, include_52w), _from_batch, detached=True)
+            joined[code] = asyncio.ensure_future(_price_flight.wait(task, detached=True))
+
+    fetched: Dict[str, Any] = {}
+    for code, future in joined.items():
+        try:
+            fetched[code] = dict(await future)
+        except (StockProviderError, DeadlineExceeded) as e:
+            fetched[code] = e
+
+    for code, data in fetched.items():
+        if isinstance(data, (StockProviderError, DeadlineExceeded)):
+            stale = cache.get_stale(resolved, code, market)
+            if stale is not None:
+                logger.warning(f"시세 조회 실패 → 보관된 시세 반환(stale): {(resolved, code, market)} ({data})")
+                results[code] = _mark_stale(*stale)
+            else:
+                results[code] = {"code": code, "market": market, "provider": resolved, "error": str(data)}
+            continue
+        results[code] = data
+
+    return [dict(results[code]) for code in codes]
+
+
+async def _call_provider_batch(
+    resolved: str, provider: StockProvider, codes: List[str], market: str, include_52w: bool
+) -> Dict[str, Any]:
+    """provider 다건 호출 + 결과를 provider 상태에 기록 (다건 조회 1회를 호출 1건으로)"""
+    health = get_provider_health()
+    try:
+        fetched = await provider.get_stock_prices(codes, market=market, include_52w=include_52w)
+    except StockProviderError as e:
+        # 토큰 발급 실패 등 묶음 전체 실패
+        fetched = {code: e for code in codes}
+    except BaseException:
+        health.get(resolved).release_probe()
+        raise
+    # 모든 종목이 upstream 장애면 실패로 기록
+    errors = [e for e in fetched.values() if isinstance(e, StockProviderError)]
+    if errors and len(errors) == len(fetched) and all(is_upstream_failure(e) for e in errors):
+        health.get(resolved).record_failure(errors[0])
+    else:
+        health.record(resolved, None)
+    return fetched
+
+
+async def _call_provider(
+    resolved: str, provider: StockProvider, code: str, market: str, include_52w: bool
+) -> Dict[str, Any]:
+    """provider 단건 호출 + 결과(지연·성공/실패)를 provider 상태에 기록"""
+    health = get_provider_health()
+    started = time.monotonic()
+    try:
+        data = await provider.get_stock_price(code=code, market=market, include_52w=include_52w)
+    except StockProviderError as e:
+        health.record_error(resolved, e, time.monotonic() - started)
+        raise
+    except BaseException:
+        # 취소 등 결과를 알 수 없는 종료 — half-open 시험 호출 자리만 반환
+        health.get(resolved).release_probe()
+        raise
+    health.record(resolved, time.monotonic() - started)
+    return data
+
+
+async def _fetch_routed(code: str, market: str, fields: str) -> Dict[str, Any]:
+    """
+    provider 미지정 시세 조회 — 상태가 가장 좋은 provider로 보내고, upstream 장애면 다음 후보로 전환
+
+    Raises:
+        StockProviderError: 모든 후보 실패 (첫 후보 에러 우선)
+    """
+    order = route_default_provider()
+    try:
+        return await fetch_stock_price(order[0], code=code, market=market, fields=fields)
+    except StockProviderError as error:
+        if len(order) < 2 or not is_upstream_failure(error):
+            raise
+        get_provider_health().get(order[0]).failovers += 1
+        logger.warning(f"[route] {order[0]} 실패 → {order[1]}로 전환: {code} ({error})")
+        try:
+            return await fetch_stock_price(order[1], code=code, market=market, fields=fields)
+        except StockProviderError as e:
+            raise error from e
+
+
+async def _fetch_hedged(code: str, market: str, fields: str) -> Dict[str, Any]:
+    """
+    provider=auto 시세 조회 — primary 지연 시 보조 provider로 헤지, upstream 장애 시 즉시 전환
+
+    Raises:
+        StockProviderError: 모든 provider 실패 (primary 에러 우선)
+    """
+    order = auto_provider_order()
+    if len(order) < 2:
+        return await fetch_stock_price(order[0], code=code, market=market, fields=fields)
+
+    primary, secondary = order[0], order[1]
+    health = get_provider_health()
+    delay = health.get(primary).hedge_delay()
+
+    first = asyncio.ensure_future(fetch_stock_price(primary, code=code, market=market, fields=fields))
+    try:
+        done, _ = await asyncio.wait({first}, timeout=delay)
+    except asyncio.CancelledError:
+        first.cancel()
+        raise
+    if first in done:
+        error = first.exception()
+        if error is None:
+            return first.result()
+        if not (isinstance(error, StockProviderError) and is_upstream_failure(error)):
+            raise error
+        health.get(primary).failovers += 1
+        logger.warning(f"[auto] {primary} 실패 → {secondary}로 전환: {code} ({error})")
+        try:
+            return await fetch_stock_price(secondary, code=code, market=market, fields=fields)
+        except StockProviderError as e:
+            raise error from e
+
+    # primary 응답 지연 → 보조 provider로 헤지 요청, 먼저 성공한 응답 사용
+    health.get(primary).hedges += 1
+    logger.info(f"[auto] {primary} {delay * 1000:.0f}ms 무응답 → {secondary} 헤지 요청: {code}")
+    second = asyncio.ensure_future(fetch_stock_price(secondary, code=code, market=market, fields=fields))
+    pending = {first, second}
+    errors: Dict[asyncio.Future, BaseException] = {}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                error = task.exception()
+                if error is None:
+                    if task is second:
+                        health.get(primary).hedge_wins += 1
+                    return task.result()
+                errors[task] = error
+        raise errors.get(first) or errors[second]
+    finally:
+        # 진 쪽 대기 취소 (provider 호출 자체는 single-flight Task라 끝까지 진행돼 캐시에 남는다)
+        for task in pending:
+            task.cancel()
+
+
+def _mark_stale(data: Dict[str, Any], age: float) -> Dict[str, Any]:
+    """stale 시세 표시"""
+    data["stale"] = True
+    data["stale_age"] = int(age)
+    return data
+
+
+def _schedule_refresh(key: tuple, load) -> None:
+    """백그라운드 갱신 예약 (같은 키가 이미 갱신 중이면 생략)"""
+    if _price_flight.in_flight(key):
+        return
+
+    async def _refresh():
+        try:
+            await _price_flight.do(key, load, detached=True)
+            logger.debug(f"백그라운드 시세 갱신 완료: {key}")
+        except Exception as e:
+            logger.warning(f"백그라운드 시세 갱신 실패: {key} ({e})")
+
+    # 요청이 끝나도 갱신은 끝까지 진행 (요청 deadline 미적용)
+    task = start_detached(_refresh())
+    _background_refreshes.add(task)
+    task.add_done_callback(_background_refreshes.discard)
+
+
+def price_flight_stats() -> Dict[str, Any]:
+    """시세 single-flight 카운터 (디버깅용, coalesced = 병합된 호출 수)"""
+    return _price_flight.stats()
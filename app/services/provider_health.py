@@ -0,0 +1,313 @@
+"""
+provider별 상태(지연·에러율·circuit breaker)
+
+provider별 upstream 호출 결과를 기록해 다음 세 곳에 쓴다.
+
+1. provider=auto(헤지 요청): "언제 보조 provider로 헤지 요청을 보낼지"
+   - 헤지 대기 시간 = primary 지연의 config.HEDGE_PERCENTILE 백분위
+     (표본이 config.HEDGE_MIN_SAMPLES 미만이면 config.HEDGE_DEFAULT_DELAY),
+     config.HEDGE_MIN_DELAY ~ HEDGE_MAX_DELAY 범위로 제한
+2. provider 미지정 요청 라우팅 (config.HEALTH_ROUTING): 지연 EWMA와 최근 에러율로 점수를 매겨
+   가장 상태가 좋은 provider로 보낸다. 점수 = EWMA 지연 / 성공률 (성공 1건을 얻는 기대 시간, 작을수록 좋음)
+   - 기본 provider(DEFAULT_PROVIDER)는 다른 provider 점수가 HEALTH_SWITCH_RATIO 배 이상 좋을 때만 밀려난다
+   - HEALTH_SAMPLE_TTL 초 넘게 호출이 없던 provider의 점수는 모르는 것으로 본다 (기본 provider로 복귀)
+3. circuit breaker: 연속 CIRCUIT_FAILURE_THRESHOLD회 upstream 장애(인증 실패·429/5xx·연결 실패) 시 열림
+   → CIRCUIT_COOLDOWN 초 동안 호출 없이 즉시 실패(CircuitOpenError) → half-open: 시험 호출 1건 허용
+   → 성공하면 닫힘, 실패하면 다시 열림
+
+- 종목 코드 오류 등 요청 자체의 실패는 upstream이 정상 응답한 것으로 본다 (장애로 세지 않음)
+- 캐시 적중은 기록하지 않는다 (실제 증권사 호출만)
+- 상태 확인: /debug/provider-health (라우팅이 바뀐 이유는 route_changes)
+"""
+import math
+import time
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from app.core.config import config
+from app.services.base import is_upstream_failure
+
+logger = logging.getLogger(__name__)
+
+#: provider별 보관하는 최근 지연 표본 수
+LATENCY_WINDOW = 200
+
+#: 보관하는 라우팅 변경 이력 수
+ROUTE_LOG_SIZE = 20
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+class ProviderStats:
+    """provider 1개의 최근 지연·에러 기록 + circuit breaker + 헤지 카운터"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.ewma_latency: Optional[float] = None
+        self.outcomes: Deque[bool] = deque(maxlen=max(config.HEALTH_WINDOW, 1))  # True = upstream 장애
+        self.calls = 0
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.last_error: Optional[str] = None
+        self.last_call_at: Optional[float] = None  # monotonic
+        self.hedges = 0       # 이 provider가 primary일 때 헤지 요청을 보낸 횟수
+        self.hedge_wins = 0   # 헤지로 보낸 보조 provider가 먼저 응답한 횟수
+        self.failovers = 0    # 이 provider 실패로 보조 provider로 넘긴 횟수
+        # circuit breaker
+        self._state = CIRCUIT_CLOSED
+        self._opened_at = 0.0
+        self._probe_at: Optional[float] = None  # half-open 시험 호출 시작 시각
+        self.circuit_opens = 0
+        self.rejected = 0     # circuit이 열려 호출하지 않고 실패시킨 횟수
+
+    def record(self, latency: Optional[float]):
+        """
+        upstream 호출 성공 1건 기록
+
+        Args:
+            latency: 지연(초). 다건 조회처럼 단건 지연으로 볼 수 없으면 None
+        """
+        self.calls += 1
+        self.last_call_at = time.monotonic()
+        self.outcomes.append(False)
+        self.consecutive_failures = 0
+        if latency is not None:
+            self.latencies.append(latency)
+            if self.ewma_latency is None:
+                self.ewma_latency = latency
+            else:
+                alpha = config.HEALTH_EWMA_ALPHA
+                self.ewma_latency = alpha * latency + (1 - alpha) * self.ewma_latency
+        if self._state != CIRCUIT_CLOSED:
+            logger.info(f"[health] {self.name} circuit 닫힘 (시험 호출 성공)")
+            self._state = CIRCUIT_CLOSED
+        self._probe_at = None
+
+    def record_failure(self, error: BaseException):
+        """upstream 장애 1건 기록 (연속 실패가 기준 이상이거나 시험 호출 실패면 circuit 열림)"""
+        self.calls += 1
+        self.errors += 1
+        self.last_call_at = time.monotonic()
+        self.outcomes.append(True)
+        self.consecutive_failures += 1
+        self.last_error = str(error)
+        if self._state == CIRCUIT_HALF_OPEN or (
+            self._state == CIRCUIT_CLOSED
+            and self.consecutive_failures >= config.CIRCUIT_FAILURE_THRESHOLD
+        ):
+            self._state = CIRCUIT_OPEN
+            self._opened_at = time.monotonic()
+            self.circuit_opens += 1
+            logger.warning(
+                f"[health] {self.name} circuit 열림: 연속 {self.consecutive_failures}회 실패 "
+                f"→ {config.CIRCUIT_COOLDOWN:.0f}초간 호출 차단 ({error})"
+            )
+        self._probe_at = None
+
+    def release_probe(self):
+        """결과를 기록하지 못하고 끝난 시험 호출(취소 등)의 자리 반환"""
+        self._probe_at = None
+
+    @property
+    def state(self) -> str:
+        """circuit 상태 (열린 지 CIRCUIT_COOLDOWN 초가 지나면 half-open)"""
+        if self._state == CIRCUIT_OPEN and time.monotonic() - self._opened_at >= config.CIRCUIT_COOLDOWN:
+            self._state = CIRCUIT_HALF_OPEN
+        return self._state
+
+    def probe_available(self) -> bool:
+        """half-open에서 시험 호출을 보낼 수 있는지 (진행 중인 시험 호출이 없거나 너무 오래됨)"""
+        return self._probe_at is None or time.monotonic() - self._probe_at > config.CIRCUIT_COOLDOWN
+
+    def allow_request(self) -> bool:
+        """
+        upstream 호출 허용 여부 (half-open이면 시험 호출 1건만 허용하고 자리를 차지한다)
+
+        False면 호출 측은 upstream을 부르지 않고 즉시 실패(또는 stale 응답)해야 한다.
+        """
+        state = self.state
+        if state == CIRCUIT_CLOSED:
+            return True
+        if state == CIRCUIT_HALF_OPEN and self.probe_available():
+            self._probe_at = time.monotonic()
+            logger.info(f"[health] {self.name} half-open → 시험 호출")
+            return True
+        self.rejected += 1
+        return False
+
+    def error_rate(self) -> Optional[float]:
+        """최근 config.HEALTH_WINDOW 건 중 upstream 장애 비율 (기록이 없으면 None)"""
+        if not self.outcomes:
+            return None
+        return sum(self.outcomes) / len(self.outcomes)
+
+    def score(self) -> Optional[float]:
+        """
+        라우팅 점수(초, 작을수록 좋음) = EWMA 지연 / 성공률
+
+        지연 표본이 없거나 마지막 호출이 HEALTH_SAMPLE_TTL 초보다 오래됐으면 None(모름).
+        """
+        if self.ewma_latency is None or self.last_call_at is None:
+            return None
+        if time.monotonic() - self.last_call_at > config.HEALTH_SAMPLE_TTL:
+            return None
+        success_rate = 1 - (self.error_rate() or 0.0)
+        return self.ewma_latency / max(success_rate, 0.05)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """최근 지연의 p 백분위(초), 표본이 없으면 None (nearest-rank)"""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        rank = max(math.ceil(p / 100 * len(ordered)), 1)
+        return ordered[min(rank, len(ordered)) - 1]
+
+    def hedge_delay(self) -> float:
+        """헤지 요청을 보내기까지 기다릴 시간(초)"""
+        if len(self.latencies) < config.HEDGE_MIN_SAMPLES:
+            delay = config.HEDGE_DEFAULT_DELAY
+        else:
+            delay = self.percentile(config.HEDGE_PERCENTILE)
+        return min(max(delay, config.HEDGE_MIN_DELAY), config.HEDGE_MAX_DELAY)
+
+    def stats(self) -> Dict[str, Any]:
+        """지표 (디버깅용)"""
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 1) if value is not None else None
+
+        state = self.state
+        error_rate = self.error_rate()
+        return {
+            "circuit": state,
+            "circuit_retry_in": (
+                round(max(config.CIRCUIT_COOLDOWN - (time.monotonic() - self._opened_at), 0), 1)
+                if state == CIRCUIT_OPEN else None
+            ),
+            "circuit_opens": self.circuit_opens,
+            "rejected": self.rejected,
+            "consecutive_failures": self.consecutive_failures,
+            "error_rate": round(error_rate, 4) if error_rate is not None else None,
+            "last_error": self.last_error,
+            "score_ms": ms(self.score()),
+            "calls": self.calls,
+            "errors": self.errors,
+            "samples": len(self.latencies),
+            "latency_ewma_ms": ms(self.ewma_latency),
+            "latency_p50_ms": ms(self.percentile(50)),
+            "latency_p95_ms": ms(self.percentile(95)),
+            "hedge_delay_ms": ms(self.hedge_delay()),
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "failovers": self.failovers,
+        }
+
+
+class ProviderHealth:
+    """provider 이름 → ProviderStats + provider 미지정 요청 라우팅"""
+
+    def __init__(self):
+        self._stats: Dict[str, ProviderStats] = {}
+        self.current_route: Optional[str] = None
+        self.route_changes: Deque[Dict[str, Any]] = deque(maxlen=ROUTE_LOG_SIZE)
+
+    def get(self, name: str) -> ProviderStats:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = ProviderStats(name)
+            self._stats[name] = stats
+        return stats
+
+    def record(self, name: str, latency: Optional[float]):
+        """upstream 호출 성공 기록"""
+        self.get(name).record(latency)
+
+    def record_error(self, name: str, error: BaseException, latency: Optional[float] = None):
+        """upstream 호출 실패 기록 (upstream 장애가 아니면 정상 응답으로 기록)"""
+        if is_upstream_failure(error):
+            self.get(name).record_failure(error)
+        else:
+            self.get(name).record(latency)
+
+    def route(self, preferred: str, candidates: List[str]) -> List[str]:
+        """
+        provider 미지정 요청의 시도 순서 (앞이 실제로 보낼 provider, 다음은 장애 시 전환 대상)
+
+        1. half-open이라 시험 호출을 보낼 수 있는 provider (회복 확인, 실패 시 다음으로 전환)
+        2. circuit이 닫힌 provider — preferred 우선, 다른 provider 점수가 HEALTH_SWITCH_RATIO 배 이상
+           좋으면 그쪽 우선
+        circuit이 열린 provider는 제외한다 (모두 열려 있으면 preferred만 — 즉시 실패/stale 응답).
+
+        Args:
+            preferred: 기본 provider (config.DEFAULT_PROVIDER)
+            candidates: 후보 provider 목록 (preferred 포함)
+        """
+        names = list(dict.fromkeys([preferred] + candidates))
+        probes = [n for n in names if self.get(n).state == CIRCUIT_HALF_OPEN and self.get(n).probe_available()]
+        closed = [n for n in names if self.get(n).state == CIRCUIT_CLOSED]
+
+        reason = None
+        if closed:
+            scores = {n: self.get(n).score() for n in closed}
+            known = [n for n in closed if scores[n] is not None]
+            best = min(known, key=lambda n: scores[n]) if known else closed[0]
+            if preferred not in closed:
+                head = best
+                reason = f"{preferred} circuit {self.get(preferred).state}"
+            elif (
+                best != preferred
+                and scores[preferred] is not None
+                and scores[best] * config.HEALTH_SWITCH_RATIO <= scores[preferred]
+            ):
+                head = best
+                reason = (
+                    f"{best} 점수 {scores[best] * 1000:.0f}ms vs "
+                    f"{preferred} {scores[preferred] * 1000:.0f}ms"
+                )
+            else:
+                head = preferred
+            closed.remove(head)
+            closed.insert(0, head)
+
+        order = probes + [n for n in closed if n not in probes]
+        if probes:
+            reason = f"{probes[0]} half-open 시험 호출"
+        if not order:
+            order = [preferred]
+            reason = "모든 provider circuit open"
+        self._note_route(order[0], reason)
+        return order
+
+    def _note_route(self, name: str, reason: Optional[str]):
+        """라우팅 대상이 바뀌면 이유와 함께 기록 (/debug/provider-health)"""
+        if name == self.current_route:
+            return
+        previous, self.current_route = self.current_route, name
+        if previous is None:
+            return
+        reason = reason or "기본 provider 복귀"
+        self.route_changes.append({
+            "at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "from": previous,
+            "to": name,
+            "reason": reason,
+        })
+        logger.info(f"[health] 라우팅 변경: {previous} → {name} ({reason})")
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: s.stats() for name, s in sorted(self._stats.items())}
+
+
+# 싱글톤 인스턴스
+_health: Optional[ProviderHealth] = None
+
+
+def get_provider_health() -> ProviderHealth:
+    """provider 상태 싱글톤 인스턴스 반환"""
+    global _health
+    if _health is None:
+        _health = ProviderHealth()
+    return _health
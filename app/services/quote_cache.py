@@ -0,0 +1,249 @@
+"""
+시세(quote) 인메모리 캐시
+
+구글 시트는 재계산할 때마다 셀 수만큼 /api/price를 호출한다. 같은 종목을 매번
+증권사 API로 보내면 호출 수가 셀 수 × 재계산 횟수로 늘어나므로, provider 호출
+앞단에서 (provider, code, market) 키로 결과를 TTL 동안 재사용한다.
+
+- TTL(soft): 장중에는 provider별 설정 (config.KIWOOM_CACHE_TTL / TOSS_CACHE_TTL, 기본 CACHE_TTL),
+  장이 닫혀 있으면 다음 개장 시각까지 (app/services/market_calendar.py)
+- 필드별 신선도: 현재가(price)는 위 TTL, 52주 값(high52w/low52w/high52w_date)은 하루에 한 번
+  바뀌므로 다음 거래일 개장까지 유효하다. 요청이 필요한 필드(fields)만 신선하면 적중으로 본다.
+  → 현재가만 필요한 요청은 52주 값이 오래돼도, 52주 값만 필요한 요청은 현재가가 오래돼도 캐시로 응답.
+  현재가만 새로 받은 경우(52주 미포함 조회) 보관 중인 52주 값은 유지하고 현재가로 최고/최저만 넓힌다.
+- max-stale(hard): 현재가 TTL이 지난 뒤에도 config.QUOTE_MAX_STALE 초까지는 마지막 정상 시세를
+  보관한다. stale-while-revalidate / 장애 시 stale 응답에 사용 (provider.fetch_stock_price)
+- 크기 제한: config.CACHE_MAX_ENTRIES 초과 시 가장 오래 사용하지 않은 항목부터 제거(LRU)
+- 적중/미스 카운터: /debug/cache-status 로 확인
+"""
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import config
+from app.services.market_calendar import get_market_calendar
+
+logger = logging.getLogger(__name__)
+
+#: 요청 필드 구분 — 전체 / 현재가만 / 52주 값만
+FIELDS_ALL = "all"
+FIELDS_PRICE = "price"
+FIELDS_52W = "52w"
+QUOTE_FIELDS = (FIELDS_ALL, FIELDS_PRICE, FIELDS_52W)
+
+#: 하루 단위로 바뀌는 52주 필드
+W52_KEYS = ("high52w", "low52w", "high52w_date")
+
+# 항목 인덱스: [stored_at, price_until, w52_until, data]. 시각은 monotonic 기준.
+_STORED_AT, _PRICE_UNTIL, _W52_UNTIL, _DATA = range(4)
+
+
+def has_52w(data: Dict[str, Any]) -> bool:
+    """52주 값이 들어 있는 시세인지 (52주 미포함 조회·산출 실패 시 False)"""
+    return data.get("high52w") is not None or data.get("low52w") is not None
+
+
+class QuoteCache:
+    """(provider, code, market) 키 기반 TTL + LRU 시세 캐시 (현재가/52주 필드별 신선도)"""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttls: Optional[Dict[str, int]] = None,
+        default_ttl: Optional[int] = None,
+        max_stale: Optional[int] = None,
+    ):
+        self.max_entries = max_entries if max_entries is not None else config.CACHE_MAX_ENTRIES
+        self.default_ttl = default_ttl if default_ttl is not None else config.CACHE_TTL
+        self.ttls: Dict[str, int] = ttls if ttls is not None else {
+            "kiwoom": config.KIWOOM_CACHE_TTL,
+            "toss": config.TOSS_CACHE_TTL,
+        }
+        self.max_stale = max_stale if max_stale is not None else config.QUOTE_MAX_STALE
+        # key -> [stored_at, price_until, w52_until, data]
+        # 순서 = 최근 사용 순 (끝이 가장 최근)
+        self._entries: "OrderedDict[Tuple[str, str, str], List[Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+
+    def base_ttl_for(self, provider: str) -> int:
+        """provider별 장중 TTL(초)"""
+        return self.ttls.get(provider, self.default_ttl)
+
+    def ttl_for(self, provider: str) -> int:
+        """지금 저장할 시세의 TTL(초) — 장이 닫혀 있으면 다음 개장까지"""
+        return get_market_calendar().quote_ttl(self.base_ttl_for(provider))
+
+    def w52_ttl(self) -> int:
+        """지금 저장할 52주 값의 TTL(초) — 다음 거래일 개장까지"""
+        return get_market_calendar().next_trading_day_ttl()
+
+    def _lookup(self, key: Tuple[str, str, str]) -> Optional[List[Any]]:
+        """항목 조회 (현재가 max-stale·52주 유효기간이 모두 지난 항목은 제거 후 None)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        now = time.monotonic()
+        if now > entry[_PRICE_UNTIL] + self.max_stale and now > entry[_W52_UNTIL]:
+            del self._entries[key]
+            return None
+        return entry
+
+    @staticmethod
+    def _is_fresh(entry: List[Any], fields: str, now: float) -> bool:
+        """요청 필드 기준 신선도 판정"""
+        price_fresh = now <= entry[_PRICE_UNTIL]
+        w52_fresh = now <= entry[_W52_UNTIL]
+        if fields == FIELDS_PRICE:
+            return price_fresh
+        if fields == FIELDS_52W:
+            return w52_fresh
+        return price_fresh and w52_fresh
+
+    def get(
+        self, provider: str, code: str, market: str, fields: str = FIELDS_ALL
+    ) -> Optional[Dict[str, Any]]:
+        """
+        요청 필드가 신선한 캐시 시세 반환 (없거나 만료 시 None)
+
+        Args:
+            fields: "all"(현재가+52주) | "price" | "52w"
+        """
+        key = (provider, code, market)
+        entry = self._lookup(key)
+        if entry is None or not self._is_fresh(entry, fields, time.monotonic()):
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        logger.debug(f"[quote-cache] 적중: {key} (fields={fields})")
+        # 호출 측 변경이 캐시에 번지지 않도록 복사본 반환
+        return dict(entry[_DATA])
+
+    def get_stale(self, provider: str, code: str, market: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        현재가 TTL이 지났지만 max-stale 이내인 시세 반환
+
+        Returns:
+            (시세 딕셔너리 복사본, 저장 후 경과 초) 또는 None
+        """
+        key = (provider, code, market)
+        entry = self._lookup(key)
+        if entry is None or time.monotonic() > entry[_PRICE_UNTIL] + self.max_stale:
+            return None
+        self._entries.move_to_end(key)
+        self.stale_hits += 1
+        return dict(entry[_DATA]), time.monotonic() - entry[_STORED_AT]
+
+    def set(
+        self, provider: str, code: str, market: str, data: Dict[str, Any], include_52w: bool = True
+    ) -> Dict[str, Any]:
+        """
+        시세 저장 (크기 초과 시 LRU 제거)
+
+        data에 52주 값이 없으면(현재가만 조회) 보관 중인 52주 값과 유효기간을 이어받는다.
+        보관 중인 값도 없는데 52주 값까지 요청한 조회였다면(provider가 52주 값을 주지 않음 —
+        키움 250hgst 공란, 토스 캔들 실패·시간 초과) 52주 유효기간을 현재가 TTL과 같게 둔다.
+        → 52주 값이 없다는 이유만으로 전체 필드 요청이 매번 미스·stale이 되지 않고,
+          현재가가 만료될 때 52주 값도 다시 시도한다.
+
+        Args:
+            include_52w: data가 52주 값까지 요청한 조회 결과인지 (False = 현재가만 조회)
+
+        Returns:
+            저장된 시세 복사본 (이어받은 52주 값 포함)
+        """
+        key = (provider, code, market)
+        now = time.monotonic()
+        stored = dict(data)
+        price_until = now + self.ttl_for(provider)
+        w52_until = 0.0
+
+        if has_52w(data):
+            w52_until = now + self.w52_ttl()
+        else:
+            previous = self._lookup(key)
+            if previous is not None and now <= previous[_W52_UNTIL] and has_52w(previous[_DATA]):
+                w52_until = previous[_W52_UNTIL]
+                for k in W52_KEYS:
+                    stored[k] = previous[_DATA].get(k)
+                _widen_52w(stored)
+            elif include_52w:
+                # 요청했지만 provider가 52주 값을 주지 않음 — 현재가와 함께 만료
+                w52_until = price_until
+
+        self._entries[key] = [now, price_until, w52_until, stored]
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self.evictions += 1
+            logger.debug(f"[quote-cache] LRU 제거: {evicted}")
+        return dict(stored)
+
+    def invalidate(self, provider: Optional[str] = None) -> int:
+        """
+        캐시 무효화
+
+        Args:
+            provider: 지정 시 해당 provider 항목만, 미지정 시 전체
+
+        Returns:
+            제거된 항목 수
+        """
+        if provider is None:
+            count = len(self._entries)
+            self._entries.clear()
+        else:
+            keys = [k for k in self._entries if k[0] == provider]
+            for k in keys:
+                del self._entries[k]
+            count = len(keys)
+        if count:
+            logger.info(f"[quote-cache] 무효화: {provider or '전체'} ({count}건)")
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 상태 (디버깅용)"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": {**self.ttls, "default": self.default_ttl},
+            "ttl_now": {p: self.ttl_for(p) for p in self.ttls},
+            "w52_ttl_now": self.w52_ttl(),
+            "max_stale": self.max_stale,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else None,
+            "stale_hits": self.stale_hits,
+            "evictions": self.evictions,
+        }
+
+
+def _widen_52w(data: Dict[str, Any]):
+    """보관된 52주 최고/최저를 새 현재가로 넓힌다 (장중 신고가/신저가 반영)"""
+    price = data.get("price")
+    if price is None:
+        return
+    if data.get("high52w") is not None and price > data["high52w"]:
+        data["high52w"] = price
+        data["high52w_date"] = get_market_calendar().now().strftime("%Y%m%d")
+    if data.get("low52w") is not None and price < data["low52w"]:
+        data["low52w"] = price
+
+
+# 싱글톤 인스턴스
+_cache: Optional[QuoteCache] = None
+
+
+def get_quote_cache() -> QuoteCache:
+    """시세 캐시 싱글톤 인스턴스 반환"""
+    global _cache
+    if _cache is None:
+        _cache = QuoteCache()
+    return _cache
@@ -0,0 +1,177 @@
+"""
+provider별 요청 속도 제한 (token bucket)
+
+시트 갱신으로 요청이 몰리면 증권사 API의 초당 호출 한도를 넘겨 에러를 받는다.
+(provider, API id) 단위 token bucket으로 호출 속도를 제한하고, 한도를 넘는 호출은
+실패시키지 않고 **순서대로 대기**시킨다.
+
+    (kiwoom, ka10001)  키움 주식기본정보
+    (kiwoom, au10001)  키움 토큰 발급
+    (toss, prices)     토스 현재가
+    (toss, candles)    토스 캔들
+    (toss, token)      토스 토큰 발급
+
+- 기본 속도: 1 / config.MIN_REQUEST_INTERVAL (초당), 버스트: config.RATE_LIMIT_BURST
+- 개별 재정의: config.RATE_LIMITS  예) "kiwoom.ka10001=5/3,toss.prices=10/10" (rate/burst)
+- 대기열 길이·대기 시간 지표: /debug/rate-limits
+- 요청 deadline(app/utils/deadline.py)보다 오래 기다려야 하면 토큰을 쓰지 않고 즉시 DeadlineExceeded
+  → 클라이언트가 포기한 요청이 대기열에서 토큰을 차지해 살아 있는 요청을 굶기지 않는다.
+"""
+import time
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import config
+from app.utils.deadline import DeadlineExceeded, remaining
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """비동기 token bucket (대기 순서 보장: FIFO)"""
+
+    def __init__(self, name: str, rate: float, burst: int):
+        self.name = name
+        self.rate = rate      # 초당 허용 호출 수 (0 이하면 제한 없음)
+        self.burst = max(int(burst), 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # 지표
+        self.waiting = 0          # 현재 대기열 길이
+        self.max_waiting = 0      # 최대 대기열 길이
+        self.acquired = 0         # 통과한 호출 수
+        self.delayed = 0          # 대기가 발생한 호출 수
+        self.total_wait = 0.0     # 누적 대기 시간(초)
+        self.max_wait = 0.0       # 최대 대기 시간(초)
+        self.deadline_rejected = 0  # 요청 deadline 안에 차례가 오지 않아 포기한 호출 수
+
+    def _get_lock(self) -> asyncio.Lock:
+        """현재 루프에 맞는 Lock 반환 (Lock도 루프에 바인딩되므로 지연 생성)"""
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        return self._lock
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """
+        호출 1건 허가 (한도 초과 시 차례가 올 때까지 대기)
+
+        Raises:
+            DeadlineExceeded: 차례·토큰을 기다리는 시간이 요청의 남은 시간보다 김 (토큰은 쓰지 않음)
+        """
+        if self.rate <= 0:
+            self.acquired += 1
+            return
+
+        start = time.monotonic()
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            lock = self._get_lock()
+            left = remaining()
+            if left is None:
+                await lock.acquire()
+            else:
+                try:
+                    # 앞선 대기열도 남은 시간만큼만 기다린다
+                    await asyncio.wait_for(lock.acquire(), max(left, 0))
+                except asyncio.TimeoutError:
+                    self.deadline_rejected += 1
+                    raise DeadlineExceeded(f"요청 제한 시간 초과 (rate-limit 대기: {self.name})")
+            try:
+                self._refill()
+                if self._tokens < 1:
+                    wait = (1 - self._tokens) / self.rate
+                    left = remaining()
+                    if left is not None and wait >= left:
+                        self.deadline_rejected += 1
+                        raise DeadlineExceeded(
+                            f"요청 제한 시간 초과 (rate-limit 대기 {wait:.2f}초 > 남은 {max(left, 0):.2f}초: {self.name})"
+                        )
+                    await asyncio.sleep(wait)
+                    self._refill()
+                self._tokens -= 1
+            finally:
+                lock.release()
+        finally:
+            self.waiting -= 1
+
+        waited = time.monotonic() - start
+        self.acquired += 1
+        if waited > 0.001:
+            self.delayed += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+            logger.debug(f"[rate-limit] {self.name} 대기 {waited * 1000:.0f}ms")
+
+    def stats(self) -> Dict[str, Any]:
+        """지표 (디버깅/한도 산정용)"""
+        return {
+            "rate_per_sec": self.rate,
+            "burst": self.burst,
+            "queue_depth": self.waiting,
+            "max_queue_depth": self.max_waiting,
+            "acquired": self.acquired,
+            "delayed": self.delayed,
+            "avg_wait_ms": round(self.total_wait / self.delayed * 1000, 1) if self.delayed else 0,
+            "max_wait_ms": round(self.max_wait * 1000, 1),
+            "deadline_rejected": self.deadline_rejected,
+        }
+
+
+def _parse_overrides(spec: str) -> Dict[str, Tuple[float, int]]:
+    """"kiwoom.ka10001=5/3,toss.prices=10" → {"kiwoom.ka10001": (5.0, 3), "toss.prices": (10.0, burst 기본)}"""
+    overrides: Dict[str, Tuple[float, int]] = {}
+    for item in (spec or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        try:
+            key, value = item.split("=", 1)
+            rate, _, burst = value.partition("/")
+            overrides[key.strip().lower()] = (
+                float(rate),
+                int(burst) if burst else config.RATE_LIMIT_BURST,
+            )
+        except ValueError:
+            logger.warning(f"[rate-limit] RATE_LIMITS 형식 오류(무시): '{item}'")
+    return overrides
+
+
+_overrides: Optional[Dict[str, Tuple[float, int]]] = None
+_limiters: Dict[str, TokenBucket] = {}
+
+
+def get_rate_limiter(provider: str, api_id: str) -> TokenBucket:
+    """(provider, API id)별 token bucket 반환 (최초 요청 시 설정 기반 생성)"""
+    global _overrides
+    key = f"{provider}.{api_id}".lower()
+    limiter = _limiters.get(key)
+    if limiter is None:
+        if _overrides is None:
+            _overrides = _parse_overrides(config.RATE_LIMITS)
+        # provider 이름 뒤 식별자(예: 키 풀의 "kiwoom#2")는 기본 provider 설정을 따른다
+        base_key = f"{provider.split('#', 1)[0]}.{api_id}".lower()
+        default_rate = 1.0 / config.MIN_REQUEST_INTERVAL if config.MIN_REQUEST_INTERVAL > 0 else 0
+        rate, burst = _overrides.get(key) or _overrides.get(base_key) or (
+            default_rate,
+            config.RATE_LIMIT_BURST,
+        )
+        limiter = TokenBucket(key, rate, burst)
+        _limiters[key] = limiter
+        logger.info(f"[rate-limit] 생성: {key} (rate={rate}/s, burst={burst})")
+    return limiter
+
+
+def rate_limiter_stats() -> Dict[str, Any]:
+    """전체 limiter 지표"""
+    return {key: limiter.stats() for key, limiter in sorted(_limiters.items())}
@@ -0,0 +1,298 @@
+"""
+upstream 호출 재시도 정책 (지수 백오프 + full jitter + 재시도 예산)
+
+연결 실패·타임아웃·429·5xx 같은 일시적 장애는 잠깐 뒤 다시 보내면 대부분 성공한다.
+다만 장애 중인 upstream에 모든 요청이 재시도를 얹으면 호출 수가 몇 배로 불어나
+장애를 키운다(retry storm). 그래서
+
+- 에러 종류별 최대 재시도 횟수: config.RETRY_POLICY  예) "connect=2,timeout=1,429=2,5xx=1,auth=1"
+    connect : 연결 단계 실패(DNS·연결 거부 httpx.ConnectError, 연결 타임아웃, 커넥션 풀 대기 타임아웃)
+    timeout : 요청을 보낸 뒤 실패(읽기/쓰기 타임아웃, 송수신 중 연결 끊김 httpx.ReadError·WriteError 등)
+              — 서버가 이미 처리했을 수 있으므로 멱등이 아닌 호출(idempotent=False, 토큰 발급 POST 등)은 재시도하지 않는다
+    429     : 호출 한도 초과 (Retry-After 헤더가 있으면 그만큼 대기)
+    5xx     : upstream 서버 에러 (503 Retry-After 포함)
+    auth    : 토큰 만료(401 등) — 토큰 재발급 후 즉시 재시도 (백오프·예산 미적용)
+- 대기 시간: full jitter — uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY × 2^n))
+  Retry-After가 RETRY_MAX_DELAY보다 길면 기다리지 않고 바로 실패시킨다 (요청 응답이 늦어지는 것 방지)
+- 재시도 예산(전역): 최근 RETRY_BUDGET_WINDOW 초 동안 재시도 수 ≤
+  max(RETRY_BUDGET_MIN, 요청 수 × RETRY_BUDGET_RATIO). 예산이 바닥나면 재시도 없이 실패
+- 요청 deadline(app/utils/deadline.py): 시도 전 확인하고, 남은 시간보다 오래 기다려야 하면 재시도하지 않는다.
+  남은 시간으로 줄인 timeout에 걸린 실패는 DeadlineExceeded로 올린다 (upstream 장애로 세지 않음)
+- 지표: /debug/retries
+"""
+import time
+import random
+import asyncio
+import logging
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+import httpx
+
+from app.core.config import config
+from app.utils.deadline import DeadlineExceeded, check_deadline, expired, remaining
+
+logger = logging.getLogger(__name__)
+
+#: 재시도 대상 에러 종류
+ERROR_CONNECT = "connect"
+ERROR_TIMEOUT = "timeout"
+ERROR_RATE_LIMIT = "429"
+ERROR_SERVER = "5xx"
+ERROR_AUTH = "auth"
+ERROR_CLASSES = (ERROR_CONNECT, ERROR_TIMEOUT, ERROR_RATE_LIMIT, ERROR_SERVER, ERROR_AUTH)
+
+
+def classify_exception(error: BaseException) -> Optional[str]:
+    """httpx 예외 → 에러 종류 (재시도 대상이 아니면 None)"""
+    if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+        # 연결 단계 실패는 요청이 서버에 닿지 않았으므로 재전송이 안전하다
+        return ERROR_CONNECT
+    if isinstance(error, (httpx.TimeoutException, httpx.NetworkError)):
+        # 보낸 뒤 실패 — 서버가 요청을 처리했는지 알 수 없다
+        return ERROR_TIMEOUT
+    return None
+
+
+def classify_response(response: httpx.Response) -> Optional[str]:
+    """HTTP 응답 → 에러 종류 (429/5xx, 그 외 None)"""
+    if response.status_code == 429:
+        return ERROR_RATE_LIMIT
+    if response.status_code >= 500:
+        return ERROR_SERVER
+    return None
+
+
+def retry_after(response: httpx.Response) -> Optional[float]:
+    """Retry-After 헤더(초 또는 HTTP 날짜) → 대기 초, 없거나 형식 오류면 None"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def _parse_policy(spec: str) -> Dict[str, int]:
+    """"connect=2,429=1" → {"connect": 2, "429": 1} (지정하지 않은 종류는 0 = 재시도 안 함)"""
+    policy = {name: 0 for name in ERROR_CLASSES}
+    for item in (spec or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        try:
+            key, value = item.split("=", 1)
+            key = key.strip().lower()
+            if key not in policy:
+                raise ValueError(key)
+            policy[key] = max(int(value), 0)
+        except ValueError:
+            logger.warning(f"[retry] RETRY_POLICY 형식 오류(무시): '{item}'")
+    return policy
+
+
+class RetryBudget:
+    """최근 window 초 동안 재시도 수를 요청 수의 일정 비율로 제한 (전역)"""
+
+    def __init__(self, ratio: float, window: float, minimum: int):
+        self.ratio = ratio
+        self.window = window
+        self.minimum = minimum
+        self._requests: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+        self.exhausted = 0  # 예산 부족으로 재시도하지 않은 횟수
+
+    def _trim(self, now: float):
+        for events in (self._requests, self._retries):
+            while events and now - events[0] > self.window:
+                events.popleft()
+
+    def limit(self) -> float:
+        """현재 창에서 허용되는 재시도 수"""
+        return max(self.minimum, len(self._requests) * self.ratio)
+
+    def record_request(self):
+        now = time.monotonic()
+        self._trim(now)
+        self._requests.append(now)
+
+    def try_spend(self) -> bool:
+        """재시도 1회 허용 여부 (허용 시 기록)"""
+        now = time.monotonic()
+        self._trim(now)
+        if len(self._retries) + 1 > self.limit():
+            self.exhausted += 1
+            return False
+        self._retries.append(now)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        self._trim(time.monotonic())
+        return {
+            "ratio": self.ratio,
+            "window": self.window,
+            "min": self.minimum,
+            "requests": len(self._requests),
+            "retries": len(self._retries),
+            "limit": round(self.limit(), 1),
+            "exhausted": self.exhausted,
+        }
+
+
+class RetryPolicy:
+    """에러 종류별 재시도 횟수 + 백오프 + 전역 예산"""
+
+    def __init__(
+        self,
+        policy: Optional[Dict[str, int]] = None,
+        base_delay: Optional[float] = None,
+        max_delay: Optional[float] = None,
+        budget: Optional[RetryBudget] = None,
+    ):
+        self.policy = policy if policy is not None else _parse_policy(config.RETRY_POLICY)
+        self.base_delay = base_delay if base_delay is not None else config.RETRY_BASE_DELAY
+        self.max_delay = max_delay if max_delay is not None else config.RETRY_MAX_DELAY
+        self.budget = budget or RetryBudget(
+            config.RETRY_BUDGET_RATIO, config.RETRY_BUDGET_WINDOW, config.RETRY_BUDGET_MIN
+        )
+        # 호출 이름(예: "kiwoom.ka10001")별 지표
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def _stat(self, name: str) -> Dict[str, Any]:
+        stat = self._stats.get(name)
+        if stat is None:
+            stat = {"requests": 0, "retries": {}, "gave_up": 0, "budget_denied": 0, "deadline_skipped": 0}
+            self._stats[name] = stat
+        return stat
+
+    def backoff(self, attempt: int) -> float:
+        """attempt번째(0부터) 재시도 전 대기 시간 (full jitter)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    async def send(
+        self,
+        name: str,
+        send: Callable[[], Awaitable[httpx.Response]],
+        is_auth_failure: Optional[Callable[[httpx.Response], bool]] = None,
+        refresh_auth: Optional[Callable[[], Awaitable[Any]]] = None,
+        idempotent: bool = True,
+    ) -> httpx.Response:
+        """
+        send()를 정책에 따라 재시도하며 호출
+
+        마지막 시도의 응답(상태 코드와 무관)을 반환하거나 마지막 httpx 예외를 그대로 올린다.
+        → 호출 측의 기존 상태 코드/예외 처리를 그대로 쓸 수 있다.
+
+        Args:
+            name: 지표용 호출 이름 (예: "kiwoom.ka10001")
+            send: 요청 1회를 보내는 코루틴 함수 (rate limiter 대기·최신 토큰 헤더 포함)
+            is_auth_failure: 응답이 토큰 만료인지 판정 (예: 401). refresh_auth와 함께 지정
+            refresh_auth: 토큰 재발급 코루틴 함수 (auth 재시도 전에 호출)
+            idempotent: False면 보낸 뒤 실패(timeout 종류)는 재시도하지 않는다 (두 번 처리되면 안 되는 POST)
+
+        Raises:
+            DeadlineExceeded: 요청 deadline 소진 (시도 전, 또는 줄어든 timeout으로 시간 초과)
+        """
+        stat = self._stat(name)
+        stat["requests"] += 1
+        self.budget.record_request()
+        used: Dict[str, int] = {}
+
+        while True:
+            check_deadline(name)
+            failure: Optional[httpx.HTTPError] = None
+            response: Optional[httpx.Response] = None
+            try:
+                response = await send()
+            except httpx.HTTPError as e:
+                if isinstance(e, httpx.TimeoutException) and expired():
+                    # 남은 시간으로 줄인 timeout에 걸린 것 — upstream 장애가 아니라 요청 deadline 소진
+                    raise DeadlineExceeded(f"요청 제한 시간 초과 ({name})") from e
+                error_class = classify_exception(e)
+                if error_class is None or (error_class == ERROR_TIMEOUT and not idempotent):
+                    raise
+                failure = e
+                reason = f"{type(e).__name__}: {e}"
+            else:
+                if refresh_auth is not None and is_auth_failure is not None and is_auth_failure(response):
+                    error_class = ERROR_AUTH
+                else:
+                    error_class = classify_response(response)
+                if error_class is None:
+                    return response
+                reason = f"HTTP {response.status_code}"
+
+            wait = 0.0
+            if error_class != ERROR_AUTH:
+                hinted = retry_after(response) if response is not None else None
+                if hinted is not None and hinted > self.max_delay:
+                    logger.warning(f"[retry] {name} Retry-After {hinted:.0f}초 > 최대 대기 → 재시도 안 함")
+                    stat["gave_up"] += 1
+                    return self._give_up(failure, response)
+                wait = hinted if hinted is not None else self.backoff(used.get(error_class, 0))
+
+            left = remaining()
+            if left is not None and wait >= left:
+                # 기다리는 사이 deadline이 지나므로 재시도해도 소용없다
+                stat["deadline_skipped"] += 1
+                return self._give_up(failure, response)
+            if not self._allow(name, error_class, used, stat):
+                return self._give_up(failure, response)
+
+            if error_class == ERROR_AUTH:
+                logger.warning(f"[retry] {name} 인증 만료({reason}) → 토큰 재발급 후 재시도")
+                await refresh_auth()
+                continue
+
+            logger.warning(f"[retry] {name} {reason} → {wait * 1000:.0f}ms 후 재시도 ({error_class} #{used[error_class]})")
+            await asyncio.sleep(wait)
+
+    @staticmethod
+    def _give_up(failure: Optional[httpx.HTTPError], response: Optional[httpx.Response]) -> httpx.Response:
+        """재시도 중단 — 마지막 예외를 올리거나 마지막 응답을 반환"""
+        if failure is not None:
+            raise failure
+        return response
+
+    def _allow(self, name: str, error_class: str, used: Dict[str, int], stat: Dict[str, Any]) -> bool:
+        """error_class로 한 번 더 재시도해도 되는지 (허용 시 사용 횟수·예산 차감)"""
+        if used.get(error_class, 0) >= self.policy.get(error_class, 0):
+            if self.policy.get(error_class, 0):
+                stat["gave_up"] += 1
+            return False
+        # 토큰 재발급 재시도는 장애 증폭과 무관하므로 예산에서 제외
+        if error_class != ERROR_AUTH and not self.budget.try_spend():
+            stat["budget_denied"] += 1
+            logger.warning(f"[retry] {name} 재시도 예산 소진 → 재시도 없이 실패 ({error_class})")
+            return False
+        used[error_class] = used.get(error_class, 0) + 1
+        stat["retries"][error_class] = stat["retries"].get(error_class, 0) + 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """정책·예산·호출별 재시도 지표 (디버깅용)"""
+        return {
+            "policy": self.policy,
+            "base_delay": self.base_delay,
+            "max_delay": self.max_delay,
+            "budget": self.budget.stats(),
+            "calls": {name: dict(s, retries=dict(s["retries"])) for name, s in sorted(self._stats.items())},
+        }
+
+
+# 싱글톤 인스턴스
+_policy: Optional[RetryPolicy] = None
+
+
+def get_retry_policy() -> RetryPolicy:
+    """재시도 정책 싱글톤 인스턴스 반환"""
+    global _policy
+    if _policy is None:
+        _policy = RetryPolicy()
+    return _policy
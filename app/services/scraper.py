@@ -6,8 +6,8 @@
 (`config/scrape_targets.yaml`)에 외부화되어 있다. → URL·XPath 하드코딩 없음.
 
 구성:
-    ScrapeConfig  : 설정 파일 로드/파싱 (mtime 감지 → 파일 수정 시 자동 재로드)
-    Scraper       : HTML 조회(+TTL 캐시) → XPath 추출 → 숫자 정규화
+    ScrapeConfig  : 설정 파일 로드/파싱 (mtime 감지 → 파일 수정 시 자동 재로드, XPath는 로드 시 컴파일)
+    Scraper       : HTML 조회(+TTL 캐시) → 파싱(조회 1회당 1번) → XPath 추출 → 숫자 정규화
 
 조회 방식은 대상별 `render` 설정으로 선택한다 (기본 `auto`):
     never  : 정적 HTTP GET만 사용 (가장 가벼움)
@@ -19,16 +19,23 @@
 import os
 import time
 import httpx
+import asyncio
 import logging
 import threading
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import yaml
+from lxml import etree
 from lxml import html as lxml_html
 
 from app.core.config import config
 from app.services.base import normalize_price
+from app.services.html_cache import HtmlCache
+from app.services.http_client import get_http_client
 from app.services.renderer import get_renderer, RenderError
+from app.services.retry import get_retry_policy
+from app.utils.deadline import DeadlineExceeded, check_deadline
+from app.utils.singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
@@ -68,6 +75,10 @@ class ScrapeConfig:
     def __init__(self, path: Optional[str] = None):
         self.path = path or config.SCRAPE_CONFIG_PATH
         self._data: Dict[str, Any] = {}
+        # (group, target) -> 컴파일된 XPath (로드할 때마다 새로 만든다)
+        self._xpaths: Dict[tuple, etree.XPath] = {}
+        # (group, target) -> XPath 컴파일 에러 (해당 대상만 조회 시 실패)
+        self._xpath_errors: Dict[tuple, str] = {}
         self._loaded_mtime: Optional[float] = None
         self._lock = threading.Lock()
 
@@ -92,9 +103,37 @@ class ScrapeConfig:
                     f"스크래핑 설정에 'groups' 항목이 없습니다: {self.path}"
                 )
 
+            self._xpaths, self._xpath_errors = self._compile_xpaths(data)
             self._data = data
             self._loaded_mtime = mtime
-            logger.info(f"스크래핑 설정 로드: {self.path}")
+            logger.info(f"스크래핑 설정 로드: {self.path} (XPath {len(self._xpaths)}개 컴파일)")
+
+    def _compile_xpaths(self, data: Dict[str, Any]) -> Tuple[Dict[tuple, etree.XPath], Dict[tuple, str]]:
+        """
+        모든 대상의 XPath 컴파일 (요청마다 문자열을 다시 컴파일하지 않도록)
+
+        잘못된 XPath는 로드 시점에 로그로 알리고, 해당 대상만 조회 시 ScrapeConfigError가 된다.
+        (다른 대상·그룹은 그대로 동작)
+
+        Returns:
+            ((group, target) → 컴파일된 XPath, (group, target) → 컴파일 에러 메시지)
+        """
+        defaults = data.get("defaults") or {}
+        compiled: Dict[tuple, etree.XPath] = {}
+        errors: Dict[tuple, str] = {}
+        for group, entries in (data.get("groups") or {}).items():
+            for target, entry in (entries or {}).items():
+                xpath = (entry or {}).get("xpath") or defaults.get("xpath")
+                if not xpath:
+                    continue  # 누락은 get_target()에서 대상별로 알린다
+                try:
+                    compiled[(group, target)] = etree.XPath(xpath)
+                except etree.XPathError as e:
+                    errors[(group, target)] = (
+                        f"'{group}.{target}'의 xpath가 올바르지 않습니다: '{xpath}' ({e}) ({self.path})"
+                    )
+                    logger.error(f"[scrape] 설정 로드: {errors[(group, target)]}")
+        return compiled, errors
 
     @property
     def defaults(self) -> Dict[str, Any]:
@@ -117,7 +156,7 @@ class ScrapeConfig:
         대상 설정 조회 (defaults 병합)
 
         Raises:
-            ScrapeConfigError: 그룹/대상 미정의, 필수 항목 누락
+            ScrapeConfigError: 그룹/대상 미정의, 필수 항목 누락, 잘못된 XPath(로드 시 컴파일 실패)
         """
         self._load_if_needed()
         groups = self._data.get("groups") or {}
@@ -143,8 +182,13 @@ class ScrapeConfig:
                     f"'{group}.{target}' 설정에 '{required}'가 없습니다 ({self.path})"
                 )
 
+        error = self._xpath_errors.get((group, target))
+        if error:
+            raise ScrapeConfigError(error)
+
         merged["group"] = group
         merged["target"] = target
+        merged["compiled_xpath"] = self._xpaths[(group, target)]
         return merged
 
 
@@ -152,22 +196,30 @@ class ScrapeConfig:
 # 스크래퍼
 # ---------------------------------------------------------------------------
 class Scraper:
-    """설정 기반 범용 스크래퍼 (HTML TTL 캐시 포함)"""
+    """설정 기반 범용 스크래퍼 (크기 제한 HTML TTL 캐시 포함)"""
 
     def __init__(self, scrape_config: Optional[ScrapeConfig] = None):
         self.config = scrape_config or ScrapeConfig()
-        # (url, rendered) -> (fetched_at, html_text)
+        # (url, rendered) -> HTML (+파싱된 문서). 항목 수·바이트 제한 LRU (app/services/html_cache.py)
         # 정적 HTML과 렌더링 HTML은 내용이 다르므로 캐시 키를 분리한다.
-        self._html_cache: Dict[tuple, tuple] = {}
+        # 같은 URL의 여러 대상·TTL 내 반복 요청이 같은 HTML을 매번 다시 파싱하지 않도록
+        # 파싱 문서도 캐시 항목에 함께 둔다. 새로 조회하면 항목이 바뀌어 다시 파싱.
+        self._html_cache = HtmlCache()
+        self._parse_count = 0
+        self._tree_hits = 0
+        # 캐시 미스가 동시에 몰리면 (url, rendered)별로 조회·렌더링 1회만 실행하고 결과를 공유
+        self._flight = SingleFlight("scrape")
 
     def _get_cached_html(self, key: tuple, ttl: int) -> Optional[str]:
-        entry = self._html_cache.get(key)
-        if not entry:
-            return None
-        fetched_at, text = entry
-        if time.time() - fetched_at > ttl:
-            return None
-        logger.debug(f"[scrape] HTML 캐시 사용: {key}")
+        return self._html_cache.get(key, ttl)
+
+    def _stale_html_or_raise(self, key: tuple, error: DeadlineExceeded) -> str:
+        """요청 deadline 소진 시 TTL이 지난 HTML이라도 있으면 반환 (없으면 DeadlineExceeded 그대로)"""
+        stale = self._html_cache.get_stale(key)
+        if stale is None:
+            raise error
+        text, age = stale
+        logger.warning(f"[scrape] 요청 제한 시간 초과 → 지난 HTML 사용({age:.0f}초 전): {key}")
         return text
 
     def invalidate_cache(self, url: Optional[str] = None) -> int:
@@ -180,18 +232,19 @@ class Scraper:
         Returns:
             제거된 캐시 항목 수
         """
-        if url is None:
-            count = len(self._html_cache)
-            self._html_cache.clear()
-        else:
-            keys = [k for k in self._html_cache if k[0] == url]
-            for k in keys:
-                del self._html_cache[k]
-            count = len(keys)
+        count = self._html_cache.invalidate(url)
         if count:
             logger.info(f"[scrape] 캐시 무효화: {url or '전체'} ({count}건)")
         return count
 
+    def stats(self) -> Dict[str, Any]:
+        """HTML 캐시·파싱·single-flight 지표 (디버그용)"""
+        return {
+            "html_cache": self._html_cache.stats(),
+            "parse": self.parse_stats(),
+            "single_flight": self._flight.stats(),
+        }
+
     async def fetch_html(
         self,
         url: str,
@@ -200,17 +253,40 @@ class Scraper:
         cache_ttl: int,
         force_refresh: bool = False,
     ) -> str:
-        """정적 HTTP GET으로 HTML 조회 (TTL 캐시 → 동일 URL 중복 요청 방지)"""
+        """
+        정적 HTTP GET으로 HTML 조회 (TTL 캐시 + single-flight → 동일 URL 중복 요청 방지)
+
+        조회는 요청 deadline과 무관하게 설정 timeout으로 진행하고(먼저 온 요청에 묶이지 않음),
+        각 호출자는 자기 남은 시간만큼만 기다린다. 소진 시 지난 HTML 또는 DeadlineExceeded.
+        """
         key = (url, False)
         if not force_refresh:
             cached = self._get_cached_html(key, cache_ttl)
             if cached is not None:
                 return cached
+        try:
+            check_deadline("scrape")
+            return await self._flight.do(
+                key, lambda: self._fetch_uncached(key, url, timeout, user_agent, cache_ttl), detached=True
+            )
+        except DeadlineExceeded as e:
+            return self._stale_html_or_raise(key, e)
 
+    async def _fetch_uncached(
+        self, key: tuple, url: str, timeout: float, user_agent: str, cache_ttl: int
+    ) -> str:
+        """정적 HTTP GET 실행 후 캐시에 저장 (fetch_html의 single-flight 본체, 요청 deadline 없이 실행)"""
         headers = {"User-Agent": user_agent} if user_agent else {}
+        client = get_http_client("scrape")
+
+        async def _send() -> httpx.Response:
+            return await client.get(
+                url, headers=headers, timeout=timeout, follow_redirects=True
+            )
+
         try:
-            async with httpx.AsyncClient(follow_redirects=True) as client:
-                response = await client.get(url, headers=headers, timeout=timeout)
+            # 연결 실패·타임아웃·429·5xx는 재시도 정책에 따라 백오프 후 재시도
+            response = await get_retry_policy().send("scrape", _send)
         except httpx.HTTPError as e:
             raise ScrapeFetchError(f"페이지 요청 실패({url}): {e}")
 
@@ -218,7 +294,7 @@ class Scraper:
             raise ScrapeFetchError(f"페이지 응답 오류({url}): HTTP {response.status_code}")
 
         text = response.text
-        self._html_cache[key] = (time.time(), text)
+        self._html_cache.set(key, text, cache_ttl)
         return text
 
     async def render_html(
@@ -231,13 +307,38 @@ class Scraper:
         wait_for: Optional[str],
         force_refresh: bool = False,
     ) -> str:
-        """headless 브라우저로 렌더링하여 HTML 조회 (TTL 캐시 적용)"""
+        """
+        headless 브라우저로 렌더링하여 HTML 조회 (TTL 캐시 + single-flight — 렌더링은 수 초가 걸린다)
+
+        렌더링은 요청 deadline과 무관하게 설정 timeout으로 진행하고, 각 호출자는 자기 남은 시간만큼만
+        기다린다 (fetch_html과 동일). 먼저 떠난 요청이 있어도 렌더링 결과는 캐시에 남는다.
+        """
         key = (url, True)
         if not force_refresh:
             cached = self._get_cached_html(key, cache_ttl)
             if cached is not None:
                 return cached
+        try:
+            check_deadline("render")
+            return await self._flight.do(
+                key,
+                lambda: self._render_uncached(key, url, timeout, user_agent, cache_ttl, wait_ms, wait_for),
+                detached=True,
+            )
+        except DeadlineExceeded as e:
+            return self._stale_html_or_raise(key, e)
 
+    async def _render_uncached(
+        self,
+        key: tuple,
+        url: str,
+        timeout: float,
+        user_agent: str,
+        cache_ttl: int,
+        wait_ms: int,
+        wait_for: Optional[str],
+    ) -> str:
+        """headless 렌더링 실행 후 캐시에 저장 (render_html의 single-flight 본체, 요청 deadline 없이 실행)"""
         try:
             text = await get_renderer().render(
                 url=url,
@@ -251,20 +352,58 @@ class Scraper:
         except RenderError as e:
             raise ScrapeFetchError(str(e))
 
-        self._html_cache[key] = (time.time(), text)
+        self._html_cache.set(key, text, cache_ttl)
         return text
 
     @staticmethod
-    def extract(html_text: str, xpath: str) -> str:
+    def parse(html_text: str) -> etree._Element:
+        """
+        HTML 파싱
+
+        Raises:
+            ScrapeExtractError: 파싱 실패 (빈 문서 등)
+        """
+        try:
+            return lxml_html.fromstring(html_text)
+        except Exception as e:
+            raise ScrapeExtractError(f"HTML 파싱 실패: {e}")
+
+    def document(self, key: tuple, html_text: str) -> etree._Element:
+        """
+        캐시 키의 HTML을 파싱한 문서 (같은 조회 결과는 한 번만 파싱)
+
+        Args:
+            key: (url, rendered)
+            html_text: fetch_html()/render_html()이 돌려준 HTML
+        """
+        tree = self._html_cache.tree(key, html_text)
+        if tree is not None:
+            self._tree_hits += 1
+            return tree
+        tree = self.parse(html_text)
+        self._parse_count += 1
+        self._html_cache.set_tree(key, html_text, tree)
+        return tree
+
+    def parse_stats(self) -> Dict[str, int]:
+        """파싱 횟수·파싱 결과 재사용 횟수 (디버그용)"""
+        return {"parses": self._parse_count, "tree_hits": self._tree_hits}
+
+    @staticmethod
+    def extract(document: Union[str, etree._Element], xpath: Union[str, etree.XPath]) -> str:
         """
         XPath로 텍스트 추출
 
+        Args:
+            document: 파싱된 문서(document() 결과) 또는 HTML 문자열
+            xpath: 컴파일된 XPath(설정의 compiled_xpath) 또는 XPath 문자열
+
         Raises:
             ScrapeExtractError: 매칭 실패(페이지 구조 변경 의심) 또는 빈 값
         """
+        tree = Scraper.parse(document) if isinstance(document, str) else document
         try:
-            tree = lxml_html.fromstring(html_text)
-            nodes = tree.xpath(xpath)
+            nodes = xpath(tree) if isinstance(xpath, etree.XPath) else tree.xpath(xpath)
         except Exception as e:
             raise ScrapeExtractError(f"XPath 처리 실패: {e}")
 
@@ -292,7 +431,7 @@ class Scraper:
             cache_ttl=int(conf.get("cache_ttl", 60)),
             force_refresh=force_refresh,
         )
-        return self.extract(html_text, conf["xpath"])
+        return self.extract(self.document((conf["url"], False), html_text), conf["compiled_xpath"])
 
     async def _try_render(self, conf: Dict[str, Any], force_refresh: bool) -> str:
         """렌더링 경로로 값 추출"""
@@ -306,7 +445,7 @@ class Scraper:
             wait_for=conf.get("wait_for"),
             force_refresh=force_refresh,
         )
-        return self.extract(html_text, conf["xpath"])
+        return self.extract(self.document((conf["url"], True), html_text), conf["compiled_xpath"])
 
     async def scrape(
         self, group: str, target: str, force_refresh: bool = False
@@ -353,6 +492,8 @@ class Scraper:
                 raw = await self._try_static(conf, force_refresh)
                 method = "static"
             except ScrapeError as static_err:
+                # 남은 시간이 없으면 렌더링(수 초~수십 초)을 시작하지 않는다
+                check_deadline(f"{group}.{target} 렌더링 폴백")
                 logger.info(
                     f"[scrape] {group}.{target} 정적 실패 → 렌더링 폴백 시도 ({static_err})"
                 )
@@ -389,11 +530,67 @@ class Scraper:
     async def scrape_group(
         self, group: str, force_refresh: bool = False
     ) -> List[Dict[str, Any]]:
-        """그룹 내 모든 대상 스크래핑 (HTML 캐시 덕분에 동일 URL은 1회만 요청)"""
-        results = []
-        for target in self.config.targets(group):
-            results.append(await self.scrape(group, target, force_refresh=force_refresh))
-        return results
+        """
+        그룹 내 모든 대상 스크래핑
+
+        URL별로 묶어 서로 다른 URL은 config.SCRAPE_GROUP_CONCURRENCY 개까지 동시에 조회하고,
+        같은 URL의 대상들은 한 묶음 안에서 차례로 처리해 조회·파싱 1회를 공유한다.
+        (force_refresh면 URL마다 캐시를 한 번 비운 뒤 조회 → 새로 조회한 HTML을 함께 사용)
+
+        Returns:
+            설정 순서의 결과 목록. 실패한 대상은 scrape() 결과 대신
+            {"group", "target", "label", "url", "error"} 항목으로 들어간다 (나머지는 정상 응답).
+
+        Raises:
+            ScrapeError / DeadlineExceeded: 모든 대상이 실패 (첫 대상의 에러)
+        """
+        targets = self.config.targets(group)
+        by_url: Dict[str, List[str]] = {}
+        for target in targets:
+            try:
+                url = self.config.get_target(group, target)["url"]
+            except ScrapeConfigError:
+                url = ""  # 설정 오류 대상은 단독 처리 → scrape()가 항목 에러로 보고
+            by_url.setdefault(url, []).append(target)
+
+        semaphore = asyncio.Semaphore(max(config.SCRAPE_GROUP_CONCURRENCY, 1))
+        results: Dict[str, Any] = {}
+
+        async def _run_url(url: str, url_targets: List[str]):
+            async with semaphore:
+                if force_refresh and url:
+                    self.invalidate_cache(url)
+                for target in url_targets:
+                    try:
+                        results[target] = await self.scrape(group, target)
+                    except (ScrapeError, DeadlineExceeded) as e:
+                        logger.warning(f"[scrape] {group}.{target} 실패 (그룹 조회 계속): {e}")
+                        results[target] = e
+
+        await asyncio.gather(*(_run_url(url, url_targets) for url, url_targets in by_url.items()))
+
+        errors = [results[t] for t in targets if isinstance(results[t], BaseException)]
+        if targets and len(errors) == len(targets):
+            raise errors[0]
+        return [
+            self._error_item(group, target, results[target])
+            if isinstance(results[target], BaseException) else results[target]
+            for target in targets
+        ]
+
+    def _error_item(self, group: str, target: str, error: BaseException) -> Dict[str, Any]:
+        """그룹 조회에서 실패한 대상의 결과 항목"""
+        try:
+            conf = self.config.get_target(group, target)
+        except ScrapeConfigError:
+            conf = {}
+        return {
+            "group": group,
+            "target": target,
+            "label": conf.get("label", ""),
+            "url": conf.get("url", ""),
+            "error": str(error) or error.__class__.__name__,
+        }
 
 
 # 싱글톤 인스턴스
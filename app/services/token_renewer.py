@@ -0,0 +1,140 @@
+"""
+토큰 선제 갱신 (백그라운드)
+
+토큰이 만료된 뒤 첫 요청은 /oauth2/token 왕복 + 파일 저장을 기다려야 한다.
+만료 config.TOKEN_RENEW_MARGIN 초 전에 백그라운드에서 미리 갱신해
+시세 조회 경로가 토큰 발급에 막히지 않게 한다.
+
+- 대상: 자격 증명이 설정된 provider (키움은 필수, 토스는 설정된 경우만)
+- main.lifespan에서 start(), shutdown 시 stop()
+- 기동 직후 토큰이 없으면 먼저 확보(파일 → 신규 발급)한다.
+- 다음 갱신 예정 시각은 /debug/token-status 의 "renewal"로 확인
+"""
+import time
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+from app.core.config import config
+from app.services.kiwoom import get_kiwoom_client
+from app.services.toss import get_toss_client
+
+logger = logging.getLogger(__name__)
+
+
+def configured_token_clients() -> Dict[str, Any]:
+    """자격 증명이 설정된 토큰 관리 대상 클라이언트 (이름 → 클라이언트)"""
+    clients: Dict[str, Any] = {}
+    if config.kiwoom_credentials():
+        # 키 풀이면 키마다 따로 갱신 ("kiwoom#1", "kiwoom#2", ...)
+        for member in get_kiwoom_client().members:
+            clients[member.key_id] = member
+    if config.TOSS_API_CLIENT_ID and config.TOSS_API_SECRET:
+        clients["toss"] = get_toss_client()
+    return clients
+
+
+class TokenRenewer:
+    """provider별 토큰 선제 갱신 작업 관리"""
+
+    def __init__(self):
+        self._clients: Dict[str, Any] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._last_renewed_at: Dict[str, str] = {}
+        self._last_error: Dict[str, str] = {}
+
+    def start(self, clients: Optional[Dict[str, Any]] = None):
+        """갱신 작업 시작 (이미 실행 중인 provider는 건너뜀)"""
+        if not config.TOKEN_RENEW_ENABLED:
+            logger.info("[token-renew] 비활성화됨 (TOKEN_RENEW_ENABLED=false)")
+            return
+
+        self._clients = clients if clients is not None else configured_token_clients()
+        for name, client in self._clients.items():
+            task = self._tasks.get(name)
+            if task is not None and not task.done():
+                continue
+            self._tasks[name] = asyncio.ensure_future(self._run(name, client))
+            logger.info(f"[token-renew] 시작: {name} (만료 {config.TOKEN_RENEW_MARGIN}초 전 갱신)")
+
+    async def stop(self):
+        """갱신 작업 중지 (앱 shutdown 시 호출)"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._tasks.clear()
+
+    async def _run(self, name: str, client: Any):
+        """토큰 만료 margin 전까지 대기 → 갱신, 실패 시 재시도 간격 후 다시 시도"""
+        while True:
+            try:
+                remaining = client.token_expires_in()
+                if remaining is None:
+                    # 기동 직후 등 토큰이 없으면 먼저 확보 (파일 → 신규 발급)
+                    await client.get_token()
+                    if client.token_expires_in() is None:
+                        # 만료 시각을 알 수 없는 토큰 — 재확인 주기만큼 쉬었다가 다시 본다
+                        await asyncio.sleep(config.TOKEN_RENEW_CHECK_INTERVAL)
+                    continue
+
+                wait = remaining - config.TOKEN_RENEW_MARGIN
+                if wait > 0:
+                    # 토큰이 외부에서 바뀔 수 있으므로(강제 만료 등) 너무 오래 자지 않고 주기적으로 재확인
+                    await asyncio.sleep(min(wait, config.TOKEN_RENEW_CHECK_INTERVAL))
+                    continue
+
+                await client.renew_token()
+                self._last_renewed_at[name] = time.strftime("%Y-%m-%d %H:%M:%S")
+                self._last_error.pop(name, None)
+                logger.info(f"[token-renew] 갱신 완료: {name}")
+
+                # 새 토큰 수명이 margin보다 짧으면 즉시 재갱신이 반복되지 않도록 쉬어 간다
+                remaining = client.token_expires_in()
+                if remaining is None or remaining <= config.TOKEN_RENEW_MARGIN:
+                    await asyncio.sleep(config.TOKEN_RENEW_RETRY_INTERVAL)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._last_error[name] = str(e)
+                logger.warning(
+                    f"[token-renew] 갱신 실패: {name} ({e}) → "
+                    f"{config.TOKEN_RENEW_RETRY_INTERVAL}초 후 재시도"
+                )
+                await asyncio.sleep(config.TOKEN_RENEW_RETRY_INTERVAL)
+
+    def status(self) -> Dict[str, Any]:
+        """provider별 갱신 상태 (디버깅용)"""
+        result: Dict[str, Any] = {}
+        for name, client in self._clients.items():
+            remaining = client.token_expires_in()
+            next_at = None
+            if remaining is not None:
+                due = time.time() + max(remaining - config.TOKEN_RENEW_MARGIN, 0)
+                next_at = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(due))
+            task = self._tasks.get(name)
+            result[name] = {
+                "running": task is not None and not task.done(),
+                "margin_seconds": config.TOKEN_RENEW_MARGIN,
+                "next_renewal_at": next_at,
+                "last_renewed_at": self._last_renewed_at.get(name),
+                "last_error": self._last_error.get(name),
+            }
+        return result
+
+
+# 싱글톤 인스턴스
+_renewer: Optional[TokenRenewer] = None
+
+
+def get_token_renewer() -> TokenRenewer:
+    """토큰 갱신 관리자 싱글톤 인스턴스 반환"""
+    global _renewer
+    if _renewer is None:
+        _renewer = TokenRenewer()
+    return _renewer
@@ -0,0 +1,181 @@
+"""
+토큰 파일 저장소
+
+provider 토큰을 `KEY = value` 형식 파일(기존 KIWOOM_TOKEN_ENV / TOSS_TOKEN_ENV와 호환)에
+보관한다. 이전에는 load_dotenv(override=True)로 읽어 이벤트 루프에서 동기 파일 I/O를 하고
+프로세스 전역 os.environ을 매번 덮어썼다. 이 모듈은:
+
+- 파일을 직접 파싱해 메모리에만 보관한다 (os.environ 미변경)
+- 파일의 (mtime, size, inode)를 기억해 **바뀐 경우에만** 다시 읽는다
+- 쓰기는 임시 파일 + rename(os.replace)으로 원자적으로 수행한다
+  → 같은 /data 볼륨을 공유하는 여러 uvicorn 워커가 쓰는 중인 파일을 읽지 않는다
+- async 메서드(load/save)는 파일 I/O를 스레드로 넘겨 이벤트 루프를 막지 않는다
+- issue_lock(): `<토큰 파일>.lock`에 대한 fcntl 배타 락. 여러 워커/컨테이너가 같은 토큰 파일을
+  쓸 때 한 프로세스만 새 토큰을 발급하고, 나머지는 락을 기다렸다가 그 토큰을 읽어 쓴다.
+  (fcntl이 없는 플랫폼에서는 프로세스 간 조정 없이 동작)
+"""
+import os
+import time
+import asyncio
+import logging
+import threading
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows 등 — 프로세스 간 락 없이 동작
+    fcntl = None
+
+from app.core.config import config
+from app.utils.deadline import check_deadline
+
+logger = logging.getLogger(__name__)
+
+#: 락 대기 중 재시도 간격(초)
+_LOCK_POLL_INTERVAL = 0.05
+
+
+def parse_token_file(content: str) -> Dict[str, str]:
+    """`KEY = value` 형식 텍스트를 딕셔너리로 파싱 (주석·빈 줄 무시)"""
+    data: Dict[str, str] = {}
+    for line in content.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        key, value = line.split("=", 1)
+        data[key.strip()] = value.strip().strip("\"'")
+    return data
+
+
+class TokenStore:
+    """토큰/만료시각 1쌍을 저장하는 파일 저장소"""
+
+    def __init__(self, path: str, token_key: str, expire_key: str):
+        self.path = path
+        self.lock_path = f"{path}.lock"
+        self.token_key = token_key
+        self.expire_key = expire_key
+        # 마지막으로 읽은/쓴 파일의 식별 정보와 내용
+        self._signature: Optional[Tuple[int, int, int]] = None
+        self._cached: Optional[Tuple[str, str]] = None
+        self._lock = threading.Lock()
+
+    def _stat_signature(self) -> Optional[Tuple[int, int, int]]:
+        """파일 변경 판정용 (mtime_ns, size, inode). 파일이 없으면 None"""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def read_sync(self) -> Optional[Tuple[str, str]]:
+        """
+        (token, expire_at) 반환 — 파일이 바뀌지 않았으면 메모리 캐시 사용
+
+        Returns:
+            (token, expire_at) 또는 None(파일 없음/읽기 실패/항목 누락)
+        """
+        with self._lock:
+            signature = self._stat_signature()
+            if signature is None:
+                self._signature = None
+                self._cached = None
+                return None
+            if signature == self._signature:
+                return self._cached
+
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = parse_token_file(f.read())
+            except OSError as e:
+                logger.warning(f"토큰 파일 읽기 실패({self.path}): {e}")
+                return None
+
+            token = data.get(self.token_key)
+            expire_at = data.get(self.expire_key)
+            self._cached = (token, expire_at) if token and expire_at else None
+            self._signature = signature
+            if self._cached is None:
+                logger.warning(f"토큰 파일에 토큰 또는 만료 시간이 없음: {self.path}")
+            else:
+                logger.debug(f"토큰 파일 로드: {self.path} (expire_at={expire_at})")
+            return self._cached
+
+    def write_sync(self, token: str, expire_at: str):
+        """임시 파일에 쓴 뒤 rename으로 교체 (읽는 쪽은 항상 완전한 파일만 본다)"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        tmp_path = os.path.join(
+            directory, f".{os.path.basename(self.path)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        with self._lock:
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(f"{self.token_key} = {token}\n")
+                    f.write(f"{self.expire_key} = {expire_at}\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except OSError:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+            self._signature = self._stat_signature()
+            self._cached = (token, expire_at)
+
+    async def load(self) -> Optional[Tuple[str, str]]:
+        """read_sync()의 비동기 버전 (파일 I/O는 스레드에서)"""
+        return await asyncio.to_thread(self.read_sync)
+
+    async def save(self, token: str, expire_at: str):
+        """write_sync()의 비동기 버전 (파일 I/O는 스레드에서)"""
+        await asyncio.to_thread(self.write_sync, token, expire_at)
+
+    @asynccontextmanager
+    async def issue_lock(self, timeout: Optional[float] = None) -> AsyncIterator[bool]:
+        """
+        토큰 발급 구간용 프로세스 간 배타 락 (fcntl.flock)
+
+        이벤트 루프를 막지 않도록 non-blocking 시도를 짧은 간격으로 반복한다.
+        timeout(기본 config.TOKEN_FILE_LOCK_TIMEOUT) 안에 얻지 못하면(락을 쥔 프로세스가
+        멈춘 경우 등) 경고 후 락 없이 진행한다 — 토큰 발급이 영영 막히는 것보다 낫다.
+
+        Yields:
+            락 획득 여부
+        """
+        if fcntl is None:
+            yield False
+            return
+
+        timeout = config.TOKEN_FILE_LOCK_TIMEOUT if timeout is None else timeout
+        try:
+            fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError as e:
+            logger.warning(f"토큰 락 파일 열기 실패(락 없이 진행): {self.lock_path} ({e})")
+            yield False
+            return
+
+        acquired = False
+        try:
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    acquired = True
+                    break
+                except BlockingIOError:
+                    # 요청 deadline이 먼저 끝나면 기다리지 않고 실패 (백그라운드 갱신은 deadline 없음)
+                    check_deadline("토큰 락 대기")
+                    if time.monotonic() >= deadline:
+                        logger.warning(
+                            f"토큰 락 대기 시간 초과({timeout}초) → 락 없이 진행: {self.lock_path}"
+                        )
+                        break
+                    await asyncio.sleep(_LOCK_POLL_INTERVAL)
+            yield acquired
+        finally:
+            if acquired:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
@@ -8,16 +8,30 @@
 제공하지 않는다. 대신 일봉 캔들 API(/api/v1/candles, interval=1d)를 페이지네이션으로
 약 250거래일(≈52주)치 조회하여 high52w/low52w를 직접 산출한다.
 (키움 250hgst/250lwst와 동일한 250일 창 기준 → provider 간 정합)
+지난 거래일들의 창은 하루 한 번만 조회해 종목별로 보관하고, 장중에는 창과 오늘 시세로
+계산한다(_combine_52w). 창이 없을 때의 캔들 조회(2페이지 동시)는 현재가 조회와 겹쳐 실행하고,
+config.TOSS_CANDLE_DEADLINE 초를 넘기면 52주 값 없이 응답한다.
+
+현재가 API는 symbols 다건 조회(최대 200종목)를 지원한다. /api/prices는 이를 직접 쓰고,
+단건 요청도 config.TOSS_BATCH_WINDOW_MS > 0 이면 짧은 시간 창 안에 들어온 요청끼리
+묶어(micro-batching) 다건 호출 1회로 보낸다.
 """
-import os
 import time
 import httpx
+import asyncio
 import logging
-from typing import Optional, Dict, Any
-from dotenv import load_dotenv
+from typing import Optional, Dict, Any, List, Union
 
 from app.core.config import config
-from app.services.base import StockProvider, StockProviderError, ProviderAuthError, normalize_price
+from app.services.base import StockProvider, StockProviderError, ProviderAuthError, normalize_price, seconds_until
+from app.services.http_client import get_http_client
+from app.services.rate_limiter import get_rate_limiter
+from app.services.retry import get_retry_policy
+from app.services.token_store import TokenStore
+from app.services.market_calendar import get_market_calendar
+from app.utils.deadline import cap_timeout, remaining, start_detached
+from app.utils.microbatch import MicroBatcher
+from app.utils.singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
@@ -41,55 +55,128 @@ class TossClient(StockProvider):
     WINDOW_52W_DAYS = 250
     #: 캔들 API 1회 호출당 최대 봉 수
     CANDLE_MAX_PER_CALL = 200
+    #: 날짜로 계산한 52주 2페이지가 1페이지와 겹치는 거래일 수
+    CANDLE_PAGE_OVERLAP = 5
+    #: 현재가 API 1회 호출당 최대 종목 수 (symbols 콤마 구분)
+    PRICES_MAX_PER_CALL = 200
 
     def __init__(self):
         self.api_host = config.TOSS_API_HOST
         self.client_id = config.TOSS_API_CLIENT_ID
         self.client_secret = config.TOSS_API_SECRET
         self.token_file = config.TOSS_TOKEN_ENV
+        self._store = TokenStore(self.token_file, "TOSS_API_TOKEN", "TOSS_API_EXPIRE_AT")
         self._token: Optional[str] = None
         self._token_expire_at: Optional[str] = None  # "YYYYmmddHHMMSS" 형식
         self._last_token_issued_at: Optional[str] = None
+        self._token_issued_mono: Optional[float] = None  # 마지막 발급 시각(monotonic, 재사용 판정용)
+        # 토큰 발급 직렬화 Lock (동시 만료 감지 시 발급 요청 폭주 방지). 루프별 지연 생성.
+        self._token_lock: Optional[asyncio.Lock] = None
+        self._token_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+        # 종목별 52주 창 (KST 날짜가 바뀌면 전체 무효), 동시 창 조회 병합
+        self._windows: Dict[str, Dict[str, Any]] = {}
+        self._windows_date: Optional[str] = None
+        self._window_flight = SingleFlight("toss.52w")
+        # 단건 현재가 요청 micro-batching (config.TOSS_BATCH_WINDOW_MS > 0 일 때만)
+        self._price_batcher: Optional[MicroBatcher] = None
+        if config.TOSS_BATCH_WINDOW_MS > 0:
+            self._price_batcher = MicroBatcher(
+                "toss.prices",
+                self._batch_request_prices,
+                window=config.TOSS_BATCH_WINDOW_MS / 1000,
+                max_size=min(config.TOSS_BATCH_MAX, self.PRICES_MAX_PER_CALL),
+            )
 
     # ------------------------------------------------------------------
     # 토큰 관리
     # ------------------------------------------------------------------
-    def _load_token_from_file(self) -> Optional[str]:
-        """파일에서 저장된 토큰 로드 (만료 시 None)"""
-        if not os.path.isfile(self.token_file):
-            return None
-        if not os.access(self.token_file, os.R_OK):
-            logger.warning("토스 토큰 파일 읽기 권한 없음")
+    def _get_token_lock(self) -> asyncio.Lock:
+        """현재 루프에 맞는 토큰 Lock 반환 (Lock도 루프에 바인딩되므로 지연 생성)"""
+        loop = asyncio.get_running_loop()
+        if self._token_lock is None or self._token_lock_loop is not loop:
+            self._token_lock = asyncio.Lock()
+            self._token_lock_loop = loop
+        return self._token_lock
+
+    def _memory_token_valid(self) -> bool:
+        """메모리 캐시 토큰이 있고 만료 전인지"""
+        now = time.strftime("%Y%m%d%H%M%S")
+        return bool(self._token and self._token_expire_at and self._token_expire_at > now)
+
+    def token_expires_in(self) -> Optional[float]:
+        """메모리 토큰 만료까지 남은 초 (토큰이 없으면 None)"""
+        if not self._token:
             return None
+        return seconds_until(self._token_expire_at)
+
+    async def renew_token(self) -> str:
+        """
+        만료 임박 토큰 선제 갱신 (백그라운드 갱신 작업용)
+
+        대기하는 동안 다른 경로에서 이미 갱신했으면(남은 시간 > TOKEN_RENEW_MARGIN) 그대로 사용한다.
+        """
+        async with self._get_token_lock():
+            remaining = self.token_expires_in()
+            if remaining is not None and remaining > config.TOKEN_RENEW_MARGIN:
+                return self._token
+            logger.info(f"토스 토큰 선제 갱신: 남은 시간={remaining}초")
+            return await self._issue_token_coordinated(
+                previous=self._token, min_valid=config.TOKEN_RENEW_MARGIN
+            )
+
+    async def _issue_token_coordinated(self, previous: Optional[str], min_valid: float = 0) -> str:
+        """
+        프로세스 간 단일화된 토큰 발급 (토큰 파일 락)
+
+        락을 얻은 뒤 파일을 다시 확인해, 기다리는 동안 다른 워커/컨테이너가 발급한 토큰
+        (previous와 다르고 min_valid 초보다 오래 유효)이 있으면 새로 발급하지 않고 그 토큰을 쓴다.
+
+        Args:
+            previous: 지금 교체하려는 토큰 (만료/거부된 토큰). 파일에 같은 토큰만 있으면 발급.
+            min_valid: 재사용할 토큰의 최소 잔여 유효 시간(초)
+        """
+        async with self._store.issue_lock():
+            token = await self._load_token_from_file()
+            remaining = seconds_until(self._token_expire_at) if token else None
+            if token and token != previous and remaining is not None and remaining > min_valid:
+                logger.info(f"토스 다른 프로세스가 발급한 토큰 사용: expire_at={self._token_expire_at}")
+                return token
+            return await self._request_new_token()
 
-        load_dotenv(self.token_file, override=True)
-        token = os.getenv("TOSS_API_TOKEN")
-        expire_at = os.getenv("TOSS_API_EXPIRE_AT")
+    def _token_recently_issued(self) -> bool:
+        """방금(config.TOKEN_REUSE_WINDOW 초 이내) 발급된 토큰인지"""
+        return (
+            self._token_issued_mono is not None
+            and time.monotonic() - self._token_issued_mono < config.TOKEN_REUSE_WINDOW
+        )
 
-        if not token or not expire_at:
+    async def _load_token_from_file(self) -> Optional[str]:
+        """파일에서 저장된 토큰 로드 (파일이 바뀌었을 때만 실제로 읽음, 만료 시 None)"""
+        stored = await self._store.load()
+        if stored is None:
             return None
+        token, expire_at = stored
 
         now = time.strftime("%Y%m%d%H%M%S")
         if expire_at < now:
             logger.info(f"토스 토큰 만료됨: expire_at={expire_at}, now={now}")
-            try:
-                os.remove(self.token_file)
-            except Exception as e:
-                logger.warning(f"만료된 토스 토큰 파일 삭제 실패: {e}")
             return None
 
         self._token = token
         self._token_expire_at = expire_at
         return token
 
-    def _save_token_to_file(self, token: str, expire_at: str):
-        """토큰을 파일에 저장"""
-        with open(self.token_file, "w") as f:
-            f.write(f"TOSS_API_TOKEN = {token}\n")
-            f.write(f"TOSS_API_EXPIRE_AT = {expire_at}\n")
+    async def _save_token_to_file(self, token: str, expire_at: str):
+        """토큰을 메모리에 반영하고 파일에 원자적으로 저장 (파일 I/O는 스레드에서)"""
         self._token = token
         self._token_expire_at = expire_at
         self._last_token_issued_at = time.strftime("%Y-%m-%d %H:%M:%S")
+        self._token_issued_mono = time.monotonic()
+        try:
+            await self._store.save(token, expire_at)
+        except OSError as e:
+            logger.error(f"토스 토큰 파일 저장 실패({self.token_file}): {e}")
+            return
         logger.info(f"토스 토큰 파일 저장 완료: expire_at={expire_at}")
 
     async def _request_new_token(self) -> str:
@@ -106,19 +193,25 @@ class TossClient(StockProvider):
             "client_secret": self.client_secret,
         }
 
+        client = get_http_client("toss")
+        limiter = get_rate_limiter("toss", "token")
+
+        async def _send() -> httpx.Response:
+            await limiter.acquire()
+            return await client.post(url, headers=headers, data=data, timeout=cap_timeout(10.0, "toss.token"))
+
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url, headers=headers, data=data, timeout=10.0)
+            response = await get_retry_policy().send("toss.token", _send, idempotent=False)
         except httpx.HTTPError as e:
             logger.error(f"토스 토큰 요청 HTTP 에러: {e}")
-            raise TossAPIError(f"토스 토큰 요청 실패: {e}")
+            raise TossAPIError(f"토스 토큰 요청 실패: {e}") from e
 
         if response.status_code != 200:
             # OAuth2 표준 에러 포맷: {"error": "...", "error_description": "..."}
             err = _safe_json(response)
             msg = err.get("error_description") or err.get("error") or f"HTTP {response.status_code}"
             logger.error(f"토스 토큰 발급 실패: status={response.status_code}, msg={msg}")
-            raise TossAuthError(f"토스 토큰 발급 실패: {msg}")
+            raise TossAuthError(f"토스 토큰 발급 실패: {msg}", status_code=response.status_code)
 
         result = response.json()
         token = result.get("access_token")
@@ -132,22 +225,30 @@ class TossClient(StockProvider):
         expire_at = time.strftime("%Y%m%d%H%M%S", time.localtime(expire_epoch))
 
         logger.info(f"토스 새 토큰 발급 성공: expires_in={expires_in}, expire_at={expire_at}")
-        self._save_token_to_file(token, expire_at)
+        await self._save_token_to_file(token, expire_at)
         return token
 
     async def get_token(self, force_new: bool = False) -> str:
-        """토큰 획득 (메모리 캐시 → 파일 → 신규 발급)"""
-        if not force_new and self._token:
-            now = time.strftime("%Y%m%d%H%M%S")
-            if self._token_expire_at and self._token_expire_at > now:
+        """
+        토큰 획득 (메모리 캐시 → 파일 → 신규 발급)
+
+        발급은 Lock(프로세스 간에는 토큰 파일 락)으로 직렬화한다. 동시에 만료/401을
+        감지한 요청들은 먼저 들어간 요청이 발급한 토큰을 함께 쓰며, force_new여도 직전 TOKEN_REUSE_WINDOW 초 이내
+        발급된 토큰은 재사용한다.
+        """
+        if not force_new and self._memory_token_valid():
+            return self._token
+
+        async with self._get_token_lock():
+            if self._memory_token_valid() and (not force_new or self._token_recently_issued()):
                 return self._token
 
-        if not force_new:
-            token = self._load_token_from_file()
-            if token:
-                return token
+            if not force_new:
+                token = await self._load_token_from_file()
+                if token:
+                    return token
 
-        return await self._request_new_token()
+            return await self._issue_token_coordinated(previous=self._token)
 
     # ------------------------------------------------------------------
     # 헤더/캔들 유틸
@@ -156,6 +257,35 @@ class TossClient(StockProvider):
     def _auth_headers(token: str) -> Dict[str, str]:
         return {"Authorization": f"Bearer {token}", "Accept": "application/json"}
 
+    async def _send_with_retry(
+        self, api_id: str, url: str, token: str, params: Dict[str, Any]
+    ) -> httpx.Response:
+        """
+        인증 GET 요청 (rate limiter + 재시도 정책)
+
+        401 인증 만료 → 토큰 재발급 후 재시도, 연결 실패·타임아웃·429·5xx → 백오프 후 재시도.
+        마지막 응답을 그대로 반환한다 (상태 코드 처리는 호출 측).
+        """
+        client = get_http_client("toss")
+        limiter = get_rate_limiter("toss", api_id)
+        auth = {"token": token}
+
+        async def _send() -> httpx.Response:
+            await limiter.acquire()
+            return await client.get(
+                url, headers=self._auth_headers(auth["token"]), params=params,
+                timeout=cap_timeout(10.0, f"toss.{api_id}"),
+            )
+
+        async def _refresh_token():
+            auth["token"] = await self.get_token(force_new=True)
+
+        return await get_retry_policy().send(
+            f"toss.{api_id}", _send,
+            is_auth_failure=lambda response: response.status_code == 401,
+            refresh_auth=_refresh_token,
+        )
+
     async def _fetch_candles(
         self, code: str, token: str, count: int, before: Optional[str] = None
     ) -> (list, Optional[str]):
@@ -171,118 +301,264 @@ class TossClient(StockProvider):
             params["before"] = before  # httpx가 '+' 등 URL 인코딩 처리
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    url, headers=self._auth_headers(token), params=params, timeout=10.0
-                )
-                if response.status_code == 401:
-                    logger.warning("[toss] 캔들 401 - 토큰 재발급 후 재시도")
-                    token = await self.get_token(force_new=True)
-                    response = await client.get(
-                        url, headers=self._auth_headers(token), params=params, timeout=10.0
-                    )
-                if response.status_code != 200:
-                    err = _safe_json(response)
-                    detail = (err.get("error") or {}).get("message") if isinstance(err.get("error"), dict) else err.get("error")
-                    detail = detail or f"HTTP {response.status_code}"
-                    raise TossAPIError(f"토스 캔들 조회 실패: {detail}")
-                result = response.json()
+            response = await self._send_with_retry("candles", url, token, params)
+            if response.status_code != 200:
+                err = _safe_json(response)
+                detail = (err.get("error") or {}).get("message") if isinstance(err.get("error"), dict) else err.get("error")
+                detail = detail or f"HTTP {response.status_code}"
+                raise TossAPIError(f"토스 캔들 조회 실패: {detail}", status_code=response.status_code)
+            result = response.json()
         except httpx.HTTPError as e:
-            raise TossAPIError(f"토스 캔들 조회 실패: {e}")
+            raise TossAPIError(f"토스 캔들 조회 실패: {e}") from e
 
         r = result.get("result") or {}
         return (r.get("candles") or [], r.get("nextBefore"))
 
-    async def _get_52w_high_low(self, code: str, token: str):
+    def _second_page_before(self) -> str:
         """
-        일봉 캔들을 페이지네이션(약 2회)으로 250거래일치 모아 52주 최고/최저가 산출.
+        52주 2페이지 상한(before)을 날짜로 계산 — 1페이지 응답(nextBefore)을 기다리지 않기 위함.
 
-        Returns:
-            (high52w, low52w, high52w_date) — 실패 시 (None, None, None)
+        1페이지(최신 200봉)의 가장 오래된 봉보다 CANDLE_PAGE_OVERLAP 거래일 안쪽 날짜를 상한으로 잡아
+        두 페이지가 겹치게 한다(휴장일 목록 오차·오늘 봉 유무를 흡수, 중복 봉은 병합 시 제거).
+        """
+        calendar = get_market_calendar()
+        today = calendar.now().date()
+        latest = today if calendar.is_trading_day(today) else calendar.trading_days_before(today, 1)
+        before = calendar.trading_days_before(latest, self.CANDLE_MAX_PER_CALL - self.CANDLE_PAGE_OVERLAP)
+        return f"{before.isoformat()}T23:59:59+09:00"
+
+    async def _fetch_52w_candles(self, code: str, token: str) -> list:
+        """
+        52주(250거래일) 일봉 조회 — 1페이지(최신 200봉)와 날짜로 계산한 2페이지를 동시에 요청.
+
+        두 페이지가 겹치지 않으면(날짜 계산이 어긋난 경우) 1페이지의 nextBefore 커서로
+        2페이지를 다시 받는다.
         """
-        # 1페이지: 최신 200봉
-        candles, next_before = await self._fetch_candles(
-            code, token, count=self.CANDLE_MAX_PER_CALL
+        remaining = self.WINDOW_52W_DAYS - self.CANDLE_MAX_PER_CALL
+        first, second = await asyncio.gather(
+            self._fetch_candles(code, token, count=self.CANDLE_MAX_PER_CALL),
+            self._fetch_candles(
+                code, token,
+                count=min(remaining + self.CANDLE_PAGE_OVERLAP, self.CANDLE_MAX_PER_CALL),
+                before=self._second_page_before(),
+            ),
+            return_exceptions=True,
         )
-        # 2페이지: 나머지(약 50봉)
-        remaining = self.WINDOW_52W_DAYS - len(candles)
-        if remaining > 0 and next_before:
-            more, _ = await self._fetch_candles(
-                code, token, count=min(remaining, self.CANDLE_MAX_PER_CALL), before=next_before
-            )
-            candles += more
+        if isinstance(first, BaseException):
+            raise first
+        candles, next_before = first
+        if len(candles) < self.CANDLE_MAX_PER_CALL or not next_before:
+            return candles  # 상장 기간이 짧아 1페이지로 끝
+
+        first_oldest = min((c.get("timestamp") or "" for c in candles), default="")
+        if not isinstance(second, BaseException):
+            more, _ = second
+            # 2페이지 최신 봉이 1페이지 가장 오래된 봉 이상이면 빈 구간 없음
+            if more and max(c.get("timestamp") or "" for c in more) >= first_oldest:
+                return candles + more
+            logger.debug(f"[toss] 52주 2페이지 날짜 범위 불일치 → 커서로 재조회: code={code}")
+        else:
+            logger.debug(f"[toss] 52주 2페이지(날짜) 조회 실패 → 커서로 재조회: code={code} ({second})")
+
+        more, _ = await self._fetch_candles(code, token, count=remaining, before=next_before)
+        return candles + more
+
+    async def _load_52w_window(self, code: str, token: str, today: str) -> Dict[str, Any]:
+        """
+        일봉 캔들을 페이지네이션(약 2회)으로 250거래일치 모아 52주 창을 만든다.
+
+        오늘(KST) 봉은 장중에 계속 바뀌므로 창에서 분리한다:
+          - high/low/high_date: 오늘을 제외한 직전 (WINDOW_52W_DAYS - 1) 거래일의 최고/최저
+          - day_high/day_low : 조회 시점의 오늘 봉 고가/저가 (이후 현재가로 갱신)
 
-        best_high: Optional[float] = None
-        best_date: Optional[str] = None
-        low52w: Optional[float] = None
+        Returns:
+            창 딕셔너리 (self._windows[code]에 저장)
+        """
+        candles = await self._fetch_52w_candles(code, token)
+
+        window: Dict[str, Any] = {
+            "date": today, "high": None, "low": None, "high_date": None,
+            "day_high": None, "day_low": None,
+        }
         seen = set()
-        for c in candles[: self.WINDOW_52W_DAYS + self.CANDLE_MAX_PER_CALL]:
+        past_days = 0
+        for c in candles:
             ts = c.get("timestamp")
-            if ts in seen:  # 페이지 경계 중복 봉 제거
+            if not ts or ts in seen:  # 페이지 경계 중복 봉 제거
                 continue
             seen.add(ts)
             high = normalize_price(c.get("highPrice"))
             low = normalize_price(c.get("lowPrice"))
-            if high is not None and (best_high is None or high > best_high):
-                best_high = high
-                best_date = ts
-            if low is not None and (low52w is None or low < low52w):
-                low52w = low
+            if ts[:10] == today:
+                window["day_high"], window["day_low"] = high, low
+                continue
+            if past_days >= self.WINDOW_52W_DAYS - 1:
+                continue
+            past_days += 1
+            if high is not None and (window["high"] is None or high > window["high"]):
+                window["high"] = high
+                # ISO(2026-03-25T09:00:00+09:00) → "20260325" (키움 250hgst_pric_dt 포맷)
+                window["high_date"] = ts[:10].replace("-", "")
+            if low is not None and (window["low"] is None or low < window["low"]):
+                window["low"] = low
+
+        if self._windows_date != today:
+            # 날짜가 바뀌면 지난 창은 모두 무효 → 한 번에 정리
+            self._windows = {}
+            self._windows_date = today
+        self._windows[code] = window
+        logger.info(
+            f"[toss] 52주 창 갱신: code={code}, {past_days}거래일, "
+            f"high={window['high']}, low={window['low']}"
+        )
+        return window
+
+    def _start_52w_window(self, code: str, token: str) -> Optional[asyncio.Future]:
+        """
+        오늘 52주 창이 없으면 조회를 시작해 Future 반환 (이미 있으면 None)
+
+        현재가 조회와 겹쳐 실행하기 위해 먼저 시작해 두고 나중에 _await_52w_window()로 받는다.
+        같은 종목 동시 요청은 창 조회 1회로 병합된다.
+        """
+        today = get_market_calendar().now().strftime("%Y-%m-%d")
+        if self._windows_date == today and code in self._windows:
+            return None
+        # 요청 deadline과 무관하게 끝까지 진행해 오늘 창을 채운다 (요청은 _await_52w_window에서 기다림만 포기)
+        return start_detached(
+            self._window_flight.do((code, today), lambda: self._load_52w_window(code, token, today))
+        )
+
+    @staticmethod
+    def _release_52w_window(pending: Optional[asyncio.Future]) -> None:
+        """
+        이 호출자가 52주 창을 기다리지 않고 끝나는 경우 대비 — 조회는 취소하지 않고 결과만 조회되게 한다
+
+        창 조회는 같은 종목 요청끼리 공유(single-flight)하고 오늘 창을 채워 다음 요청이 쓰므로
+        한 호출자의 실패·취소로 중단하지 않는다. 아무도 기다리지 않은 채 실패해도 미조회 경고가 남지 않는다.
+        """
+        if pending is not None:
+            pending.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    async def _await_52w_window(
+        self, code: str, token: str, pending: Optional[asyncio.Future] = None
+    ) -> Dict[str, Any]:
+        """
+        52주 창 반환 — 조회 중이면 최대 config.TOSS_CANDLE_DEADLINE 초(요청 deadline이 더 짧으면 남은 시간)까지만 기다린다.
+
+        시간 초과 시 asyncio.TimeoutError. 이때 기다림만 취소되고 창 조회 자체는 계속 진행돼
+        다음 요청부터 사용된다(single-flight 공유 Task).
+        """
+        if pending is None:
+            pending = self._start_52w_window(code, token)
+        if pending is not None:
+            timeout = config.TOSS_CANDLE_DEADLINE
+            left = remaining()
+            if left is not None:
+                timeout = max(min(timeout, left), 0)
+            return await asyncio.wait_for(pending, timeout=timeout)
+        return self._windows[code]
+
+    def _cached_52w_window(self, code: str) -> Optional[Dict[str, Any]]:
+        """오늘 만든 52주 창 (없으면 None, 조회하지 않음)"""
+        today = get_market_calendar().now().strftime("%Y-%m-%d")
+        return self._windows.get(code) if self._windows_date == today else None
+
+    @staticmethod
+    def _combine_52w(window: Dict[str, Any], price: Optional[float]):
+        """
+        52주 최고/최저가 — 지난 거래일 창 + 오늘 시세로 산출.
+
+        창은 KST 날짜가 바뀔 때만 캔들 API로 다시 만든다. 장중에는
+        max/min(창, 오늘 봉 고가/저가, 지금까지 관측한 현재가)로 계산하므로
+        시세 조회 경로에서 캔들 호출(2회)이 빠진다.
 
-        # ISO(2026-03-25T09:00:00+09:00) → "20260325" (키움 250hgst_pric_dt 포맷)
-        high52w_date = best_date[:10].replace("-", "") if best_date else None
-        return best_high, low52w, high52w_date
+        Returns:
+            (high52w, low52w, high52w_date)
+        """
+        # 오늘 관측 고가/저가 누적 (창 갱신 전까지 유지)
+        if price is not None:
+            if window["day_high"] is None or price > window["day_high"]:
+                window["day_high"] = price
+            if window["day_low"] is None or price < window["day_low"]:
+                window["day_low"] = price
+
+        high52w, high52w_date = window["high"], window["high_date"]
+        if window["day_high"] is not None and (high52w is None or window["day_high"] > high52w):
+            high52w, high52w_date = window["day_high"], window["date"].replace("-", "")
+        low52w = window["low"]
+        if window["day_low"] is not None and (low52w is None or window["day_low"] < low52w):
+            low52w = window["day_low"]
+        return high52w, low52w, high52w_date
 
     # ------------------------------------------------------------------
     # 시세 조회
     # ------------------------------------------------------------------
-    async def get_stock_price(self, code: str, market: str = "KOSPI") -> Dict[str, Any]:
+    async def _request_prices(self, symbols: List[str], token: str) -> Dict[str, Dict[str, Any]]:
         """
-        현재가 조회(GET /api/v1/prices) + 일봉 캔들 기반 52주 최고/최저가 산출.
-        """
-        logger.info(f"[toss] 시세 조회 시작: code={code}, market={market}")
-        token = await self.get_token()
+        현재가 다건 조회 1회 (GET /api/v1/prices?symbols=a,b,c — 최대 PRICES_MAX_PER_CALL개)
 
+        Returns:
+            symbol → 응답 항목(lastPrice 등). 응답에 없는 종목은 포함되지 않는다.
+        """
         url = f"{self.api_host}/api/v1/prices"
-        params = {"symbols": code}
+        params = {"symbols": ",".join(symbols)}
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, headers=self._auth_headers(token), params=params, timeout=10.0)
-
-                # 401 인증 만료 → 토큰 재발급 후 1회 재시도
-                if response.status_code == 401:
-                    logger.warning("[toss] HTTP 401 - 토큰 재발급 후 재시도")
-                    token = await self.get_token(force_new=True)
-                    response = await client.get(url, headers=self._auth_headers(token), params=params, timeout=10.0)
-
-                if response.status_code != 200:
-                    err = _safe_json(response)
-                    detail = (err.get("error") or {}).get("message") if isinstance(err.get("error"), dict) else err.get("error")
-                    detail = detail or f"HTTP {response.status_code}"
-                    logger.error(f"[toss] 시세 조회 실패: status={response.status_code}, msg={detail}")
-                    if response.status_code in (401, 403):
-                        raise TossAuthError(f"토스 인증 실패: {detail}")
-                    raise TossAPIError(f"토스 시세 조회 실패: {detail}")
-
-                result = response.json()
+            response = await self._send_with_retry("prices", url, token, params)
+
+            if response.status_code != 200:
+                err = _safe_json(response)
+                detail = (err.get("error") or {}).get("message") if isinstance(err.get("error"), dict) else err.get("error")
+                detail = detail or f"HTTP {response.status_code}"
+                logger.error(f"[toss] 시세 조회 실패: status={response.status_code}, msg={detail}")
+                if response.status_code in (401, 403):
+                    raise TossAuthError(f"토스 인증 실패: {detail}", status_code=response.status_code)
+                raise TossAPIError(f"토스 시세 조회 실패: {detail}", status_code=response.status_code)
+
+            result = response.json()
         except httpx.HTTPError as e:
             logger.error(f"[toss] HTTP 에러: {e}")
-            raise TossAPIError(f"토스 시세 조회 실패: {e}")
+            raise TossAPIError(f"토스 시세 조회 실패: {e}") from e
+
+        return {item.get("symbol"): item for item in (result.get("result") or []) if item.get("symbol")}
+
+    async def _build_quote(
+        self,
+        code: str,
+        market: str,
+        item: Optional[Dict[str, Any]],
+        token: str,
+        window_task: Optional[asyncio.Future] = None,
+        include_52w: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        현재가 응답 항목 + 일봉 캔들 기반 52주 최고/최저가 → 공통 시세 딕셔너리
 
-        items = result.get("result") or []
-        if not items:
+        Args:
+            window_task: 현재가 조회와 동시에 시작해 둔 52주 창 조회 (_start_52w_window)
+            include_52w: False면 캔들을 조회하지 않는다 (오늘 창이 이미 있으면 그것으로 계산)
+        """
+        if not item:
             raise TossAPIError(f"토스 시세 데이터를 찾을 수 없습니다: code={code}")
 
-        item = items[0]
         price = normalize_price(item.get("lastPrice"))
         if price is None:
             raise TossAPIError("토스 현재가 데이터를 찾을 수 없습니다")
 
         # 52주 최고/최저가: 일봉 캔들로 산출. 실패해도 현재가는 반환(정보만 결손).
+        # 캔들 조회가 TOSS_CANDLE_DEADLINE 초 안에 끝나지 않으면 52주 값 없이 응답한다.
         high52w = low52w = high52w_date = None
         try:
-            high52w, low52w, high52w_date = await self._get_52w_high_low(code, token)
+            if include_52w:
+                window = await self._await_52w_window(code, token, window_task)
+            else:
+                window = self._cached_52w_window(code)
+            if window is not None:
+                high52w, low52w, high52w_date = self._combine_52w(window, price)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"[toss] 52주 창 조회 {config.TOSS_CANDLE_DEADLINE}초 초과 → 52주 값 없이 반환: code={code}"
+            )
         except StockProviderError as e:
             logger.warning(f"[toss] 52주 산출 실패(현재가는 정상 반환): {e}")
 
@@ -303,6 +579,82 @@ class TossClient(StockProvider):
             "provider": self.name,
         }
 
+    async def get_stock_price(
+        self, code: str, market: str = "KOSPI", include_52w: bool = True
+    ) -> Dict[str, Any]:
+        """
+        현재가 조회(GET /api/v1/prices) + 일봉 캔들 기반 52주 최고/최저가 산출.
+        (include_52w=False면 캔들 조회 생략)
+        """
+        logger.info(f"[toss] 시세 조회 시작: code={code}, market={market}")
+        token = await self.get_token()
+        # 52주 창(캔들)이 없으면 현재가 조회와 동시에 진행
+        window_task = self._start_52w_window(code, token) if include_52w else None
+        # 현재가 실패 등으로 창을 기다리지 않고 끝나도 공유 창 조회는 그대로 진행
+        self._release_52w_window(window_task)
+        if self._price_batcher is not None:
+            # 동시에 들어온 다른 종목 요청과 묶어 다건 현재가 호출 1회로 조회
+            item = await self._price_batcher.submit(code)
+        else:
+            item = (await self._request_prices([code], token)).get(code)
+        return await self._build_quote(code, market, item, token, window_task, include_52w)
+
+    async def _batch_request_prices(self, codes: List[str]) -> Dict[str, Dict[str, Any]]:
+        """micro-batcher handler: 모인 종목들의 현재가를 다건 호출 1회로 조회"""
+        token = await self.get_token()
+        return await self._request_prices(codes, token)
+
+    def batch_stats(self) -> Optional[Dict[str, Any]]:
+        """micro-batching 지표 (비활성화 시 None)"""
+        return self._price_batcher.stats() if self._price_batcher is not None else None
+
+    async def get_stock_prices(
+        self, codes: List[str], market: str = "KOSPI", include_52w: bool = True
+    ) -> Dict[str, Union[Dict[str, Any], StockProviderError]]:
+        """
+        여러 종목 시세 조회 — 현재가는 PRICES_MAX_PER_CALL개 단위 다건 호출 1회씩,
+        52주 값은 종목별로 창 조회 시작·대기를 config.BATCH_CONCURRENCY 개씩 진행.
+        (창 대기가 TOSS_CANDLE_DEADLINE을 넘으면 그 종목은 52주 값 없이 반환하고 조회는 백그라운드로 계속)
+        """
+        logger.info(f"[toss] 다건 시세 조회 시작: {len(codes)}종목, market={market}")
+        token = await self.get_token()
+
+        async def _request_all() -> Dict[str, Union[Dict[str, Any], StockProviderError]]:
+            items: Dict[str, Union[Dict[str, Any], StockProviderError]] = {}
+            for i in range(0, len(codes), self.PRICES_MAX_PER_CALL):
+                chunk = codes[i:i + self.PRICES_MAX_PER_CALL]
+                try:
+                    items.update(await self._request_prices(chunk, token))
+                except StockProviderError as e:
+                    # 해당 묶음만 실패 처리 (나머지 묶음은 계속)
+                    items.update({code: e for code in chunk})
+            return items
+
+        # 현재가 조회는 먼저 시작하고, 그동안 동시 실행 한도 안에서 52주 창 조회를 시작
+        prices = asyncio.ensure_future(_request_all())
+        semaphore = asyncio.Semaphore(max(config.BATCH_CONCURRENCY, 1))
+
+        async def _one(code: str):
+            async with semaphore:
+                window_task = self._start_52w_window(code, token) if include_52w else None
+                self._release_52w_window(window_task)
+                item = (await asyncio.shield(prices)).get(code)
+                if isinstance(item, StockProviderError):
+                    return item
+                try:
+                    return await self._build_quote(code, market, item, token, window_task, include_52w)
+                except StockProviderError as e:
+                    return e
+
+        try:
+            results = await asyncio.gather(*(_one(code) for code in codes))
+        finally:
+            if not prices.done():
+                prices.cancel()
+            elif not prices.cancelled():
+                prices.exception()  # 기다린 종목이 없었던 경우 미조회 경고 방지
+        return dict(zip(codes, results))
+
 
 def _safe_json(response: httpx.Response) -> Dict[str, Any]:
     """응답 JSON 파싱 실패 시 빈 딕셔너리 반환"""
@@ -0,0 +1,96 @@
+"""
+요청 단위 deadline (contextvar로 전파)
+
+구글 시트 IMPORTXML은 자체 제한 시간이 지나면 응답을 버린다. 그 뒤에도 서버가
+upstream을 기다리면 자원만 쓰므로, 요청 진입 시 deadline(monotonic 시각)을 정하고
+하위 단계(시세 조회·토큰 발급·스크래핑·렌더링)가 **남은 시간만** 쓰게 한다.
+
+    with deadline_scope(8.0):        # 라우터 진입 시 (엔드포인트별 설정)
+        ...
+        timeout = cap_timeout(10.0)  # httpx timeout = min(10초, 남은 시간), 소진 시 DeadlineExceeded
+        check_deadline("toss.prices")  # 단계 진입 전 확인
+
+- contextvar라 asyncio Task(single-flight·micro-batch 등)에도 복사돼 전파된다.
+- 요청이 끝난 뒤에도 계속돼야 하는 백그라운드 작업은 start_detached()로 deadline 없이 시작한다.
+- deadline이 없으면(스크립트·백그라운드) 모든 함수는 기존 timeout을 그대로 쓴다.
+"""
+import time
+import asyncio
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Coroutine, Iterator, Optional
+
+# monotonic 기준 deadline 시각 (None = 제한 없음)
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """요청 deadline 소진 (upstream을 더 기다리지 않고 실패 — 호출 측은 캐시/stale 응답 또는 504)"""
+    pass
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[None]:
+    """
+    이 블록 안의 작업에 deadline 적용 (이미 더 짧은 deadline이 있으면 그대로 유지)
+
+    Args:
+        seconds: 지금부터 허용할 시간(초). None 또는 0 이하면 제한 없음
+    """
+    current = _deadline.get()
+    if seconds is not None and seconds > 0:
+        new = time.monotonic() + seconds
+        if current is None or new < current:
+            current = new
+    token = _deadline.set(current)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """남은 시간(초, 음수 가능). deadline이 없으면 None"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def expired() -> bool:
+    """deadline이 지났는지 (deadline이 없으면 False)"""
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def check_deadline(stage: str = "") -> None:
+    """deadline이 지났으면 DeadlineExceeded"""
+    if expired():
+        raise DeadlineExceeded(f"요청 제한 시간 초과{f' ({stage})' if stage else ''}")
+
+
+def cap_timeout(timeout: float, stage: str = "") -> float:
+    """
+    기본 timeout을 남은 시간으로 제한
+
+    Returns:
+        min(timeout, 남은 시간) — deadline이 없으면 timeout 그대로
+
+    Raises:
+        DeadlineExceeded: 이미 소진됨
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise DeadlineExceeded(f"요청 제한 시간 초과{f' ({stage})' if stage else ''}")
+    return min(timeout, left)
+
+
+def start_detached(coro: Coroutine[Any, Any, Any]) -> asyncio.Future:
+    """
+    요청 deadline 없이 Task 시작 (요청이 끝나도 끝까지 진행해 캐시를 채우는 백그라운드 작업용)
+    """
+    ctx = contextvars.copy_context()
+    ctx.run(_deadline.set, None)
+    return ctx.run(asyncio.ensure_future, coro)
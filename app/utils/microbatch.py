@@ -0,0 +1,138 @@
+"""
+micro-batching (짧은 시간 창 안의 단건 요청을 다건 호출 1회로 병합)
+
+시트 재계산 시 서로 다른 종목의 단건 요청이 수 ms 간격으로 몰려 들어온다.
+다건 API가 있는 upstream이라면, 첫 요청 후 window 초 동안(또는 max_size개가 찰 때까지)
+들어온 키를 모아 handler(keys) 1회로 조회하고 결과를 각 대기자에게 나눠 준다.
+몇 ms의 지연을 더하는 대신 upstream 호출 수를 크게 줄인다.
+
+- 같은 묶음 안의 같은 키는 1번만 조회한다.
+- 실제 조회는 별도 Task로 실행하고 호출자는 shield로 기다린다 (SingleFlight와 동일한 이유).
+- 조회 Task는 요청 deadline 없이 시작한다 (묶음을 채운/타이머를 건 요청의 deadline에 묶이지 않음).
+  호출자마다 **자기** 남은 시간만큼만 기다리고, 다 되면 그 호출자만 DeadlineExceeded로 빠진다.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set
+
+from app.utils.deadline import DeadlineExceeded, remaining, start_detached
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """키 단위 요청을 시간 창/최대 크기 기준으로 묶어 handler에 넘기는 병합기"""
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]],
+        window: float,
+        max_size: int,
+    ):
+        """
+        Args:
+            name: 로그/지표용 이름
+            handler: 키 목록 → {키: 결과 또는 예외} 코루틴 함수. 결과에 없는 키는 None.
+            window: 첫 요청 후 묶음을 닫기까지 기다리는 시간(초)
+            max_size: 묶음 최대 크기 (도달 시 즉시 조회)
+        """
+        self.name = name
+        self.handler = handler
+        self.window = window
+        self.max_size = max(int(max_size), 1)
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._running: Set[asyncio.Task] = set()
+        self.batches = 0    # handler 호출 횟수
+        self.requests = 0   # submit 횟수
+        self.max_batch = 0  # 가장 큰 묶음 크기
+
+    async def submit(self, key: Hashable) -> Any:
+        """
+        key를 현재 묶음에 넣고 결과를 기다린다 (handler 예외는 그대로 전파)
+
+        Raises:
+            DeadlineExceeded: 이 호출자의 남은 시간이 먼저 소진됨 (묶음 조회는 계속 진행)
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # 다른 이벤트 루프에서 만든 Future/타이머는 쓸 수 없다 (테스트 스크립트 등)
+            self._pending = {}
+            self._timer = None
+            self._loop = loop
+
+        self.requests += 1
+        future = self._pending.get(key)
+        if future is None:
+            future = loop.create_future()
+            self._pending[key] = future
+            if len(self._pending) >= self.max_size:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window, self._flush)
+
+        left = remaining()
+        if left is None:
+            return await asyncio.shield(future)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), max(left, 0))
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                return future.result()
+            raise DeadlineExceeded(f"요청 제한 시간 초과 (micro-batch 대기: {self.name})")
+
+    def _flush(self):
+        """현재 묶음을 닫고 handler 실행"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return
+        self.batches += 1
+        self.max_batch = max(self.max_batch, len(batch))
+        logger.debug(f"[micro-batch:{self.name}] {len(batch)}건 조회")
+        # 타이머 콜백/묶음을 채운 요청의 컨텍스트에서 불리므로 deadline을 떼고 시작
+        task = start_detached(self._run(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: Dict[Hashable, asyncio.Future]):
+        try:
+            results = await self.handler(list(batch))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+                    future.exception()  # 대기자가 모두 취소된 경우 미조회 경고 방지
+            return
+        except BaseException:
+            # 조회 Task 취소(종료 시 등) — 대기자가 영원히 기다리지 않도록 함께 취소
+            for future in batch.values():
+                if not future.done():
+                    future.cancel()
+            raise
+
+        for key, future in batch.items():
+            if future.done():
+                continue
+            result = results.get(key)
+            if isinstance(result, Exception):
+                future.set_exception(result)
+                future.exception()
+            else:
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """카운터 (디버깅용, avg_batch = handler 호출 1회당 평균 요청 수)"""
+        return {
+            "window_ms": round(self.window * 1000),
+            "max_size": self.max_size,
+            "pending": len(self._pending),
+            "requests": self.requests,
+            "batches": self.batches,
+            "avg_batch": round(self.requests / self.batches, 2) if self.batches else None,
+            "max_batch": self.max_batch,
+        }
@@ -0,0 +1,105 @@
+"""
+single-flight (동시 중복 호출 병합)
+
+같은 키로 진행 중인 호출이 있으면 새로 실행하지 않고 그 결과를 함께 기다린다.
+구글 시트 재계산처럼 같은 요청이 수백 ms 안에 몰릴 때 upstream 호출을 1회로 줄인다.
+
+실제 작업은 별도 Task로 실행하고 호출자는 shield로 기다린다.
+→ 먼저 온 요청(클라이언트)이 끊겨 취소되어도 함께 기다리는 요청은 영향받지 않는다.
+
+detached=True면 작업을 요청 deadline 없이 시작하고(먼저 온 요청의 deadline에 묶이지 않음),
+호출자마다 **자기** 남은 시간만큼만 기다린다. 남은 시간이 다 되면 그 호출자만 DeadlineExceeded로
+빠지고 작업은 끝까지 진행된다 (나중 호출자·캐시가 결과를 쓴다).
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+from app.utils.deadline import DeadlineExceeded, remaining, start_detached
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """키 단위 동시 호출 병합기"""
+
+    def __init__(self, name: str = ""):
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0      # 실제 실행 횟수
+        self.coalesced = 0  # 진행 중 호출에 합류한 횟수
+
+    def in_flight(self, key: Hashable) -> bool:
+        """해당 키로 진행 중인 호출이 있는지"""
+        return key in self._inflight
+
+    def start(self, key: Hashable, fn: Callable[[], Awaitable[T]], detached: bool = False) -> asyncio.Task:
+        """
+        key로 진행 중인 호출이 있으면 그 Task, 없으면 fn()을 시작해 등록한 Task 반환 (기다리지 않음)
+
+        등록이 즉시 이뤄지므로, 여러 키를 한꺼번에 시작해 두면 이후 같은 키의 do()가 바로 합류한다.
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            logger.debug(f"[single-flight:{self.name}] 합류: {key}")
+            return task
+        self.calls += 1
+        task = start_detached(fn()) if detached else asyncio.ensure_future(fn())
+        self._inflight[key] = task
+        task.add_done_callback(lambda t, k=key: self._done(k, t))
+        return task
+
+    async def wait(self, task: asyncio.Task, detached: bool = False) -> Any:
+        """
+        start()가 반환한 Task의 결과를 기다린다 (이 호출자가 취소돼도 Task는 계속)
+
+        Raises:
+            DeadlineExceeded: detached=True이고 이 호출자의 남은 시간이 먼저 소진됨 (작업은 계속 진행)
+        """
+        if not detached:
+            return await asyncio.shield(task)
+
+        left = remaining()
+        if left is None:
+            return await asyncio.shield(task)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), max(left, 0))
+        except asyncio.TimeoutError:
+            if task.done() and not task.cancelled():
+                return task.result()  # 작업 자체가 끝남(작업의 예외 포함) — 그 결과를 그대로
+            raise DeadlineExceeded(f"요청 제한 시간 초과 (single-flight 대기: {self.name})")
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]], detached: bool = False) -> T:
+        """
+        key로 진행 중인 호출이 있으면 합류, 없으면 fn()을 실행
+
+        Args:
+            key: 병합 기준 키
+            fn: 인자 없는 코루틴 함수
+            detached: True면 fn()을 요청 deadline 없이 실행하고, 호출자는 자기 남은 시간만큼만 대기
+
+        Returns:
+            fn()의 결과 (합류한 호출자는 같은 결과 객체를 받는다)
+
+        Raises:
+            DeadlineExceeded: detached 호출에서 이 호출자의 남은 시간이 먼저 소진됨 (작업은 계속 진행)
+        """
+        return await self.wait(self.start(key, fn, detached), detached)
+
+    def _done(self, key: Hashable, task: asyncio.Task):
+        """완료된 호출 정리 (모든 호출자가 취소된 경우 예외 미조회 경고 방지)"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """카운터 (디버깅용)"""
+        return {
+            "in_flight": len(self._inflight),
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+        }
@@ -2,9 +2,12 @@
 XML 응답 빌더
 
 Google Spreadsheet의 IMPORTXML 함수를 위한 XML 응답을 생성합니다.
+(다건 시세는 IMPORTDATA용 CSV도 지원)
 """
+import io
+import csv
 import xml.etree.ElementTree as ET
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from xml.dom import minidom
 
 
@@ -42,39 +45,123 @@ def build_stock_price_xml(data: Dict[str, Any]) -> str:
           <timestamp>2025-12-22T14:30:00</timestamp>
           <market>KOSPI</market>
         </stock>
+
+        캐시에 보관된 지난 시세로 응답한 경우 <stale>true</stale>가 추가된다.
     """
     root = ET.Element("stock")
+    _append_stock_fields(root, data)
+    return prettify_xml(root)
+
+
+def build_stock_price_list_xml(items: List[Dict[str, Any]]) -> str:
+    """
+    여러 종목 시세를 XML로 변환 (/api/prices)
+
+    Args:
+        items: provider.fetch_stock_prices() 결과 (요청 순서)
+
+    Returns:
+        XML 문자열
+        <?xml version="1.0" encoding="UTF-8"?>
+        <stocks>
+          <stock>
+            <code>005930</code>
+            <price>54300</price>
+            ...
+          </stock>
+          <stock>
+            <code>000660</code>
+            <error>토스 시세 데이터를 찾을 수 없습니다: code=000660</error>
+            <market>KOSPI</market>
+          </stock>
+        </stocks>
+
+        조회에 실패한 종목은 <price> 대신 <error>가 들어간다 (나머지 종목은 정상 응답).
+    """
+    root = ET.Element("stocks")
+    for data in items:
+        item = ET.SubElement(root, "stock")
+        if data.get("error"):
+            code_elem = ET.SubElement(item, "code")
+            code_elem.text = str(data.get("code", ""))
+            error_elem = ET.SubElement(item, "error")
+            error_elem.text = str(data.get("error"))
+            if data.get("market"):
+                market_elem = ET.SubElement(item, "market")
+                market_elem.text = str(data.get("market"))
+            continue
+        _append_stock_fields(item, data)
+    return prettify_xml(root)
+
 
-    code_elem = ET.SubElement(root, "code")
+#: CSV 응답 컬럼 순서 (IMPORTDATA 시 열 위치 고정)
+STOCK_CSV_COLUMNS = (
+    "code", "price", "high52w", "low52w", "high52w_date",
+    "timestamp", "market", "provider", "stale", "error",
+)
+
+
+def build_stock_price_csv(items: List[Dict[str, Any]]) -> str:
+    """
+    여러 종목 시세를 CSV로 변환 (/api/prices?format=csv, 구글시트 IMPORTDATA용)
+
+    Args:
+        items: provider.fetch_stock_prices() 결과 (요청 순서)
+
+    Returns:
+        CSV 문자열 (헤더 1행 + 종목별 1행, 컬럼: STOCK_CSV_COLUMNS)
+        code,price,high52w,low52w,high52w_date,timestamp,market,provider,stale,error
+        005930,54300,88800,49900,20240711,2025-12-22T14:30:00,KOSPI,toss,,
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(STOCK_CSV_COLUMNS)
+    for data in items:
+        row = []
+        for column in STOCK_CSV_COLUMNS:
+            value = data.get(column)
+            if column == "stale":
+                value = "true" if value else None
+            row.append("" if value is None else value)
+        writer.writerow(row)
+    return buffer.getvalue()
+
+
+def _append_stock_fields(parent: ET.Element, data: Dict[str, Any]) -> None:
+    """시세 딕셔너리를 XML 하위 요소로 추가 (단건/다건 공통)"""
+    code_elem = ET.SubElement(parent, "code")
     code_elem.text = str(data.get("code", ""))
 
-    price_elem = ET.SubElement(root, "price")
+    price_elem = ET.SubElement(parent, "price")
     price_elem.text = str(data.get("price", ""))
 
     if data.get("high52w") is not None:
-        high52w_elem = ET.SubElement(root, "high52w")
+        high52w_elem = ET.SubElement(parent, "high52w")
         high52w_elem.text = str(data.get("high52w"))
 
     if data.get("low52w") is not None:
-        low52w_elem = ET.SubElement(root, "low52w")
+        low52w_elem = ET.SubElement(parent, "low52w")
         low52w_elem.text = str(data.get("low52w"))
 
     if data.get("high52w_date"):
-        high52w_date_elem = ET.SubElement(root, "high52w_date")
+        high52w_date_elem = ET.SubElement(parent, "high52w_date")
         high52w_date_elem.text = str(data.get("high52w_date"))
 
-    timestamp_elem = ET.SubElement(root, "timestamp")
+    timestamp_elem = ET.SubElement(parent, "timestamp")
     timestamp_elem.text = str(data.get("timestamp", ""))
 
     if "market" in data:
-        market_elem = ET.SubElement(root, "market")
+        market_elem = ET.SubElement(parent, "market")
         market_elem.text = str(data.get("market", ""))
 
     if data.get("provider"):
-        provider_elem = ET.SubElement(root, "provider")
+        provider_elem = ET.SubElement(parent, "provider")
         provider_elem.text = str(data.get("provider"))
 
-    return prettify_xml(root)
+    # 증권사 장애/갱신 중이라 지난 시세로 응답한 경우 (시트에서 구분 가능)
+    if data.get("stale"):
+        stale_elem = ET.SubElement(parent, "stale")
+        stale_elem.text = "true"
 
 
 def build_scrape_xml(data: Dict[str, Any], root_tag: str = "quote") -> str:
@@ -109,16 +196,30 @@ def build_scrape_list_xml(
     스크래핑 결과 여러 건을 XML로 변환
 
     Args:
-        items: scraper.scrape() 결과 딕셔너리 리스트
+        items: scraper.scrape_group() 결과 딕셔너리 리스트
         root_tag: 루트 태그명 (예: "golds")
         item_tag: 각 항목 태그명 (예: "gold")
 
     Returns:
-        XML 문자열
+        XML 문자열. 실패한 대상은 <price> 대신 <error>가 들어간다 (나머지 대상은 정상 응답).
+        <gold>
+          <target>international_investing</target>
+          <label>국제 금 시세 (investing.com XAU/USD)</label>
+          <error>페이지 조회 실패: ...</error>
+        </gold>
     """
     root = ET.Element(root_tag)
     for data in items:
         item = ET.SubElement(root, item_tag)
+        if data.get("error"):
+            target_elem = ET.SubElement(item, "target")
+            target_elem.text = str(data.get("target", ""))
+            if data.get("label"):
+                label_elem = ET.SubElement(item, "label")
+                label_elem.text = str(data.get("label"))
+            error_elem = ET.SubElement(item, "error")
+            error_elem.text = str(data.get("error"))
+            continue
         _append_scrape_fields(item, data)
     return prettify_xml(root)
 
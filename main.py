@@ -12,6 +12,8 @@ from fastapi.responses import Response
 
 from app.api.routes import router
 from app.core.config import config
+from app.services.http_client import init_http_clients, close_http_clients
+from app.services.token_renewer import get_token_renewer
 from app.utils.xml_builder import build_error_xml
 
 # 로깅 설정
@@ -40,9 +42,18 @@ async def lifespan(app: FastAPI):
         logger.error(f"환경 변수 검증 실패: {e}")
         raise
 
+    # upstream별 공유 HTTP 클라이언트 (keep-alive 연결 재사용)
+    await init_http_clients()
+
+    # 토큰 선제 갱신 (요청 경로가 토큰 발급에 막히지 않도록)
+    get_token_renewer().start()
+
     yield  # 애플리케이션 실행
 
     # Shutdown
+    await get_token_renewer().stop()
+    await close_http_clients()
+
     # headless 브라우저가 기동되어 있으면 정리 (미사용 시 no-op)
     try:
         from app.services.renderer import get_renderer
@@ -0,0 +1,62 @@
+"""
+스크래퍼 XPath 추출 마이크로벤치마크
+
+config/scrape_targets.yaml의 gold 대상 XPath로, 대상당 추출 시간을 비교한다.
+    before : 대상마다 HTML 파싱 + XPath 문자열 (이전 Scraper.extract 동작)
+    string : 파싱된 문서 재사용 + XPath 문자열 (요청마다 XPath 컴파일)
+    after  : 파싱된 문서 재사용 + 설정 로드 시 컴파일된 XPath (현재 동작)
+
+페이지는 네트워크 없이 만든 합성 HTML(대상 XPath가 매칭되는 구조 + 부피용 목록)이다.
+
+사용법 (프로젝트 루트에서):
+    python scripts/bench_extract.py [반복 횟수] [부피용 목록 항목 수]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.services.scraper import Scraper, ScrapeConfig
+
+GROUP = "gold"
+TARGETS = ("international", "krx")
+
+
+def build_page(filler_items: int = 3000) -> str:
+    """gold 대상 XPath가 매칭되는 합성 페이지 (약 수백 KB)"""
+    filler = "".join(
+        f'<li class="item"><a href="/item/{i}"><span>항목 {i}</span><em>{i * 7 % 1000},{i % 100:02d}</em></a></li>'
+        for i in range(filler_items)
+    )
+    return (
+        '<html><head><title>bench</title></head><body><div id="content"><div></div><div><ul>'
+        '<li><div><div><b>4,049.30</b></div></div></li>'
+        '<li><div><div><b>190,990</b></div></div></li>'
+        f"</ul></div><ul>{filler}</ul></div></body></html>"
+    )
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    filler_items = int(sys.argv[2]) if len(sys.argv) > 2 else 3000
+    scrape_config = ScrapeConfig()
+    confs = [scrape_config.get_target(GROUP, t) for t in TARGETS]
+    html_text = build_page(filler_items)
+    tree = Scraper.parse(html_text)
+
+    cases = {
+        "before (parse + string xpath)": lambda: [Scraper.extract(html_text, c["xpath"]) for c in confs],
+        "string (cached tree + string xpath)": lambda: [Scraper.extract(tree, c["xpath"]) for c in confs],
+        "after  (cached tree + compiled xpath)": lambda: [Scraper.extract(tree, c["compiled_xpath"]) for c in confs],
+    }
+
+    print(f"page={len(html_text) / 1024:.1f}KB targets={len(confs)} number={number}")
+    for label, func in cases.items():
+        best = min(timeit.repeat(func, number=number, repeat=5))
+        per_target_us = best / number / len(confs) * 1e6
+        print(f"{label:40s} {per_target_us:10.1f} us/target")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,7 +16,7 @@ async def main():
     print("=== 키움 API 시세 조회 디버그 (비동기) ===\n")
 
     try:
-        client = get_kiwoom_client()
+        client = get_kiwoom_client().members[0]  # 키 풀의 첫 키
 
         # 토큰 발급
         token = await client.get_token()
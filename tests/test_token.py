@@ -13,7 +13,7 @@ async def main():
     print("=== 키움 API 토큰 발급 테스트 (비동기) ===\n")
 
     try:
-        client = get_kiwoom_client()
+        client = get_kiwoom_client().members[0]  # 키 풀의 첫 키
         print("클라이언트 생성 완료")
         print(f"API 호스트: {client.api_host}")
         print(f"APPKEY: {client.appkey[:10]}...")